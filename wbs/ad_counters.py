@@ -0,0 +1,140 @@
+"""광고 노출/클릭 수 버퍼
+
+누적값은 flush 전까지 settings.AD_COUNTER_CACHE 캐시에만 있으므로 그 캐시는
+- 키를 임의로 밀어내지 않아야 하고 (LocMem 기본 MAX_ENTRIES=300 이면 누적값이 사라진다),
+- 웹 프로세스가 여러 개면 모두가 같은 값을 보도록 공유되어야 한다 (Redis 등, incr 가 원자적인 백엔드).
+설정은 settings.CACHES['ad_counters'] 참고. 프로세스별 메모리 캐시로 돌리면 각 프로세스가 자기
+버퍼를 flush 하므로 합계는 맞지만, 프로세스가 종료될 때 마지막 flush 이후 누적분은 잃는다.
+DB 캐시 백엔드는 incr 가 원자적이지 않아 동시 요청의 증가분을 잃으므로 쓰지 않는다.
+"""
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DatabaseError, transaction
+from django.db.models import F
+from django.db.models.functions import Least
+
+from .models import AdCampaign
+
+PENDING_CACHE_KEY = 'wbs:ads:pending:{kind}:{ad_id}'
+FLUSH_LOCK_KEY = 'wbs:ads:flush-lock'
+
+# 종류 -> (현재값 필드, 최대값 필드)
+COUNTER_FIELDS = {
+    'impressions': ('current_impressions', 'max_impressions'),
+    'clicks': ('current_clicks', 'max_clicks'),
+}
+
+
+def counter_cache():
+    """누적값과 flush 잠금을 두는 캐시 (둘이 같은 캐시에 있어야 한다)"""
+    return caches[getattr(settings, 'AD_COUNTER_CACHE', 'default')]
+
+
+def _flush_interval():
+    return getattr(settings, 'AD_COUNTER_FLUSH_INTERVAL', 30)
+
+
+def _pending_key(kind, ad_id):
+    return PENDING_CACHE_KEY.format(kind=kind, ad_id=ad_id)
+
+
+def _incr(key, delta):
+    cache = counter_cache()
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        # 키가 없으면 만들고 다시 증가 (add 는 이미 있으면 무시되므로 동시 생성에도 안전)
+        cache.add(key, 0, timeout=None)
+        cache.incr(key, delta)
+
+
+def _record(kind, ad_ids):
+    for ad_id in ad_ids:
+        _incr(_pending_key(kind, ad_id), 1)
+    maybe_flush()
+
+
+def record_impressions(ad_ids):
+    """노출 수를 캐시 버퍼에 누적 (DB 는 주기적으로 flush)"""
+    _record('impressions', ad_ids)
+
+
+def record_click(ad_id):
+    """클릭 수를 캐시 버퍼에 누적 (DB 는 주기적으로 flush)"""
+    _record('clicks', [ad_id])
+
+
+def pending_counts(kind, ad_ids):
+    """아직 DB 에 반영되지 않은 누적값 {ad_id: n}"""
+    keys = {_pending_key(kind, ad_id): ad_id for ad_id in ad_ids}
+    return {keys[key]: value for key, value in counter_cache().get_many(list(keys)).items() if value and value > 0}
+
+
+def _claim(kind, pending):
+    """읽은 누적값을 decr 로 가져온다. 동시에 다른 flush 가 먼저 가져가 음수가 되면 되돌리고 건너뛴다
+
+    증가분은 서로 구분되지 않으므로 "버퍼가 음수가 되지 않는 한" 가져간 합계는
+    기록된 합계를 넘지 않는다 (중복 반영 없음).
+    """
+    cache = counter_cache()
+    claimed = {}
+    for ad_id, delta in pending.items():
+        key = _pending_key(kind, ad_id)
+        try:
+            remaining = cache.decr(key, delta)
+        except ValueError:
+            # 캐시에서 밀려난 키
+            continue
+        if remaining < 0:
+            cache.incr(key, delta)
+            continue
+        claimed[ad_id] = delta
+    return claimed
+
+
+def _unclaim(kind, claimed):
+    for ad_id, delta in claimed.items():
+        _incr(_pending_key(kind, ad_id), delta)
+
+
+def maybe_flush():
+    """flush 간격이 지났으면 (여러 프로세스 중 하나만) flush"""
+    if counter_cache().add(FLUSH_LOCK_KEY, 1, timeout=_flush_interval()):
+        try:
+            flush_ad_counters()
+        except DatabaseError:
+            # 가져온 값은 버퍼로 되돌려졌으므로 다음 주기에 다시 반영된다 (페이지 응답은 막지 않음)
+            pass
+
+
+def flush_ad_counters(ad_ids=None):
+    """캐시 버퍼의 누적값을 F() UPDATE 로 DB 에 반영
+
+    - 같은 증가량의 광고끼리 묶어 UPDATE 한 번으로 처리
+    - Least(현재값 + n, 최대값) 으로 최대 노출/클릭 수를 DB 에서 원자적으로 보장
+    - 읽은 만큼만 decr 로 가져오므로 flush 도중 들어온 증가분은 다음 flush 로 넘어가고,
+      flush 가 동시에 돌아도 같은 증가분을 두 번 반영하지 않는다
+    반환값: {'impressions': 반영한 합계, 'clicks': 반영한 합계}
+    """
+    if ad_ids is None:
+        ad_ids = list(AdCampaign.objects.values_list('id', flat=True))
+    flushed = {}
+    for kind, (current_field, max_field) in COUNTER_FIELDS.items():
+        claimed = _claim(kind, pending_counts(kind, ad_ids))
+        by_delta = defaultdict(list)
+        for ad_id, delta in claimed.items():
+            by_delta[delta].append(ad_id)
+        try:
+            with transaction.atomic():
+                for delta, ids in by_delta.items():
+                    AdCampaign.objects.filter(pk__in=ids).update(**{
+                        current_field: Least(F(current_field) + delta, F(max_field)),
+                    })
+        except Exception:
+            # DB 반영 실패 시 가져온 값을 버퍼로 되돌려 다음 flush 에서 다시 시도
+            _unclaim(kind, claimed)
+            raise
+        flushed[kind] = sum(claimed.values())
+    return flushed
@@ -0,0 +1,120 @@
+import random
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .ad_counters import pending_counts, record_impressions
+from .models import AdCampaign, SubscriptionPlan
+
+RUNNING_CACHE_KEY = 'wbs:ads:running:{position}:{plan}'
+DEFAULT_AD_COUNT = 3
+# 플랜이 없는 사용자(비로그인/구독 없음)는 무료 플랜 대상으로 본다
+DEFAULT_PLAN = 'free'
+# 광고를 보여주는 플랜
+AD_PLANS = ['free']
+
+
+def _running_timeout():
+    return getattr(settings, 'AD_SELECTION_CACHE_TIMEOUT', 60)
+
+
+def _running_key(position, plan_name):
+    return RUNNING_CACHE_KEY.format(position=position, plan=plan_name)
+
+
+def _load_running(position, plan_name):
+    """위치별 실행 중 캠페인 중 플랜 타겟이 없거나 해당 플랜을 타겟으로 하는 것"""
+    now = timezone.now()
+    return list(
+        AdCampaign.objects.filter(
+            Q(target_plans__isnull=True) | Q(target_plans__name=plan_name),
+            position=position,
+            status='active',
+            is_active=True,
+            start_date__lte=now,
+            end_date__gte=now,
+            current_impressions__lt=F('max_impressions'),
+        ).distinct()
+    )
+
+
+def running_campaigns(position, plan_name=DEFAULT_PLAN):
+    """(위치, 플랜)별 실행 중 캠페인 목록 (짧은 TTL 캐시, 페이지마다 DB 조회하지 않음)"""
+    key = _running_key(position, plan_name)
+    campaigns = cache.get(key)
+    if campaigns is None:
+        campaigns = _load_running(position, plan_name)
+        cache.set(key, campaigns, _running_timeout())
+    return campaigns
+
+
+def invalidate_running_campaigns():
+    """캠페인이 바뀌면 (위치, 플랜)별 캐시 삭제"""
+    positions = [value for value, _ in AdCampaign._meta.get_field('position').choices]
+    plans = [value for value, _ in SubscriptionPlan.PLAN_CHOICES]
+    cache.delete_many([_running_key(position, plan) for position in positions for plan in plans])
+
+
+def _matches_page(target_pages, path):
+    """target_pages 가 비어 있으면 모든 페이지, 아니면 경로 접두사 일치 ('*' 는 전체)"""
+    if not target_pages:
+        return True
+    return any(page == '*' or path.startswith(page) for page in target_pages if isinstance(page, str))
+
+
+def _eligible(campaigns, path, now):
+    return [
+        campaign for campaign in campaigns
+        if campaign.start_date <= now <= campaign.end_date
+        and _matches_page(campaign.target_pages, path)
+    ]
+
+
+def weighted_sample(items, weights, count, rng=random):
+    """가중치 비복원 추출 (Efraimidis-Spirakis: 키 u^(1/w) 상위 count 개)"""
+    keyed = [
+        (rng.random() ** (1.0 / weight), index)
+        for index, weight in enumerate(weights) if weight > 0
+    ]
+    keyed.sort(reverse=True)
+    return [items[index] for _, index in keyed[:count]]
+
+
+def select_ads(position='sidebar', plan_name=DEFAULT_PLAN, path='/', count=DEFAULT_AD_COUNT, rng=random):
+    """위치/플랜/페이지에 맞는 광고를 캐시된 후보에서 메모리로 추출
+
+    남은 노출 예산(최대 노출수 - 현재 노출수 - 아직 flush 되지 않은 노출수)에 비례해 뽑으므로
+    예산이 많이 남은 캠페인이 더 자주, 소진된 캠페인은 나오지 않는다.
+    """
+    plan_name = plan_name or DEFAULT_PLAN
+    candidates = _eligible(running_campaigns(position, plan_name), path, timezone.now())
+    if not candidates:
+        return []
+    pending = pending_counts('impressions', [campaign.pk for campaign in candidates])
+    weights = [
+        campaign.max_impressions - campaign.current_impressions - pending.get(campaign.pk, 0)
+        for campaign in candidates
+    ]
+    return weighted_sample(candidates, weights, count, rng)
+
+
+def plan_name_for(user):
+    """사용자의 구독 플랜 이름 (비로그인/구독 없음은 무료)"""
+    if not user.is_authenticated:
+        return DEFAULT_PLAN
+    # user.subscription 은 OneToOne 역참조라 구독이 없으면 AttributeError 계열 예외 → None
+    subscription = getattr(user, 'subscription', None)
+    return subscription.plan.name if subscription is not None else DEFAULT_PLAN
+
+
+def ads_for_request(request, position='sidebar', count=DEFAULT_AD_COUNT):
+    """요청 사용자/페이지에 표시할 광고 (무료 플랜에만 표시) - 노출 수도 함께 기록"""
+    plan_name = plan_name_for(request.user)
+    if plan_name not in AD_PLANS:
+        return []
+    ads = select_ads(position, plan_name=plan_name, path=request.path, count=count)
+    # 노출 기록 (캐시 버퍼에 누적 후 주기적으로 일괄 반영)
+    record_impressions([ad.pk for ad in ads])
+    return ads
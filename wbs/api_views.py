@@ -1,7 +1,7 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
 from django.contrib.auth.models import User
 from django.db.models import Q, F
 from django.utils import timezone
@@ -14,13 +14,18 @@ from .models import (
     UserProfile, Notification, SubscriptionPlan, 
     UserSubscription, AdCampaign
 )
+from .intervals import DateIntervalIndex
+from .dashboard import get_dashboard_stats, get_cache_counters
+from .notifications import get_unread_count, mark_all_read
+from .search import search_all
 from .serializers import (
     UserSerializer, UserProfileSerializer, ProjectSerializer, 
     ProjectPhaseSerializer, ApprovalLineSerializer, CommentSerializer,
     ProjectDocumentSerializer, DailyProgressSerializer, 
     TaskChecklistItemSerializer, NotificationSerializer,
     SubscriptionPlanSerializer, UserSubscriptionSerializer,
-    AdCampaignSerializer, DashboardStatsSerializer
+    AdCampaignSerializer, DashboardStatsSerializer,
+    EventSerializer, PersonalTaskSerializer
 )
 
 class ProjectViewSet(viewsets.ModelViewSet):
@@ -120,55 +125,24 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
     
     @action(detail=False, methods=['post'])
     def mark_all_read(self, request):
-        Notification.objects.filter(user=request.user, is_read=False).update(
-            is_read=True, 
-            read_at=timezone.now()
-        )
+        mark_all_read(request.user)
         return Response({'success': True})
     
     @action(detail=False, methods=['get'])
     def unread_count(self, request):
-        count = Notification.objects.filter(user=request.user, is_read=False).count()
-        return Response({'unread_count': count})
+        return Response({'unread_count': get_unread_count(request.user)})
 
 class DashboardViewSet(viewsets.ViewSet):
+    # 익명 접근은 유지하되 통계는 캐시에서 제공 (DB 부하는 캐시 미스 시에만 발생)
     permission_classes = [AllowAny]
     
     def list(self, request):
-        # 통계 데이터
-        total_projects = Project.objects.count()
-        active_projects = Project.objects.filter(status='in_progress').count()
-        completed_projects = Project.objects.filter(status='completed').count()
-        total_comments = Comment.objects.count()
-        
-        # 최근 프로젝트 (최대 5개)
-        recent_projects = Project.objects.order_by('-created_at')[:5]
-        
-        # 승인 대기 중인 프로젝트
-        pending_approvals = ApprovalLine.objects.filter(
-            Q(status='pending') | Q(status='in_review')
-        ).distinct()[:5]
-        
-        # 월별 프로젝트 통계
-        today = timezone.now()
-        monthly_projects = Project.objects.filter(
-            start_date__year=today.year,
-            start_date__month=today.month
-        )
-        
-        data = {
-            'total_projects': total_projects,
-            'active_projects': active_projects,
-            'completed_projects': completed_projects,
-            'total_comments': total_comments,
-            'recent_projects': recent_projects,
-            'pending_approvals': pending_approvals,
-            'monthly_projects': monthly_projects,
-            'current_month': today.strftime('%Y년 %m월'),
-        }
-        
-        serializer = DashboardStatsSerializer(data)
+        serializer = DashboardStatsSerializer(get_dashboard_stats())
         return Response(serializer.data)
+    
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def cache_stats(self, request):
+        return Response(get_cache_counters())
 
 class CalendarViewSet(viewsets.ViewSet):
     permission_classes = [IsAuthenticated]
@@ -178,26 +152,34 @@ class CalendarViewSet(viewsets.ViewSet):
         year = int(request.GET.get('year', today.year))
         month = int(request.GET.get('month', today.month))
         
+        # 응답 형식: 기본은 프로젝트 테이블(id -> 프로젝트) + 일자별 id 목록,
+        # legacy=1 이면 일자별로 프로젝트 전체를 펼친 기존 형식
+        legacy = request.GET.get('legacy') in ('1', 'true')
+        
         # 월별 프로젝트들
         projects = Project.objects.filter(
             Q(start_date__year=year, start_date__month=month) |
             Q(end_date__year=year, end_date__month=month) |
             Q(start_date__lte=date(year, month, 1), 
               end_date__gte=date(year, month, cal_module.monthrange(year, month)[1]))
-        ).order_by('start_date')
+        ).select_related('manager').prefetch_related('team_members').order_by('start_date')
+        
+        # 해당 월의 일별 프로젝트 매핑 (구간 인덱스로 한 번에 분배)
+        daily_projects = DateIntervalIndex(projects).bucket_by_day(
+            date(year, month, 1),
+            date(year, month, cal_module.monthrange(year, month)[1])
+        )
+        
+        # 프로젝트는 한 번씩만 직렬화하고 일자별 매핑에서는 재사용
+        serialized = ProjectSerializer(projects, many=True).data
+        project_table = {item['id']: item for item in serialized}
         
-        # 해당 월의 일별 프로젝트 매핑
-        daily_projects = {}
-        for project in projects:
-            start_date = max(project.start_date, date(year, month, 1))
-            end_date = min(project.end_date, date(year, month, cal_module.monthrange(year, month)[1]))
-            
-            current_date = start_date
-            while current_date <= end_date:
-                if current_date not in daily_projects:
-                    daily_projects[current_date] = []
-                daily_projects[current_date].append(project)
-                current_date += timedelta(days=1)
+        if legacy:
+            projects_data = serialized
+            daily_data = {str(k): [project_table[p.id] for p in v] for k, v in daily_projects.items()}
+        else:
+            projects_data = project_table
+            daily_data = {str(k): [p.id for p in v] for k, v in daily_projects.items()}
         
         # 캘린더 데이터 생성
         cal = cal_module.monthcalendar(year, month)
@@ -207,8 +189,8 @@ class CalendarViewSet(viewsets.ViewSet):
             'year': year,
             'month': month,
             'month_name': month_name,
-            'projects': ProjectSerializer(projects, many=True).data,
-            'daily_projects': {str(k): [ProjectSerializer(p).data for p in v] for k, v in daily_projects.items()},
+            'projects': projects_data,
+            'daily_projects': daily_data,
             'calendar': cal,
             'today': today,
             'prev_month': month - 1 if month > 1 else 12,
@@ -227,34 +209,16 @@ class SearchViewSet(viewsets.ViewSet):
         results = {}
         
         if query:
-            # 프로젝트 검색
-            projects = Project.objects.filter(
-                Q(title__icontains=query) | 
-                Q(description__icontains=query)
-            ).select_related('manager')[:10]
-            
-            # 사용자 검색 (관리자만)
-            users = []
-            if request.user.is_staff:
-                users = User.objects.filter(
-                    Q(username__icontains=query) |
-                    Q(first_name__icontains=query) |
-                    Q(last_name__icontains=query) |
-                    Q(email__icontains=query)
-                )[:10]
-            
-            # 알림 검색
-            notifications = Notification.objects.filter(
-                user=request.user,
-                message__icontains=query
-            ).order_by('-created_at')[:10]
-            
+            found = search_all(request.user, query)
             results = {
-                'projects': ProjectSerializer(projects, many=True).data,
-                'users': UserSerializer(users, many=True).data,
-                'notifications': NotificationSerializer(notifications, many=True).data,
+                'projects': ProjectSerializer(found['projects'], many=True).data,
+                'comments': CommentSerializer(found['comments'], many=True).data,
+                'events': EventSerializer(found['events'], many=True).data,
+                'personal_tasks': PersonalTaskSerializer(found['personal_tasks'], many=True).data,
+                'users': UserSerializer(found['users'], many=True).data,
+                'notifications': NotificationSerializer(found['notifications'], many=True).data,
                 'query': query,
-                'total_count': len(projects) + len(users) + len(notifications)
+                'total_count': found['total_count']
             }
         
         return Response(results)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class WbsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "wbs"
+
+    def ready(self):
+        from . import signals  # noqa: F401 (시그널 핸들러 등록)
@@ -0,0 +1,162 @@
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.urls import reverse
+
+from .models import Project, Event
+from .search import TERM_RE
+
+VERSION_CACHE_KEY = 'wbs:autocomplete:version'
+DEFAULT_LIMIT = 8
+MAX_LIMIT = 20
+# 데이터가 연달아 바뀌어도 이 간격보다 자주 다시 만들지 않는다
+MIN_REBUILD_SECONDS = 5
+# 한 번의 조회에서 훑는 최대 후보 수 (권한 없는 항목을 건너뛰는 몫 포함)
+MAX_SCAN = 500
+
+URL_NAMES = {
+    'project': 'wbs:project_detail',
+    'user': 'wbs:user_detail',
+    'event': 'wbs:event_detail',
+}
+
+
+def _rebuild_interval():
+    return getattr(settings, 'AUTOCOMPLETE_REBUILD_INTERVAL', 300)
+
+
+def _word_keys(text):
+    """제목 중간 단어부터 시작하는 키들 ("결제 시스템 개편" -> "시스템 개편", "개편")"""
+    lowered = text.lower()
+    return [lowered[match.start():] for match in TERM_RE.finditer(lowered) if match.start() > 0]
+
+
+class PrefixIndex:
+    """정렬된 키 배열 + 이진 탐색 접두사 색인
+
+    - starts: 제목/사용자명 맨 앞부터의 키, words: 중간 단어부터의 키. 앞에서 시작하는 일치를 먼저 채운다.
+    - 항목은 (종류, id, 표시 이름) 튜플. 일정은 생성자/참석자만 볼 수 있어 별도 사용자 집합을 둔다.
+    """
+
+    def __init__(self, items, event_viewers, version=None):
+        self.version = version
+        self.built_at = time.monotonic()
+        self.event_viewers = event_viewers
+        starts, words = [], []
+        for item, text in items:
+            starts.append((text.lower(), item))
+            words.extend((key, item) for key in _word_keys(text))
+        starts.sort(key=lambda row: row[0])
+        words.sort(key=lambda row: row[0])
+        self.start_keys = [key for key, _ in starts]
+        self.start_items = [item for _, item in starts]
+        self.word_keys = [key for key, _ in words]
+        self.word_items = [item for _, item in words]
+
+    def __len__(self):
+        return len(self.start_keys)
+
+    def _visible(self, item, user):
+        kind, object_id, _ = item
+        if kind == 'user':
+            return user.is_staff
+        if kind == 'event':
+            return user.pk in self.event_viewers.get(object_id, ())
+        return True
+
+    def _scan(self, keys, items, prefix, user, limit, seen, results):
+        index = bisect_left(keys, prefix)
+        end = min(len(keys), index + MAX_SCAN)
+        while index < end and len(results) < limit and keys[index].startswith(prefix):
+            item = items[index]
+            index += 1
+            if item[:2] in seen or not self._visible(item, user):
+                continue
+            seen.add(item[:2])
+            results.append(item)
+
+    def lookup(self, prefix, user, limit=DEFAULT_LIMIT):
+        """접두사와 맞는 항목을 최대 limit 개 (앞에서 시작하는 일치 우선, 같은 그룹은 사전순)"""
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return []
+        results, seen = [], set()
+        self._scan(self.start_keys, self.start_items, prefix, user, limit, seen, results)
+        self._scan(self.word_keys, self.word_items, prefix, user, limit, seen, results)
+        return results
+
+
+def build_index(version=None):
+    """프로젝트 제목, 사용자명(이름), 일정 제목으로 색인 생성 (쿼리 4번)"""
+    items = []
+    for project_id, title in Project.objects.values_list('id', 'title').iterator():
+        items.append((('project', project_id, title), title))
+    for user_id, username, first_name, last_name in User.objects.filter(is_active=True).values_list(
+        'id', 'username', 'first_name', 'last_name'
+    ).iterator():
+        full_name = f'{first_name} {last_name}'.strip()
+        label = f'{username} ({full_name})' if full_name else username
+        items.append((('user', user_id, label), username))
+        if full_name:
+            items.append((('user', user_id, label), full_name))
+
+    event_viewers = defaultdict(set)
+    for event_id, title, start_date, creator_id in Event.objects.values_list('id', 'title', 'start_date', 'creator_id').iterator():
+        items.append((('event', event_id, f'{title} ({start_date:%Y-%m-%d})'), title))
+        event_viewers[event_id].add(creator_id)
+    for event_id, user_id in Event.attendees.through.objects.values_list('event_id', 'user_id').iterator():
+        event_viewers[event_id].add(user_id)
+    return PrefixIndex(items, {event_id: frozenset(viewers) for event_id, viewers in event_viewers.items()}, version)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def mark_stale():
+    """데이터가 바뀌었음을 알린다 (다음 조회 때 MIN_REBUILD_SECONDS 가 지났으면 다시 만듦)"""
+    cache.set(VERSION_CACHE_KEY, time.time(), timeout=None)
+
+
+def _rebuild_in_background(version):
+    global _index
+    try:
+        _index = build_index(version)
+    finally:
+        _index_lock.release()
+        connection.close()
+
+
+def get_index():
+    """프로세스 메모리의 색인 (없으면 만들고, 오래됐거나 데이터가 바뀌었으면 다시 만든다)
+
+    처음 한 번만 요청 안에서 만들고, 이후 재생성은 백그라운드 스레드가 맡아
+    그동안 요청은 기존 색인으로 바로 응답한다.
+    """
+    global _index
+    version = cache.get(VERSION_CACHE_KEY)
+    index = _index
+    if index is None:
+        with _index_lock:
+            if _index is None:
+                _index = build_index(version)
+            return _index
+    age = time.monotonic() - index.built_at
+    if age > _rebuild_interval() or (version != index.version and age > MIN_REBUILD_SECONDS):
+        if _index_lock.acquire(blocking=False):
+            threading.Thread(target=_rebuild_in_background, args=(version,), daemon=True).start()
+    return index
+
+
+def autocomplete(user, query, limit=DEFAULT_LIMIT):
+    """자동완성 결과 [{'type', 'id', 'label', 'url'}, ...]"""
+    return [
+        {'type': kind, 'id': object_id, 'label': label, 'url': reverse(URL_NAMES[kind], args=[object_id])}
+        for kind, object_id, label in get_index().lookup(query, user, min(limit, MAX_LIMIT))
+    ]
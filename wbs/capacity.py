@@ -0,0 +1,107 @@
+from collections import defaultdict
+from datetime import timedelta
+from itertools import accumulate
+
+from django.conf import settings
+from django.contrib.auth.models import User
+
+from .models import PersonalTask, ProjectPhase
+from .recurrence import add_months
+
+# 리포트 한 번에 계산하는 최대 일수
+MAX_DAYS = 366
+
+
+def daily_capacity():
+    """하루 투입 가능 시간 (넘으면 초과 배정)"""
+    return getattr(settings, 'CAPACITY_DAILY_HOURS', 8)
+
+
+def assignment_rows(first, last, user_ids=None):
+    """first~last 와 겹치는 진행 중 배정 (종류, 대상 id, 사용자 id, 시작일, 종료일, daily_hours)
+
+    완료된 단계(is_completed 또는 status=done)와 완료된 개인 작업은 투입 시간에서 뺀다.
+    담당자 중간 테이블에서 출발해 대상과 JOIN 한 번으로 읽는다 (종류별 쿼리 1번).
+    """
+    sources = [
+        ('phase', 'projectphase', ProjectPhase.assignees.through.objects.filter(
+            projectphase__is_completed=False,
+        ).exclude(projectphase__status='done')),
+        ('personal_task', 'personaltask', PersonalTask.assignees.through.objects.exclude(personaltask__progress='done')),
+    ]
+    for kind, field, rows in sources:
+        rows = rows.filter(**{f'{field}__start_date__lte': last, f'{field}__end_date__gte': first})
+        if user_ids is not None:
+            rows = rows.filter(user_id__in=user_ids)
+        for object_id, user_id, start_date, end_date, daily_hours in rows.values_list(
+            f'{field}_id', 'user_id', f'{field}__start_date', f'{field}__end_date', f'{field}__daily_hours',
+        ):
+            yield kind, object_id, user_id, start_date, end_date, daily_hours
+
+
+def allocated_hours(first, last, user_ids=None):
+    """사용자별 날짜별 배정 시간 {user_id: [first 부터 하루씩 시간]}
+
+    배정 하나마다 날짜를 하루씩 더하지 않고, 사용자별 차분 배열의 시작 칸에 +시간,
+    종료 다음 칸에 -시간만 기록한 뒤 누적합(itertools.accumulate, C 구현) 한 번으로 펼친다.
+    배정 수 n, 사용자 수 u, 일수 d 에 대해 O(n + u·d).
+    """
+    days = (last - first).days + 1
+    first_ordinal = first.toordinal()
+    diffs = defaultdict(lambda: [0] * (days + 1))
+    for _, _, user_id, start_date, end_date, daily_hours in assignment_rows(first, last, user_ids):
+        diff = diffs[user_id]
+        diff[max(start_date.toordinal() - first_ordinal, 0)] += daily_hours
+        diff[min(end_date.toordinal() - first_ordinal, days - 1) + 1] -= daily_hours
+    return {user_id: list(accumulate(diff[:days])) for user_id, diff in diffs.items()}
+
+
+def capacity_report(first, last, user_ids=None, overallocated_only=False):
+    """가동률 리포트 (히트맵 페이지/JSON API 공용)
+
+    users 와 hours 는 같은 순서이고 hours[i][j] 는 users[i] 의 first+j 일 배정 시간이다.
+    배정이 없는 사용자도 0 으로 포함한다 (user_ids 를 주면 그 사용자만).
+    """
+    limit = daily_capacity()
+    days = (last - first).days + 1
+    hours = allocated_hours(first, last, user_ids)
+    users = User.objects.filter(is_active=True).order_by('username')
+    if user_ids is not None:
+        users = users.filter(pk__in=user_ids)
+    empty = [0] * days
+
+    rows = []
+    matrix = []
+    for user_id, username, first_name, last_name in users.values_list('id', 'username', 'first_name', 'last_name'):
+        row = hours.get(user_id, empty)
+        peak = max(row, default=0)
+        # 최댓값이 한도 이하이면 날짜별로 셀 필요가 없다
+        over_days = sum(1 for value in row if value > limit) if peak > limit else 0
+        if overallocated_only and not over_days:
+            continue
+        total = sum(row)
+        rows.append({
+            'id': user_id,
+            'username': username,
+            'name': f'{first_name} {last_name}'.strip() or username,
+            'total_hours': total,
+            'peak_hours': peak,
+            'overallocated_days': over_days,
+            'utilization': round(total / (limit * days) * 100, 1),
+        })
+        matrix.append(row)
+    return {
+        'start': first,
+        'end': last,
+        'days': days,
+        'capacity': limit,
+        'users': rows,
+        'hours': matrix,
+        'overallocated_users': sum(1 for row in rows if row['overallocated_days']),
+    }
+
+
+def default_range(today):
+    """기본 조회 구간: 이번 달 1일부터 3개월"""
+    first = today.replace(day=1)
+    return first, add_months(first, 3) - timedelta(days=1)
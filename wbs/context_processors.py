@@ -1,21 +1,13 @@
-from .models import AdCampaign
+from django.utils.functional import SimpleLazyObject
 
-def ads_context(request):
-    """
-    사이드바에 표시할 광고를 가져오는 context processor
-    """
-    if request.user.is_authenticated:
-        # 사용자의 구독 상태에 따라 광고 표시 여부 결정
-        try:
-            user_subscription = request.user.usersubscription_set.filter(is_active=True).first()
-            if user_subscription and user_subscription.plan.name == 'Free':
-                # 무료 플랜 사용자에게만 광고 표시
-                sidebar_ads = AdCampaign.objects.filter(is_active=True)[:3]
-                return {'sidebar_ads': sidebar_ads}
-        except:
-            pass
-    
-    return {'sidebar_ads': []}
+from .ad_selection import ads_for_request
 
 
+def ads_context(request):
+    """
+    사이드바에 표시할 광고를 제공하는 context processor
 
+    모든 템플릿 렌더링마다 실행되므로 값은 지연 평가한다. 템플릿이 실제로
+    sidebar_ads 를 사용할 때만 광고를 선택(및 노출 기록)하고, 한 요청 안에서는 한 번만 계산한다.
+    """
+    return {'sidebar_ads': SimpleLazyObject(lambda: ads_for_request(request, 'sidebar'))}
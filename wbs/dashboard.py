@@ -0,0 +1,98 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import Project, ApprovalLine
+
+STATS_CACHE_KEY = 'wbs:dashboard:stats:{month}'
+HITS_CACHE_KEY = 'wbs:dashboard:hits'
+MISSES_CACHE_KEY = 'wbs:dashboard:misses'
+
+RECENT_PROJECTS_LIMIT = 5
+PENDING_APPROVALS_LIMIT = 5
+MONTHLY_PROJECTS_LIMIT = 10
+
+
+def _stats_timeout():
+    return getattr(settings, 'DASHBOARD_STATS_TIMEOUT', 300)
+
+
+def _stats_key(today):
+    return STATS_CACHE_KEY.format(month=today.strftime('%Y-%m'))
+
+
+def _incr(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        # 키가 없으면 incr 불가 → 새로 생성 (만료 없음)
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+
+
+def compute_dashboard_stats(today=None):
+    """대시보드 통계를 DB에서 계산 (캐시 미사용)"""
+    today = today or timezone.localdate()
+    in_month = Q(start_date__year=today.year, start_date__month=today.month)
+
+    # 카운터는 프로젝트-댓글 조인 위의 조건부 집계 한 번으로 계산
+    counters = Project.objects.order_by().aggregate(
+        total_projects=Count('id', distinct=True),
+        active_projects=Count('id', distinct=True, filter=Q(status='in_progress')),
+        completed_projects=Count('id', distinct=True, filter=Q(status='completed')),
+        monthly_project_count=Count('id', distinct=True, filter=in_month),
+        total_comments=Count('comments'),
+    )
+
+    recent_projects = list(
+        Project.objects.select_related('manager').order_by('-created_at')[:RECENT_PROJECTS_LIMIT]
+    )
+    pending_approvals = list(
+        ApprovalLine.objects.filter(status__in=['pending', 'in_review'])
+        .select_related('project__manager', 'approver')
+        .order_by('-created_at')[:PENDING_APPROVALS_LIMIT]
+    )
+    monthly_projects = list(
+        Project.objects.filter(in_month).select_related('manager')
+        .order_by('start_date')[:MONTHLY_PROJECTS_LIMIT]
+    )
+
+    return {
+        **counters,
+        'recent_projects': recent_projects,
+        'pending_approvals': pending_approvals,
+        'monthly_projects': monthly_projects,
+        'current_month': today.strftime('%Y년 %m월'),
+    }
+
+
+def get_dashboard_stats():
+    """캐시된 대시보드 통계 반환 (없으면 계산 후 저장)"""
+    today = timezone.localdate()
+    key = _stats_key(today)
+    stats = cache.get(key)
+    if stats is not None:
+        _incr(HITS_CACHE_KEY)
+        return stats
+    _incr(MISSES_CACHE_KEY)
+    stats = compute_dashboard_stats(today)
+    cache.set(key, stats, _stats_timeout())
+    return stats
+
+
+def invalidate_dashboard_stats():
+    """프로젝트/댓글/승인 변경 시 이번 달 통계 캐시 삭제"""
+    cache.delete(_stats_key(timezone.localdate()))
+
+
+def get_cache_counters():
+    """대시보드 통계 캐시 적중/미스 횟수"""
+    hits = cache.get(HITS_CACHE_KEY, 0)
+    misses = cache.get(MISSES_CACHE_KEY, 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': round(hits / total, 4) if total else 0.0,
+    }
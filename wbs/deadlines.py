@@ -0,0 +1,146 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import (
+    Project, ProjectPhase, PersonalTask, ProjectMembership, Notification, DeadlineNotice,
+)
+from .notifications import bulk_notify
+
+LOOKUP_CHUNK_SIZE = 1000
+
+
+def _lead_days():
+    return getattr(settings, 'DEADLINE_NOTICE_DAYS', 3)
+
+
+def _chunks(items, size=LOOKUP_CHUNK_SIZE):
+    items = list(items)
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _group_pairs(through_qs, key_field, ids):
+    """M2M through 테이블에서 {대상 id: {user_id, ...}} 를 청크 단위로 조회"""
+    grouped = defaultdict(set)
+    for chunk in _chunks(ids):
+        for key, user_id in through_qs.filter(**{f'{key_field}__in': chunk}).values_list(key_field, 'user_id'):
+            grouped[key].add(user_id)
+    return grouped
+
+
+def _project_deadlines(first, last):
+    rows = list(
+        Project.objects.filter(end_date__range=(first, last))
+        .exclude(status__in=['completed', 'cancelled'])
+        .order_by('end_date', 'id')
+        .values_list('id', 'title', 'end_date')
+    )
+    members = defaultdict(set)
+    for chunk in _chunks([row[0] for row in rows]):
+        for project_id, user_id in ProjectMembership.objects.filter(project_id__in=chunk).values_list('project_id', 'user_id'):
+            members[project_id].add(user_id)
+    for project_id, title, end_date in rows:
+        yield 'project', project_id, end_date, title, project_id, None, members[project_id]
+
+
+def _phase_deadlines(first, last):
+    rows = list(
+        ProjectPhase.objects.filter(end_date__range=(first, last), is_completed=False)
+        .exclude(status='done')
+        .order_by('end_date', 'id')
+        .values_list('id', 'title', 'end_date', 'project_id', 'project__title', 'project__manager_id')
+    )
+    assignees = _group_pairs(ProjectPhase.assignees.through.objects, 'projectphase_id', [row[0] for row in rows])
+    for phase_id, title, end_date, project_id, project_title, manager_id in rows:
+        # 담당자가 없으면 프로젝트 매니저에게
+        recipients = assignees.get(phase_id) or {manager_id}
+        yield 'phase', phase_id, end_date, f'{project_title} - {title}', project_id, phase_id, recipients
+
+
+def _task_deadlines(first, last):
+    rows = list(
+        PersonalTask.objects.filter(end_date__range=(first, last))
+        .exclude(progress='done')
+        .order_by('end_date', 'id')
+        .values_list('id', 'content', 'end_date', 'project_id', 'project__title', 'project__manager_id')
+    )
+    assignees = _group_pairs(PersonalTask.assignees.through.objects, 'personaltask_id', [row[0] for row in rows])
+    for task_id, content, end_date, project_id, project_title, manager_id in rows:
+        recipients = assignees.get(task_id) or {manager_id}
+        yield 'personal_task', task_id, end_date, f'{project_title} - {content}', project_id, None, recipients
+
+
+def _already_noticed(deadlines, first, last):
+    """이미 발송한 (source, object_id, end_date) 집합"""
+    ids_by_source = defaultdict(set)
+    for source, object_id, *_ in deadlines:
+        ids_by_source[source].add(object_id)
+    noticed = set()
+    for source, ids in ids_by_source.items():
+        for chunk in _chunks(ids):
+            noticed.update(
+                DeadlineNotice.objects.filter(source=source, object_id__in=chunk, end_date__range=(first, last))
+                .values_list('source', 'object_id', 'end_date')
+            )
+    return noticed
+
+
+def _claim(source, object_id, end_date):
+    """발송 기록을 넣어 본다. 다른 실행이 먼저 넣었으면 False (동시 실행 시 중복 발송 방지)"""
+    try:
+        with transaction.atomic():
+            DeadlineNotice.objects.create(source=source, object_id=object_id, end_date=end_date)
+    except IntegrityError:
+        return False
+    return True
+
+
+def _message(end_date, today):
+    days = (end_date - today).days
+    remaining = '오늘 마감' if days == 0 else f'D-{days}'
+    return f"마감일이 {end_date:%Y-%m-%d} 입니다 ({remaining})."
+
+
+def scan_deadlines(today=None, lead_days=None):
+    """마감일이 오늘~lead_days 일 뒤인 프로젝트/단계/개인 작업에 마감 임박 알림 발송
+
+    - 매 실행마다 [오늘, 오늘+lead_days] 구간 전체를 (end_date, id) 인덱스로 조회한다. 구간이
+      며칠치라 읽는 행이 적고, 지난 실행 뒤에 생성되었거나 마감일이 구간 안으로 바뀐 항목도 놓치지 않는다.
+    - DeadlineNotice 기록으로 같은 대상/마감일에는 한 번만 보낸다. 기록이 없던 대상만 행 단위로
+      INSERT 해 보고 실제로 넣은 대상에만 알림을 만들므로 동시에 실행돼도 중복 발송하지 않는다.
+    반환값: {'range': (시작일, 종료일), 'deadlines': 대상 수, 'notifications': 알림 수}
+    """
+    today = today or timezone.localdate()
+    lead_days = _lead_days() if lead_days is None else lead_days
+    first = today
+    horizon = today + timedelta(days=lead_days)
+
+    deadlines = [
+        *_project_deadlines(first, horizon),
+        *_phase_deadlines(first, horizon),
+        *_task_deadlines(first, horizon),
+    ]
+    noticed = _already_noticed(deadlines, first, horizon)
+
+    claimed = 0
+    notifications = []
+    with transaction.atomic():
+        for source, object_id, end_date, label, project_id, phase_id, recipients in deadlines:
+            if (source, object_id, end_date) in noticed or not _claim(source, object_id, end_date):
+                continue
+            claimed += 1
+            message = _message(end_date, today)
+            notifications.extend(
+                Notification(
+                    user_id=user_id, title=f'마감 임박: {label}'[:200], message=message,
+                    notification_type='deadline_approaching', project_id=project_id, phase_id=phase_id,
+                )
+                for user_id in sorted(recipients) if user_id is not None
+            )
+        bulk_notify(notifications)
+
+    return {'range': (first, horizon), 'deadlines': claimed, 'notifications': len(notifications)}
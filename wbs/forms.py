@@ -1,8 +1,16 @@
+from datetime import date, timedelta
+
 from django import forms
 from django.contrib.auth.models import User
 from django.db import models
 # Allauth 완전 제거 - Django 기본 로그인 사용
 from .models import Project, ProjectPhase, Comment, DailyProgress, TaskChecklistItem, UserProfile, SubscriptionPlan, UserSubscription, AdCampaign, Event, PersonalTask
+from .membership import projects_for_user
+from .recurrence import MAX_COUNT as MAX_RECURRENCE_COUNT, RecurrenceRule, is_expandable
+from .freebusy import event_span, find_conflicts
+
+# 반복 일정의 참석자 충돌을 확인하는 기간 (시작일부터)
+CONFLICT_CHECK_DAYS = 90
 
 # CustomLoginForm 비활성화 (Django 기본 로그인 사용)
 # class CustomLoginForm(AllauthLoginForm):
@@ -183,13 +191,20 @@ class UserForm(forms.ModelForm):
 
 class EventForm(forms.ModelForm):
     """일정 생성/편집 폼"""
+    exception_dates = forms.CharField(
+        required=False,
+        label='제외 날짜',
+        widget=forms.TextInput(attrs={'class': 'form-control', 'placeholder': '예: 2026-05-05, 2026-06-06'}),
+    )
+
     class Meta:
         model = Event
         fields = [
             'title', 'description', 'event_type', 'priority',
             'start_date', 'end_date', 'start_time', 'end_time', 'is_all_day',
             'related_project', 'location', 'meeting_link',
-            'reminder_minutes', 'is_recurring', 'is_private'
+            'reminder_minutes', 'is_recurring', 'is_private',
+            'recurrence_freq', 'recurrence_interval', 'recurrence_count', 'recurrence_until',
         ]
         widgets = {
             'title': forms.TextInput(attrs={
@@ -236,6 +251,22 @@ class EventForm(forms.ModelForm):
             }),
             'is_recurring': forms.CheckboxInput(attrs={'class': 'form-check-input'}),
             'is_private': forms.CheckboxInput(attrs={'class': 'form-check-input'}),
+            'recurrence_freq': forms.Select(attrs={'class': 'form-control'}),
+            'recurrence_interval': forms.NumberInput(attrs={
+                'class': 'form-control',
+                'min': '1',
+                'max': '99'
+            }),
+            'recurrence_count': forms.NumberInput(attrs={
+                'class': 'form-control',
+                'min': '1',
+                'max': str(MAX_RECURRENCE_COUNT),
+                'placeholder': '비우면 종료일까지 또는 계속'
+            }),
+            'recurrence_until': forms.DateInput(attrs={
+                'class': 'form-control',
+                'type': 'date'
+            }),
         }
     
     def __init__(self, *args, **kwargs):
@@ -244,14 +275,30 @@ class EventForm(forms.ModelForm):
         
         # 관련 프로젝트 필터링 (사용자가 참여한 프로젝트만)
         if user:
-            from django.db.models import Q
-            self.fields['related_project'].queryset = Project.objects.filter(
-                Q(manager=user) | Q(team_members=user)
-            ).distinct()
+            self.fields['related_project'].queryset = projects_for_user(user, roles=['manager', 'member'])
         
         # 시간 필드 조건부 표시
         self.fields['start_time'].required = False
         self.fields['end_time'].required = False
+        # 반복이 아닌 일정은 반복 간격을 보내지 않아도 된다
+        self.fields['recurrence_interval'].required = False
+        
+        if self.instance.pk and self.instance.recurrence_exceptions:
+            self.fields['exception_dates'].initial = ', '.join(self.instance.recurrence_exceptions)
+    
+    def clean_exception_dates(self):
+        """쉼표로 구분한 제외 날짜 -> ISO 날짜 문자열 목록 (정렬, 중복 제거)"""
+        value = self.cleaned_data.get('exception_dates') or ''
+        dates = set()
+        for part in value.replace('\n', ',').split(','):
+            part = part.strip()
+            if not part:
+                continue
+            try:
+                dates.add(date.fromisoformat(part))
+            except ValueError:
+                raise forms.ValidationError(f'"{part}" 는 YYYY-MM-DD 형식의 날짜가 아닙니다.')
+        return [day.isoformat() for day in sorted(dates)]
     
     def clean(self):
         cleaned_data = super().clean()
@@ -270,7 +317,52 @@ class EventForm(forms.ModelForm):
             if start_date == end_date and end_time <= start_time:
                 raise forms.ValidationError('종료 시간은 시작 시간보다 늦어야 합니다.')
         
+        # 반복 규칙 검증 (반복이 아니면 규칙을 비움)
+        if cleaned_data.get('is_recurring'):
+            count = cleaned_data.get('recurrence_count')
+            until = cleaned_data.get('recurrence_until')
+            if not cleaned_data.get('recurrence_freq'):
+                self.add_error('recurrence_freq', '반복 주기를 선택하세요.')
+            if not cleaned_data.get('recurrence_interval'):
+                self.add_error('recurrence_interval', '반복 간격은 1 이상이어야 합니다.')
+            if count and until:
+                raise forms.ValidationError('반복 횟수와 반복 종료일 중 하나만 지정하세요.')
+            if count and count > MAX_RECURRENCE_COUNT:
+                self.add_error('recurrence_count', f'반복 횟수는 최대 {MAX_RECURRENCE_COUNT}회입니다.')
+            if until and start_date and until < start_date:
+                self.add_error('recurrence_until', '반복 종료일은 시작일보다 늦어야 합니다.')
+        else:
+            cleaned_data['recurrence_freq'] = ''
+            cleaned_data['recurrence_interval'] = 1
+            cleaned_data['recurrence_count'] = None
+            cleaned_data['recurrence_until'] = None
+            cleaned_data['exception_dates'] = []
+        
         return cleaned_data
+    
+    def attendee_conflicts(self, attendees):
+        """같은 시간에 이미 일정이 있는 참석자 [(사용자, 겹치는 구간 수)] (저장 전 확인용)
+
+        is_valid() 이후, save() 전에 호출한다 (아직 저장되지 않은 폼 값으로 확인). 반복 일정은 시작일부터 CONFLICT_CHECK_DAYS 일 안의 회차를 확인한다.
+        """
+        event = self.instance
+        event.recurrence_exceptions = self.cleaned_data.get('exception_dates') or []
+        if is_expandable(event):
+            dates = RecurrenceRule(event).occurrences(event.start_date, event.start_date + timedelta(days=CONFLICT_CHECK_DAYS))
+        else:
+            dates = [(event.start_date, event.end_date or event.start_date)]
+        spans = [event_span(event, start_date, end_date) for start_date, end_date in dates]
+        users = {user.pk: user for user in attendees}
+        conflicts = find_conflicts(users, spans, exclude_event_id=event.pk)
+        return [(users[user_id], len(conflicts[user_id])) for user_id in sorted(conflicts)]
+    
+    def save(self, commit=True):
+        event = super().save(commit=False)
+        event.recurrence_exceptions = self.cleaned_data.get('exception_dates') or []
+        if commit:
+            event.save()
+            self.save_m2m()
+        return event
 
 
 class EventAttendeesForm(forms.Form):
@@ -0,0 +1,235 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from operator import itemgetter
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from .capacity import assignment_rows
+from .models import Event
+from .recurrence import RecurrenceRule, window_q
+
+# 확정 일정(busy)과 단계/개인 작업 배정(tentative, 하루 daily_hours 만큼) 구분
+BUSY = 'busy'
+TENTATIVE = 'tentative'
+# 종료 시간이 없는 일정의 기본 길이
+DEFAULT_EVENT_MINUTES = 60
+MAX_USERS = 200
+MAX_DAYS = 92
+EVENT_COLUMNS = ('id', 'creator_id', 'start_date', 'end_date', 'start_time', 'end_time', 'is_all_day', 'is_recurring', 'recurrence_freq')
+RECURRENCE_COLUMNS = (
+    'id', 'start_date', 'end_date', 'is_recurring',
+    'recurrence_freq', 'recurrence_interval', 'recurrence_count', 'recurrence_until', 'recurrence_exceptions',
+)
+
+
+def _work_day_start():
+    """단계/작업 배정 시간을 놓는 하루 시작 시각 (배정은 이 시각부터 daily_hours 시간)"""
+    return getattr(settings, 'FREEBUSY_WORK_DAY_START', time(9, 0))
+
+
+def _span(start_date, end_date, start_time, end_time, is_all_day):
+    if is_all_day or not start_time:
+        return datetime.combine(start_date, time.min), datetime.combine(end_date + timedelta(days=1), time.min)
+    start = datetime.combine(start_date, start_time)
+    end = datetime.combine(end_date, end_time) if end_time else None
+    if end is None or end <= start:
+        end = start + timedelta(minutes=DEFAULT_EVENT_MINUTES)
+    return start, end
+
+
+def event_span(event, start_date, end_date):
+    """일정(또는 회차) 한 건의 [시작, 끝) 로컬 시각 (하루 종일/시간 없는 일정은 날짜 전체)"""
+    return _span(start_date, end_date, event.start_time, event.end_time, event.is_all_day)
+
+
+def _merge_sorted(intervals):
+    """시작 순으로 정렬된 (시작, 끝, 출처) -> 겹치거나 맞닿은 구간을 합친 [[시작, 끝, 출처 목록]]"""
+    merged = []
+    for start, end, source in intervals:
+        if merged and start <= merged[-1][1]:
+            last = merged[-1]
+            if end > last[1]:
+                last[1] = end
+            last[2].append(source)
+        else:
+            merged.append([start, end, [source]])
+    return merged
+
+
+def _subtract(intervals, busy):
+    """합쳐진 tentative 구간에서 busy 구간을 뺀 나머지 조각 (두 정렬 목록을 함께 한 번 훑음)"""
+    pieces = []
+    index = 0
+    for start, end, sources in intervals:
+        while index < len(busy) and busy[index][1] <= start:
+            index += 1
+        cursor = start
+        position = index
+        while position < len(busy) and busy[position][0] < end:
+            if busy[position][0] > cursor:
+                pieces.append((cursor, busy[position][0], sources))
+            cursor = max(cursor, busy[position][1])
+            position += 1
+        if cursor < end:
+            pieces.append((cursor, end, sources))
+    return pieces
+
+
+def merge_intervals(intervals):
+    """(시작, 끝, 상태, 출처) 목록 -> 겹침을 합친 [(시작, 끝, 상태, 출처 목록)] (스윕 라인, 시작 순)
+
+    상태별로 시작 순 정렬 후 한 번 훑어 겹치거나 맞닿은 구간을 합치고, busy 가 우선이므로
+    tentative 구간에서는 busy 와 겹치는 부분을 잘라 낸다. 비교는 구간당 한 번이라 O(n log n) (정렬).
+    """
+    by_status = {BUSY: [], TENTATIVE: []}
+    for start, end, status, source in intervals:
+        if start < end:
+            by_status[status].append((start, end, source))
+    busy = _merge_sorted(sorted(by_status[BUSY], key=itemgetter(0)))
+    tentative = _subtract(_merge_sorted(sorted(by_status[TENTATIVE], key=itemgetter(0))), busy)
+    merged = [(start, end, BUSY, sources) for start, end, sources in busy]
+    merged.extend((start, end, TENTATIVE, sources) for start, end, sources in tentative)
+    merged.sort(key=itemgetter(0))
+    # 한 구간에 같은 출처(여러 날에 걸친 배정 등)가 여러 번 들어가지 않도록 정리
+    return [(start, end, status, list(dict.fromkeys(sources)) if len(sources) > 1 else sources)
+            for start, end, status, sources in merged]
+
+
+def _event_intervals(user_ids, first, last, exclude_event_id):
+    """사용자별 일정(생성자/참석자) 구간 {user_id: [(시작, 끝, busy, 출처)]}
+
+    모델 인스턴스 대신 필요한 컬럼만 튜플로 읽고, 참석자 조건은 JOIN 대신 하위 쿼리로 건다.
+    반복 규칙 컬럼은 반복 일정만 따로 읽는다.
+    """
+    attending = Event.attendees.through.objects.filter(window_q(first, last, 'event__'), user_id__in=user_ids)
+    events = Event.objects.filter(window_q(first, last)).filter(
+        Q(creator_id__in=user_ids) | Q(pk__in=attending.values('event_id'))
+    ).order_by()
+    if exclude_event_id:
+        events = events.exclude(pk=exclude_event_id)
+    rows = list(events.values_list(*EVENT_COLUMNS))
+    owners = defaultdict(set)
+    for row in rows:
+        owners[row[0]].add(row[1])
+    for event_id, user_id in attending.values_list('event_id', 'user_id'):
+        if event_id in owners:
+            owners[event_id].add(user_id)
+    rules = {
+        event.pk: RecurrenceRule(event)
+        for event in Event.objects.filter(pk__in=[row[0] for row in rows if row[7] and row[8]]).only(*RECURRENCE_COLUMNS)
+    }
+
+    intervals = defaultdict(list)
+    for event_id, _, start_date, end_date, start_time, end_time, is_all_day, _, _ in rows:
+        spans = rules[event_id].occurrences(first, last) if event_id in rules else [(start_date, end_date)]
+        source = ('event', event_id)
+        users = owners[event_id] & user_ids
+        for occurrence_start, occurrence_end in spans:
+            start, end = _span(occurrence_start, occurrence_end, start_time, end_time, is_all_day)
+            for user_id in users:
+                intervals[user_id].append((start, end, BUSY, source))
+    return intervals
+
+
+def _assignment_intervals(user_ids, first, last, intervals):
+    """단계/개인 작업 배정 -> 배정 기간의 날마다 근무 시작 시각부터 daily_hours 시간 (tentative)"""
+    work_start = _work_day_start()
+    for kind, object_id, user_id, start_date, end_date, daily_hours in assignment_rows(first, last, user_ids):
+        hours = timedelta(hours=daily_hours)
+        day = max(start_date, first)
+        while day <= min(end_date, last):
+            start = datetime.combine(day, work_start)
+            intervals[user_id].append((start, start + hours, TENTATIVE, (kind, object_id)))
+            day += timedelta(days=1)
+
+
+def busy_times(user_ids, first, last, exclude_event_id=None, include_assignments=True):
+    """사용자별 바쁜 구간 {user_id: [(시작, 끝, 상태, 출처 목록)]} (first~last 날짜, 로컬 시각)
+
+    일정은 생성자이거나 참석자인 경우 모두 포함하고 반복 일정은 구간 안 회차만 펼친다.
+    일정 수정 중에는 exclude_event_id 로 자기 자신을 뺀다.
+    """
+    user_ids = set(user_ids)
+    intervals = _event_intervals(user_ids, first, last, exclude_event_id)
+    if include_assignments:
+        _assignment_intervals(user_ids, first, last, intervals)
+    window_start = datetime.combine(first, time.min)
+    window_end = datetime.combine(last + timedelta(days=1), time.min)
+    result = {}
+    for user_id in user_ids:
+        merged = merge_intervals(intervals.get(user_id, ()))
+        result[user_id] = [
+            (max(start, window_start), min(end, window_end), status, sources)
+            for start, end, status, sources in merged if start < window_end and end > window_start
+        ]
+    return result
+
+
+def find_conflicts(user_ids, spans, exclude_event_id=None):
+    """[(시작, 끝)] 로컬 시각 구간들과 겹치는 일정(busy)이 있는 사용자 {user_id: [(시작, 끝, 출처 목록)]}"""
+    spans = sorted(spans)
+    if not spans:
+        return {}
+    first = spans[0][0].date()
+    last = max(end for _, end in spans) - timedelta(microseconds=1)
+    busy = busy_times(user_ids, first, last.date(), exclude_event_id, include_assignments=False)
+    conflicts = {}
+    for user_id, slots in busy.items():
+        # 두 정렬 목록을 함께 훑는다 (바쁜 구간이 끝나기 전에 시작하는 구간만 비교)
+        overlapping = []
+        index = 0
+        for slot_start, slot_end, status, sources in slots:
+            if status != BUSY:
+                continue
+            while index < len(spans) and spans[index][1] <= slot_start:
+                index += 1
+            if index < len(spans) and spans[index][0] < slot_end:
+                overlapping.append((slot_start, slot_end, sources))
+        if overlapping:
+            conflicts[user_id] = overlapping
+    return conflicts
+
+
+def _isoformatter(current):
+    """로컬 시각 -> 타임존 포함 ISO 문자열 함수
+
+    aware datetime 의 isoformat 은 시각마다 타임존 오프셋을 조회해 느리므로, 하루 동안 오프셋이
+    같으면 날짜별로 한 번 구한 '+09:00' 꼴 접미사를 naive isoformat 에 붙인다.
+    서머타임 전환일처럼 하루 안에 오프셋이 바뀌면 그 날만 시각마다 계산한다.
+    """
+    suffixes = {}
+
+    def isoformat(moment):
+        day = moment.date()
+        suffix = suffixes.get(day)
+        if suffix is None:
+            day_start = datetime.combine(day, time.min, current)
+            if day_start.utcoffset() == datetime.combine(day, time.max, current).utcoffset():
+                suffix = day_start.isoformat()[19:]
+            else:
+                suffix = ''
+            suffixes[day] = suffix
+        if suffix:
+            return moment.isoformat() + suffix
+        return moment.replace(tzinfo=current).isoformat()
+
+    return isoformat
+
+
+def serialize_busy(busy):
+    """JSON 응답용 {user_id: [{'start', 'end', 'status', 'sources'}]} (시각은 타임존 포함 ISO 형식)"""
+    isoformat = _isoformatter(timezone.get_current_timezone())
+    return {
+        str(user_id): [
+            {
+                'start': isoformat(start),
+                'end': isoformat(end),
+                'status': status,
+                'sources': [{'type': kind, 'id': object_id} for kind, object_id in sources],
+            }
+            for start, end, status, sources in slots
+        ]
+        for user_id, slots in busy.items()
+    }
@@ -0,0 +1,62 @@
+import heapq
+from bisect import bisect_right
+from datetime import timedelta
+
+
+class DateIntervalIndex:
+    """시작일/종료일 구간을 가진 객체들의 날짜 인덱스
+
+    객체를 시작일 기준으로 한 번 정렬해 두고, 조회 구간을 하루씩 훑으면서
+    (스윕 방식) 진행 중인 객체 집합만 갱신한다. 하루마다 전체 목록을 다시
+    스캔하지 않으므로 월간 달력 구성 비용이 O(일수 + 객체수 + 결과수)가 된다.
+    """
+
+    def __init__(self, items, start_attr='start_date', end_attr='end_date'):
+        self.start_attr = start_attr
+        self.end_attr = end_attr
+        # 쿼리셋이 넘어오면 여기서 한 번만 평가된다 (정렬은 안정 정렬이라 동일 시작일의 원래 순서 유지)
+        self.items = sorted(items, key=lambda item: getattr(item, start_attr))
+
+    def __len__(self):
+        return len(self.items)
+
+    def bucket_by_day(self, first_day, last_day):
+        """first_day~last_day 각 날짜에 걸치는 객체 목록을 {date: [객체, ...]} 로 반환
+
+        객체가 하나도 없는 날짜는 결과에 포함하지 않는다.
+        """
+        buckets = {}
+        if first_day > last_day:
+            return buckets
+
+        items = self.items
+        start_attr = self.start_attr
+        end_attr = self.end_attr
+        active = {}   # 진행 중인 객체 (삽입 순서 = 시작일 순서)
+        ends = []     # (종료일, 순번) 최소 힙
+        pos = 0
+        day = first_day
+        while day <= last_day:
+            while pos < len(items) and getattr(items[pos], start_attr) <= day:
+                item = items[pos]
+                end = getattr(item, end_attr)
+                if end >= day:
+                    active[pos] = item
+                    heapq.heappush(ends, (end, pos))
+                pos += 1
+            while ends and ends[0][0] < day:
+                _, expired = heapq.heappop(ends)
+                del active[expired]
+            if active:
+                buckets[day] = list(active.values())
+            elif pos >= len(items):
+                break
+            day += timedelta(days=1)
+        return buckets
+
+    def overlapping(self, first_day, last_day):
+        """first_day~last_day 구간과 겹치는 객체 목록 (시작일 순)"""
+        end_attr = self.end_attr
+        # 시작일이 last_day 이후인 객체는 정렬 순서상 뒤쪽에 모여 있으므로 이분 탐색으로 잘라낸다
+        stop = bisect_right(self.items, last_day, key=lambda item: getattr(item, self.start_attr))
+        return [item for item in self.items[:stop] if getattr(item, end_attr) >= first_day]
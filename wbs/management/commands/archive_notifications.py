@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from wbs.notifications import ARCHIVE_BATCH_SIZE, archive_read_notifications, read_retention_days
+
+
+class Command(BaseCommand):
+    help = '보관 기간이 지난 읽은 알림을 보관 테이블(NotificationArchive)로 옮깁니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None, help='보관 기간(일) (기본: settings.NOTIFICATION_READ_RETENTION_DAYS 또는 90)')
+        parser.add_argument('--batch-size', type=int, default=ARCHIVE_BATCH_SIZE, help='한 트랜잭션에서 옮길 알림 수')
+        parser.add_argument('--dry-run', action='store_true', help='옮길 대상 수만 출력')
+
+    def handle(self, *args, **options):
+        days = read_retention_days() if options['days'] is None else options['days']
+        count = archive_read_notifications(days, batch_size=max(1, options['batch_size']), dry_run=options['dry_run'])
+        if options['dry_run']:
+            self.stdout.write(f'{days}일이 지난 읽은 알림 {count}건이 보관 대상입니다.')
+        else:
+            self.stdout.write(self.style.SUCCESS(f'{days}일이 지난 읽은 알림 {count}건을 보관했습니다.'))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from wbs.models import Project
+from wbs.membership import sync_project_memberships
+
+
+class Command(BaseCommand):
+    help = '기존 프로젝트의 참여 색인(ProjectMembership)을 채우거나 원본 관계와 다시 맞춥니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500, help='한 번에 처리할 프로젝트 수')
+
+    def handle(self, *args, **options):
+        chunk_size = max(1, options['chunk_size'])
+        project_ids = list(Project.objects.order_by('id').values_list('id', flat=True))
+        created = removed = 0
+        for i in range(0, len(project_ids), chunk_size):
+            added, stale = sync_project_memberships(project_ids[i:i + chunk_size])
+            created += added
+            removed += stale
+        self.stdout.write(
+            self.style.SUCCESS(f'프로젝트 {len(project_ids)}개 처리: 참여 {created}건 추가, {removed}건 삭제')
+        )
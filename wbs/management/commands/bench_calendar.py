@@ -0,0 +1,64 @@
+import calendar as cal_module
+import random
+import time
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand
+
+from wbs.intervals import DateIntervalIndex
+
+
+class Command(BaseCommand):
+    help = '월간 달력 일자별 분배 성능을 기존 방식(일자별 전체 스캔)과 구간 인덱스로 비교합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='100,1000,5000,10000', help='프로젝트 수 목록 (쉼표 구분)')
+        parser.add_argument('--repeat', type=int, default=5, help='측정 반복 횟수')
+        parser.add_argument('--year', type=int, default=2025)
+        parser.add_argument('--month', type=int, default=10)
+
+    def handle(self, *args, **options):
+        year, month = options['year'], options['month']
+        first_day = date(year, month, 1)
+        last_day = date(year, month, cal_module.monthrange(year, month)[1])
+        month_dates = [d for week in cal_module.Calendar().monthdatescalendar(year, month) for d in week]
+        rng = random.Random(42)
+
+        self.stdout.write(f'{"projects":>10} {"scan(ms)":>12} {"index(ms)":>12} {"speedup":>9}')
+        for size in [int(s) for s in options['sizes'].split(',') if s.strip()]:
+            # 해당 월과 겹치는 프로젝트만 조회되므로 모두 월 범위와 겹치도록 생성
+            projects = []
+            for _ in range(size):
+                start = first_day + timedelta(days=rng.randint(-60, 30))
+                end = max(start, first_day) + timedelta(days=rng.randint(0, 90))
+                projects.append(SimpleNamespace(start_date=start, end_date=end))
+            # 뷰의 order_by('start_date')와 동일한 순서
+            projects.sort(key=lambda p: p.start_date)
+
+            def scan():
+                return {
+                    d: [p for p in projects if p.start_date <= d <= p.end_date]
+                    for d in month_dates if d.month == month
+                }
+
+            def indexed():
+                return DateIntervalIndex(projects).bucket_by_day(first_day, last_day)
+
+            expected = {d: v for d, v in scan().items() if v}
+            if indexed() != expected:
+                self.stderr.write(self.style.ERROR(f'{size}: 결과 불일치'))
+                continue
+
+            scan_ms = self._best_of(scan, options['repeat'])
+            index_ms = self._best_of(indexed, options['repeat'])
+            self.stdout.write(f'{size:>10} {scan_ms:>12.2f} {index_ms:>12.2f} {scan_ms / index_ms:>8.1f}x')
+
+    @staticmethod
+    def _best_of(func, repeat):
+        best = float('inf')
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - started)
+        return best * 1000
@@ -0,0 +1,93 @@
+import json
+import random
+import time
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from wbs.capacity import capacity_report
+from wbs.models import PersonalTask, Project, ProjectPhase
+
+
+class Command(BaseCommand):
+    help = '팀 가동률 리포트(사용자 x 일수 배정 시간) 계산 시간을 측정합니다 (DB 변경은 롤백)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=500)
+        parser.add_argument('--days', type=int, default=365)
+        parser.add_argument('--phases', type=int, default=1000, help='생성할 단계 수 (담당자 1~5명)')
+        parser.add_argument('--tasks', type=int, default=1500, help='생성할 개인 작업 수 (담당자 1~3명)')
+        parser.add_argument('--repeat', type=int, default=3)
+        parser.add_argument('--seed', type=int, default=25)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        first = date.today().replace(day=1)
+        last = first + timedelta(days=options['days'] - 1)
+
+        def span():
+            start = first + timedelta(days=rng.randint(-30, options['days']))
+            return start, start + timedelta(days=rng.randint(3, 60))
+
+        with transaction.atomic():
+            users = User.objects.bulk_create([User(username=f'bench-capacity-{i}') for i in range(options['users'])])
+            project = Project.objects.create(title='bench-capacity', manager=users[0], start_date=first, end_date=last)
+            phases = []
+            for i in range(options['phases']):
+                start, end = span()
+                phases.append(ProjectPhase(project=project, title=f'phase {i}', description='', start_date=start,
+                                           end_date=end, daily_hours=rng.randint(1, 8)))
+            phases = ProjectPhase.objects.bulk_create(phases, batch_size=1000)
+            tasks = []
+            for i in range(options['tasks']):
+                start, end = span()
+                tasks.append(PersonalTask(project=project, team_name='bench', content=f'task {i}', start_date=start,
+                                          end_date=end, daily_hours=rng.randint(1, 4)))
+            tasks = PersonalTask.objects.bulk_create(tasks, batch_size=1000)
+            ProjectPhase.assignees.through.objects.bulk_create([
+                ProjectPhase.assignees.through(projectphase_id=phase.pk, user_id=user.pk)
+                for phase in phases for user in rng.sample(users, rng.randint(1, 5))
+            ], batch_size=2000)
+            PersonalTask.assignees.through.objects.bulk_create([
+                PersonalTask.assignees.through(personaltask_id=task.pk, user_id=user.pk)
+                for task in tasks for user in rng.sample(users, rng.randint(1, 3))
+            ], batch_size=2000)
+
+            timings = []
+            for _ in range(options['repeat']):
+                started = time.perf_counter()
+                report = capacity_report(first, last)
+                computed = time.perf_counter()
+                body = json.dumps({**report, 'start': first.isoformat(), 'end': last.isoformat()})
+                timings.append(((computed - started) * 1000, (time.perf_counter() - computed) * 1000))
+
+            # 날짜별로 하나씩 더하는 단순 방식과 결과 비교
+            user_ids = {user.pk for user in users}
+            naive = {}
+            for phase in ProjectPhase.objects.filter(project=project).prefetch_related('assignees'):
+                for user in phase.assignees.all():
+                    row = naive.setdefault(user.pk, [0] * options['days'])
+                    day = max(phase.start_date, first)
+                    while day <= min(phase.end_date, last):
+                        row[(day - first).days] += phase.daily_hours
+                        day += timedelta(days=1)
+            for task in PersonalTask.objects.filter(project=project).prefetch_related('assignees'):
+                for user in task.assignees.all():
+                    row = naive.setdefault(user.pk, [0] * options['days'])
+                    day = max(task.start_date, first)
+                    while day <= min(task.end_date, last):
+                        row[(day - first).days] += task.daily_hours
+                        day += timedelta(days=1)
+            matches = all(
+                naive.get(user['id'], [0] * options['days']) == hours
+                for user, hours in zip(report['users'], report['hours']) if user['id'] in user_ids
+            )
+
+            self.stdout.write(
+                f'사용자 {len(users)}명 x {options["days"]}일 (단계 {len(phases)}개, 개인 작업 {len(tasks)}개): '
+                f'계산 최소 {min(t for t, _ in timings):.1f} ms, JSON 직렬화 최소 {min(t for _, t in timings):.1f} ms '
+                f'({len(body) / 1024:.0f} KB), 초과 배정 {report["overallocated_users"]}명, 단순 합산과 일치: {matches}'
+            )
+            transaction.set_rollback(True)
@@ -0,0 +1,84 @@
+import random
+import time
+from datetime import date, time as dtime, timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from wbs.freebusy import busy_times, serialize_busy
+from wbs.models import Event, PersonalTask, Project, ProjectPhase
+
+
+class Command(BaseCommand):
+    help = '사용자 여러 명의 한 달 free/busy 계산 시간을 측정합니다 (DB 변경은 롤백)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50, help='조회할 사용자 수')
+        parser.add_argument('--events', type=int, default=40, help='사용자당 한 달 일정 수')
+        parser.add_argument('--days', type=int, default=31, help='조회 일수')
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--seed', type=int, default=24)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        first = date.today().replace(day=1)
+        last = first + timedelta(days=options['days'] - 1)
+        with transaction.atomic():
+            users = User.objects.bulk_create([User(username=f'bench-freebusy-{i}') for i in range(options['users'])])
+            project = Project.objects.create(title='bench-freebusy', manager=users[0], start_date=first, end_date=last)
+
+            events = []
+            for user in users:
+                for _ in range(options['events']):
+                    day = first + timedelta(days=rng.randrange(options['days']))
+                    start = dtime(rng.randint(8, 18), rng.choice((0, 30)))
+                    events.append(Event(
+                        title='bench', creator=user, start_date=day, end_date=day, start_time=start,
+                        end_time=dtime(start.hour + 1, start.minute), is_all_day=rng.random() < 0.05,
+                    ))
+            # 일부는 매주 반복 일정
+            for user in users[::5]:
+                events.append(Event(
+                    title='weekly', creator=user, start_date=first - timedelta(days=90), end_date=first - timedelta(days=90),
+                    start_time=dtime(10), end_time=dtime(11), is_recurring=True, recurrence_freq='weekly',
+                ))
+            events = Event.objects.bulk_create(events, batch_size=1000)
+            Attendee = Event.attendees.through
+            Attendee.objects.bulk_create(
+                [Attendee(event_id=event.pk, user_id=rng.choice(users).pk) for event in events if rng.random() < 0.5],
+                ignore_conflicts=True,
+            )
+
+            phases = ProjectPhase.objects.bulk_create([
+                ProjectPhase(project=project, title=f'phase {i}', description='', start_date=first + timedelta(days=i),
+                             end_date=first + timedelta(days=i + 14), daily_hours=rng.randint(2, 8))
+                for i in range(10)
+            ])
+            tasks = PersonalTask.objects.bulk_create([
+                PersonalTask(project=project, team_name='bench', content=f'task {i}', start_date=first + timedelta(days=i),
+                             end_date=first + timedelta(days=i + 7), daily_hours=rng.randint(1, 4))
+                for i in range(20)
+            ])
+            ProjectPhase.assignees.through.objects.bulk_create([
+                ProjectPhase.assignees.through(projectphase_id=phase.pk, user_id=user.pk)
+                for phase in phases for user in rng.sample(users, 5)
+            ])
+            PersonalTask.assignees.through.objects.bulk_create([
+                PersonalTask.assignees.through(personaltask_id=task.pk, user_id=user.pk)
+                for task in tasks for user in rng.sample(users, 3)
+            ])
+
+            user_ids = [user.pk for user in users]
+            timings = []
+            for _ in range(options['repeat']):
+                started = time.perf_counter()
+                busy = serialize_busy(busy_times(user_ids, first, last))
+                timings.append((time.perf_counter() - started) * 1000)
+            slots = sum(len(value) for value in busy.values())
+            self.stdout.write(
+                f'사용자 {len(users)}명 x {options["days"]}일 (일정 {len(events)}건): '
+                f'최소 {min(timings):.1f} ms / 평균 {sum(timings) / len(timings):.1f} ms, 바쁜 구간 {slots}개'
+            )
+
+            transaction.set_rollback(True)
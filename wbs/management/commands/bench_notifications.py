@@ -0,0 +1,60 @@
+import time
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from wbs.models import Notification, Project
+from wbs.notifications import dispatch_notifications
+
+
+class Command(BaseCommand):
+    help = '다수 수신자 알림 발송을 건별 create 와 dispatch_notifications(bulk_create)로 비교합니다 (DB 변경은 롤백)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recipients', type=int, default=10000, help='수신자 수')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        count = options['recipients']
+        with transaction.atomic():
+            users = User.objects.bulk_create([User(username=f'bench-notify-{i}') for i in range(count)])
+            user_ids = [user.pk for user in users] if users[0].pk else list(
+                User.objects.filter(username__startswith='bench-notify-').values_list('pk', flat=True)
+            )
+            today = date.today()
+            project = Project.objects.create(
+                title='알림 벤치마크', description='', manager_id=user_ids[0],
+                start_date=today, end_date=today + timedelta(days=7),
+            )
+
+            started = time.perf_counter()
+            for user_id in user_ids:
+                Notification.objects.create(
+                    user_id=user_id, title='마감 임박(건별)', message='벤치마크',
+                    notification_type='deadline_approaching', project=project,
+                )
+            naive = time.perf_counter() - started
+
+            started = time.perf_counter()
+            created = dispatch_notifications(
+                user_ids, '마감 임박', '벤치마크', notification_type='deadline_approaching',
+                project=project, batch_size=options['batch_size'],
+            )
+            bulk = time.perf_counter() - started
+
+            # 같은 알림을 다시 보내면 dedupe 구간 안이므로 모두 건너뛴다
+            started = time.perf_counter()
+            duplicated = dispatch_notifications(
+                user_ids, '마감 임박', '벤치마크', notification_type='deadline_approaching',
+                project=project, batch_size=options['batch_size'],
+            )
+            dedupe = time.perf_counter() - started
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(f'수신자 {count}명')
+        self.stdout.write(f'  건별 create      : {naive * 1000:>10.1f} ms')
+        self.stdout.write(f'  dispatch (bulk)  : {bulk * 1000:>10.1f} ms  ({created}건, {naive / bulk:.1f}x)')
+        self.stdout.write(f'  재발송 (dedupe)  : {dedupe * 1000:>10.1f} ms  ({duplicated}건 생성)')
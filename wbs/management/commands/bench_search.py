@@ -0,0 +1,92 @@
+import random
+import time
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+
+from wbs.models import Project
+from wbs.ngram_search import NgramSearchBackend, build_segment
+from wbs.search import SQLiteFTSBackend, query_terms, rebuild_search_index
+
+# 공백 없이 붙여 쓰는 합성어/조사가 섞인 제목·설명을 만든다
+WORDS = ['프로젝트', '관리', '결제', '시스템', '고객', '정산', '모바일', '앱', '개편', '구축', '운영', '데이터', '분석', '마케팅', '인프라', '보안', '점검', '배포']
+PARTICLES = ['', '', '를', '의', '에서', '및']
+QUERIES = ['관리', '프로젝트', '시스템개편', '고객 데이터', '보안점검']
+
+
+def _phrase(rng, words):
+    tokens = []
+    for _ in range(words):
+        # 절반은 두 단어를 붙여 쓴다 ("프로젝트관리")
+        token = rng.choice(WORDS) + (rng.choice(WORDS) if rng.random() < 0.5 else '')
+        tokens.append(token + rng.choice(PARTICLES))
+    return ' '.join(tokens)
+
+
+def _timed(func, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - started) / repeat * 1000, result
+
+
+class Command(BaseCommand):
+    help = '프로젝트 검색을 icontains 스캔, 기본 전문 색인, n-gram 색인으로 비교합니다 (DB 변경은 롤백)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000, help='생성할 프로젝트 수')
+        parser.add_argument('--repeat', type=int, default=5, help='검색어별 반복 횟수')
+        parser.add_argument('--seed', type=int, default=20)
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        rng = random.Random(options['seed'])
+        with transaction.atomic():
+            manager = User.objects.create(username='bench-search')
+            today = date.today()
+            Project.objects.bulk_create(
+                [
+                    Project(
+                        title=_phrase(rng, 3), description=_phrase(rng, 12), manager=manager,
+                        start_date=today, end_date=today + timedelta(days=30),
+                    )
+                    for _ in range(rows)
+                ],
+                batch_size=2000,
+            )
+
+            elapsed, _ = _timed(lambda: rebuild_search_index(['project']), 1)
+            self.stdout.write(f'프로젝트 {rows}건 검색 문서 생성: {elapsed:.0f} ms')
+            elapsed, segment = _timed(build_segment, 1)
+            self.stdout.write(
+                f'n-gram 색인 생성: {elapsed:.0f} ms (n-gram {segment.gram_count}개, '
+                f'포스팅 {segment.size_bytes / 1024 / 1024:.1f} MB)'
+            )
+
+            backends = [('n-gram', NgramSearchBackend())]
+            if connection.vendor == 'sqlite':
+                backends.insert(0, ('FTS5', SQLiteFTSBackend()))
+
+            self.stdout.write(f'{"검색어":<12}{"icontains[:10]":>18}{"icontains 전체":>18}' + ''.join(f'{name:>18}' for name, _ in backends))
+            for query in QUERIES:
+                terms = query_terms(query)
+                condition = Q()
+                for term in terms:
+                    condition &= Q(title__icontains=term) | Q(description__icontains=term)
+                # 기존 views.search 와 같은 조회 (순위 없이 앞 10건)
+                first_ms, _ = _timed(lambda: list(Project.objects.filter(condition)[:10]), repeat)
+                # 순위를 매기려면 일치하는 행을 모두 읽어야 한다
+                all_ms, matched = _timed(lambda: Project.objects.filter(condition).count(), repeat)
+                cells = [f'{first_ms:>11.1f} ms', f'{all_ms:>9.1f} ms ({matched:>5})']
+                for name, backend in backends:
+                    ms, _ = _timed(lambda: backend.search('project', terms, 50), repeat)
+                    found = len(backend.search('project', terms, rows))
+                    cells.append(f'{ms:>9.1f} ms ({found:>5})')
+                self.stdout.write(f'{query:<12}' + ''.join(f'{cell:>18}' for cell in cells))
+
+            transaction.set_rollback(True)
+
+        self.stdout.write('시간은 상위 50건 검색 평균, 괄호 안은 전체 일치 건수 (FTS5 는 단어 접두사만 찾으므로 합성어 안쪽은 놓친다)')
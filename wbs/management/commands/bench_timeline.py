@@ -0,0 +1,66 @@
+import random
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+
+from wbs.timeline import Timeline
+
+
+class Command(BaseCommand):
+    help = '타임라인 막대 좌표 계산 성능을 기존 방식(행별 날짜 연산)과 Timeline.place 로 비교합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000, help='행 수')
+        parser.add_argument('--days', type=int, default=31, help='표시 구간 일수')
+        parser.add_argument('--repeat', type=int, default=5, help='측정 반복 횟수')
+
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+        window_start = date(2025, 10, 1)
+        window_end = window_start + timedelta(days=options['days'] - 1)
+        px_per_day = 24
+        spans = []
+        for _ in range(options['rows']):
+            start = window_start + timedelta(days=rng.randint(-60, options['days'] + 30))
+            spans.append((start, start + timedelta(days=rng.randint(0, 90))))
+
+        def legacy():
+            # 기존 뷰의 방식: while 루프 헤더 + 행마다 date 비교/차이 계산
+            days = []
+            current = window_start
+            left_px = 0
+            while current <= window_end:
+                days.append((current, left_px))
+                left_px += px_per_day
+                current += timedelta(days=1)
+            bars = []
+            for start_date, end_date in spans:
+                s = max(start_date, window_start)
+                e = max(s, min(end_date, window_end))
+                bars.append({
+                    'left': (s - window_start).days * px_per_day,
+                    'width': ((e - s).days + 1) * px_per_day,
+                    'grid_col_start': (s - window_start).days + 1,
+                    'grid_span': (e - s).days + 1,
+                })
+            return days, bars
+
+        def shared():
+            timeline = Timeline(window_start, window_end, px_per_day)
+            return timeline.days_with_pos(), timeline.place(spans, skip_outside=False)
+
+        legacy_ms = self._best_of(legacy, options['repeat'])
+        shared_ms = self._best_of(shared, options['repeat'])
+        self.stdout.write(f"rows={options['rows']} days={options['days']}")
+        self.stdout.write(f'  legacy   : {legacy_ms:8.2f} ms')
+        self.stdout.write(f'  timeline : {shared_ms:8.2f} ms ({legacy_ms / shared_ms:.1f}x)')
+
+    @staticmethod
+    def _best_of(func, repeat):
+        best = float('inf')
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - started)
+        return best * 1000
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from wbs.ngram_search import BUILD_CHUNK_SIZE, build_segment
+
+
+class Command(BaseCommand):
+    help = '검색 문서로 n-gram 색인(포스팅 리스트)을 새로 만듭니다 (n-gram 검색 모드용, 주기적으로 실행)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=BUILD_CHUNK_SIZE, help='한 번에 읽을 검색 문서 수')
+
+    def handle(self, *args, **options):
+        segment = build_segment(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'n-gram 색인을 만들었습니다: 문서 {segment.entry_count}건, n-gram {segment.gram_count}개, '
+            f'포스팅 {segment.size_bytes / 1024:.1f} KB'
+        ))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from wbs.ad_counters import flush_ad_counters
+
+
+class Command(BaseCommand):
+    help = '캐시에 누적된 광고 노출/클릭 수를 DB 에 반영합니다 (주기 실행용, REDIS_URL 로 공유 캐시를 쓸 때만 웹 프로세스의 누적분이 보임)'
+
+    def handle(self, *args, **options):
+        flushed = flush_ad_counters()
+        self.stdout.write(self.style.SUCCESS(
+            f"노출 {flushed['impressions']}건, 클릭 {flushed['clicks']}건을 반영했습니다."
+        ))
@@ -0,0 +1,78 @@
+import threading
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from wbs.ad_counters import FLUSH_LOCK_KEY, counter_cache, flush_ad_counters, record_click, record_impressions
+from wbs.models import AdCampaign
+
+
+class Command(BaseCommand):
+    help = '여러 스레드에서 동시에 광고 노출/클릭을 기록(및 flush)해 누락 없이 집계되는지 확인합니다 (테스트 광고는 끝나면 삭제)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--per-thread', type=int, default=500, help='스레드당 페이지 뷰 수')
+        parser.add_argument('--ads', type=int, default=3, help='페이지 뷰당 노출 광고 수')
+        parser.add_argument('--flush-interval', type=float, default=0.01, help='flush 간격(초) - 기록 중에도 계속 flush 되도록 짧게')
+
+    def handle(self, *args, **options):
+        threads, per_thread, ad_count = options['threads'], options['per_thread'], options['ads']
+        views = threads * per_thread
+        now = timezone.now()
+        ads = [
+            AdCampaign.objects.create(
+                title=f'부하 테스트 {i}', description='', target_url='https://example.com',
+                status='active', start_date=now - timedelta(days=1), end_date=now + timedelta(days=1),
+                # 마지막 광고는 최대 노출수 제한 확인용
+                max_impressions=views // 2 if i == ad_count - 1 else views * 10,
+                max_clicks=views,
+            )
+            for i in range(ad_count)
+        ]
+        ad_ids = [ad.pk for ad in ads]
+
+        def visitor():
+            try:
+                for i in range(per_thread):
+                    record_impressions(ad_ids)
+                    if i % 10 == 0:
+                        record_click(ad_ids[0])
+            finally:
+                connection.close()
+
+        try:
+            with override_settings(AD_COUNTER_FLUSH_INTERVAL=options['flush_interval']):
+                counter_cache().delete(FLUSH_LOCK_KEY)
+                workers = [threading.Thread(target=visitor) for _ in range(threads)]
+                started = time.perf_counter()
+                for worker in workers:
+                    worker.start()
+                for worker in workers:
+                    worker.join()
+                flush_ad_counters(ad_ids)
+                elapsed = time.perf_counter() - started
+
+            expected_clicks = threads * len(range(0, per_thread, 10))
+            ok = True
+            for ad in AdCampaign.objects.filter(pk__in=ad_ids).order_by('pk'):
+                expected_impressions = min(views, ad.max_impressions)
+                expected = expected_clicks if ad.pk == ad_ids[0] else 0
+                matched = (ad.current_impressions, ad.current_clicks) == (expected_impressions, expected)
+                ok = ok and matched
+                self.stdout.write(
+                    f"{ad.title}: 노출 {ad.current_impressions}/{expected_impressions} (최대 {ad.max_impressions}), "
+                    f"클릭 {ad.current_clicks}/{expected} {'OK' if matched else 'LOST'}"
+                )
+        finally:
+            AdCampaign.objects.filter(pk__in=ad_ids).delete()
+
+        summary = f'{threads}스레드 x {per_thread}뷰 x 광고 {ad_count}개, {elapsed:.2f}s'
+        if ok:
+            self.stdout.write(self.style.SUCCESS(f'누락 없음 - {summary}'))
+        else:
+            self.stderr.write(self.style.ERROR(f'집계 누락 발생 - {summary}'))
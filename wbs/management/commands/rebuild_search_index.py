@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from wbs.search import REBUILD_CHUNK_SIZE, SEARCH_SOURCES, get_backend, rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = '프로젝트/댓글/일정/개인 작업/알림/사용자 검색 색인을 원본 데이터로 다시 만듭니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--source', action='append', dest='sources', choices=list(SEARCH_SOURCES), help='특정 대상 유형만 (여러 번 지정 가능)')
+        parser.add_argument('--chunk-size', type=int, default=REBUILD_CHUNK_SIZE, help='한 번에 색인할 행 수')
+
+    def handle(self, *args, **options):
+        counts = rebuild_search_index(options['sources'], chunk_size=options['chunk_size'])
+        for source, count in counts.items():
+            self.stdout.write(f'{source}: {count}건')
+        self.stdout.write(self.style.SUCCESS(
+            f'검색 색인을 다시 만들었습니다 ({type(get_backend()).__name__}, 총 {sum(counts.values())}건).'
+        ))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from wbs.notifications import reconcile_unread_counts
+
+
+class Command(BaseCommand):
+    help = '사용자별 미읽음 알림 카운터를 실제 알림 수와 다시 맞춥니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='user_ids', help='특정 사용자 id만 (여러 번 지정 가능)')
+
+    def handle(self, *args, **options):
+        drifted = reconcile_unread_counts(options['user_ids'])
+        self.stdout.write(self.style.SUCCESS(f'미읽음 카운터 {drifted}건을 바로잡았습니다.'))
@@ -0,0 +1,44 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.utils import timezone
+
+from wbs.reminders import ReminderScheduler, send_reminders
+
+
+class Command(BaseCommand):
+    help = '일정 알림(reminder_minutes)을 시각에 맞춰 보내는 워커를 실행합니다 (상주 프로세스, --once 는 한 번만 처리)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--poll', type=int, default=30, help='바뀐 일정을 다시 읽는 간격(초)')
+        parser.add_argument('--horizon', type=int, default=6, help='미리 읽어 둘 알림 구간(시간)')
+        parser.add_argument('--once', action='store_true', help='지금까지 시각이 된 알림만 보내고 종료')
+
+    def handle(self, *args, **options):
+        if options['poll'] < 1 or options['horizon'] < 1:
+            raise CommandError('--poll 과 --horizon 은 1 이상이어야 합니다.')
+        scheduler = ReminderScheduler(horizon=timedelta(hours=options['horizon']))
+        scheduler.load(timezone.now())
+        self.stdout.write(f'알림 {len(scheduler)}건을 읽었습니다 (앞으로 {options["horizon"]}시간).')
+
+        try:
+            while True:
+                close_old_connections()
+                now = timezone.now()
+                scheduler.refresh(now)
+                scheduler.extend(now)
+                sent = send_reminders(scheduler.pop_due(now))
+                if sent:
+                    self.stdout.write(self.style.SUCCESS(f'{now:%Y-%m-%d %H:%M:%S} 알림 {sent}건 발송'))
+                if options['once']:
+                    return
+                # 다음 알림 시각까지 자되, 바뀐 일정을 읽도록 poll 간격보다 오래 자지는 않는다
+                wait = options['poll']
+                next_fire_at = scheduler.next_fire_at()
+                if next_fire_at is not None:
+                    wait = min(wait, max((next_fire_at - timezone.now()).total_seconds(), 0))
+                time.sleep(wait)
+        except KeyboardInterrupt:
+            self.stdout.write('알림 워커를 종료합니다.')
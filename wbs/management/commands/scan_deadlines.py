@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from wbs.deadlines import scan_deadlines
+
+
+class Command(BaseCommand):
+    help = '마감일이 다가온 프로젝트/단계/개인 작업에 마감 임박 알림을 보냅니다 (주기 실행용, 반복 실행해도 중복 발송 없음)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None, help='며칠 전부터 알릴지 (기본: settings.DEADLINE_NOTICE_DAYS 또는 3)')
+        parser.add_argument('--date', default=None, help='기준일 YYYY-MM-DD (기본: 오늘)')
+
+    def handle(self, *args, **options):
+        today = None
+        if options['date']:
+            try:
+                today = datetime.strptime(options['date'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError('--date 는 YYYY-MM-DD 형식이어야 합니다.')
+
+        result = scan_deadlines(today=today, lead_days=options['days'])
+        first, last = result['range']
+        self.stdout.write(self.style.SUCCESS(
+            f"{first}~{last}: 마감 대상 {result['deadlines']}건, 알림 {result['notifications']}건 발송"
+        ))
@@ -0,0 +1,90 @@
+from .models import Project, ProjectPhase, ProjectMembership, SyncAccessChange
+
+# "참여" 역할 (매니저 제외)
+PARTICIPANT_ROLES = ['tl', 'member', 'assignee']
+
+
+def _desired_memberships(project_ids):
+    """원본 관계(manager/tl/team_members/phase assignees)에서 계산한 (project_id, user_id, role) 집합"""
+    desired = set()
+    for project_id, manager_id, tl_id in Project.objects.filter(pk__in=project_ids).values_list('id', 'manager_id', 'tl_id'):
+        desired.add((project_id, manager_id, 'manager'))
+        if tl_id:
+            desired.add((project_id, tl_id, 'tl'))
+
+    team_members = Project.team_members.through.objects.filter(project_id__in=project_ids)
+    for project_id, user_id in team_members.values_list('project_id', 'user_id'):
+        desired.add((project_id, user_id, 'member'))
+
+    assignees = ProjectPhase.assignees.through.objects.filter(projectphase__project_id__in=project_ids)
+    for project_id, user_id in assignees.values_list('projectphase__project_id', 'user_id'):
+        desired.add((project_id, user_id, 'assignee'))
+    return desired
+
+
+def _log_project_access(pairs):
+    """참여가 생기거나 없어진 (project_id, user_id) 를 모바일 동기화 접근 변경으로 기록 (wbs.sync 참고)"""
+    SyncAccessChange.objects.bulk_create([
+        SyncAccessChange(user_id=user_id, model_name='projects', object_id=project_id)
+        for project_id, user_id in set(pairs)
+    ])
+
+
+def sync_project_memberships(project_ids):
+    """주어진 프로젝트들의 참여 색인을 원본 관계와 일치시킨다 (차이만 추가/삭제)"""
+    project_ids = {pk for pk in project_ids if pk is not None}
+    if not project_ids:
+        return 0, 0
+
+    desired = _desired_memberships(project_ids)
+    existing = {
+        (project_id, user_id, role): pk
+        for pk, project_id, user_id, role in ProjectMembership.objects.filter(
+            project_id__in=project_ids
+        ).values_list('pk', 'project_id', 'user_id', 'role')
+    }
+
+    stale = {key: pk for key, pk in existing.items() if key not in desired}
+    missing = [
+        ProjectMembership(project_id=project_id, user_id=user_id, role=role)
+        for project_id, user_id, role in desired
+        if (project_id, user_id, role) not in existing
+    ]
+    if stale:
+        ProjectMembership.objects.filter(pk__in=stale.values()).delete()
+    if missing:
+        ProjectMembership.objects.bulk_create(missing, ignore_conflicts=True)
+    _log_project_access(
+        [(project_id, user_id) for project_id, user_id, _ in stale]
+        + [(membership.project_id, membership.user_id) for membership in missing]
+    )
+    return len(missing), len(stale)
+
+
+def remove_stale_assignee_memberships(project_id, log_access=True):
+    """남은 단계 담당자에 없는 'assignee' 참여 행만 삭제 (새 행은 만들지 않음)
+
+    단계 삭제(post_delete)용. 프로젝트/사용자 삭제의 연쇄 삭제 중에도 호출되므로, 곧 지워질
+    프로젝트의 참여 행을 다시 만들면 외래 키 제약에 걸린다. 같은 이유로 연쇄 삭제 중에는
+    log_access=False 로 접근 변경 기록도 남기지 않는다 (프로젝트 삭제 기록이 대신한다).
+    """
+    assignees = ProjectPhase.assignees.through.objects.filter(projectphase__project_id=project_id).values('user_id')
+    stale = ProjectMembership.objects.filter(project_id=project_id, role='assignee').exclude(user_id__in=assignees)
+    user_ids = list(stale.values_list('user_id', flat=True))
+    if user_ids:
+        stale.delete()
+        if log_access:
+            _log_project_access([(project_id, user_id) for user_id in user_ids])
+
+
+def membership_project_ids(user, roles=None):
+    """사용자가 참여한 프로젝트 id 서브쿼리 (roles 로 역할 제한)"""
+    memberships = ProjectMembership.objects.filter(user=user)
+    if roles is not None:
+        memberships = memberships.filter(role__in=roles)
+    return memberships.values('project_id')
+
+
+def projects_for_user(user, roles=None):
+    """참여 색인으로 사용자의 프로젝트 조회 (중복 없이, JOIN/DISTINCT 없이)"""
+    return Project.objects.filter(pk__in=membership_project_ids(user, roles))
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.6 on 2026-10-17 21:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wbs", "0010_project_is_personal_project_project_is_team_project"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="wbs_event_created_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="wbs_project_created_id_idx"
+            ),
+        ),
+    ]
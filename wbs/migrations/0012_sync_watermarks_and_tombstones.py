@@ -0,0 +1,76 @@
+# Generated by Django 5.2.6 on 2026-10-17 21:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wbs", "0011_api_keyset_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SyncTombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("model_name", models.CharField(max_length=50, verbose_name="모델")),
+                ("object_id", models.BigIntegerField(verbose_name="객체 ID")),
+                (
+                    "deleted_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="삭제일"),
+                ),
+            ],
+            options={
+                "verbose_name": "삭제 기록",
+                "verbose_name_plural": "삭제 기록",
+                "ordering": ["deleted_at", "id"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["updated_at", "id"], name="wbs_comment_updated_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="dailyprogress",
+            index=models.Index(
+                fields=["updated_at", "id"], name="wbs_dailyprog_updated_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["updated_at", "id"], name="wbs_event_updated_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="personaltask",
+            index=models.Index(
+                fields=["updated_at", "id"], name="wbs_ptask_updated_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                fields=["updated_at", "id"], name="wbs_project_updated_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="synctombstone",
+            index=models.Index(
+                fields=["deleted_at", "id"], name="wbs_tombstone_deleted_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.6 on 2026-10-17 21:31
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_comment_count(apps, schema_editor):
+    Project = apps.get_model("wbs", "Project")
+    Comment = apps.get_model("wbs", "Comment")
+    counts = (
+        Comment.objects.filter(project=OuterRef("pk"))
+        .order_by()
+        .values("project")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    Project.objects.update(comment_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wbs", "0012_sync_watermarks_and_tombstones"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="project",
+            name="comment_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="댓글 수"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["project", "-created_at", "-id"],
+                name="wbs_comment_project_page_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="projectdocument",
+            index=models.Index(
+                fields=["project", "-created_at", "-id"],
+                name="wbs_document_project_page_idx",
+            ),
+        ),
+        migrations.RunPython(backfill_comment_count, migrations.RunPython.noop),
+    ]
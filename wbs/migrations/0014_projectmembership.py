@@ -0,0 +1,101 @@
+# Generated by Django 5.2.6 on 2026-10-17 21:34
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_memberships(apps, schema_editor):
+    Project = apps.get_model("wbs", "Project")
+    ProjectPhase = apps.get_model("wbs", "ProjectPhase")
+    ProjectMembership = apps.get_model("wbs", "ProjectMembership")
+    rows = set()
+    for project_id, manager_id, tl_id in Project.objects.values_list(
+        "id", "manager_id", "tl_id"
+    ):
+        rows.add((project_id, manager_id, "manager"))
+        if tl_id:
+            rows.add((project_id, tl_id, "tl"))
+    for project_id, user_id in Project.team_members.through.objects.values_list(
+        "project_id", "user_id"
+    ):
+        rows.add((project_id, user_id, "member"))
+    for project_id, user_id in ProjectPhase.assignees.through.objects.values_list(
+        "projectphase__project_id", "user_id"
+    ):
+        rows.add((project_id, user_id, "assignee"))
+    ProjectMembership.objects.bulk_create(
+        [
+            ProjectMembership(project_id=project_id, user_id=user_id, role=role)
+            for project_id, user_id, role in rows
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wbs", "0013_project_comment_count"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProjectMembership",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "role",
+                    models.CharField(
+                        choices=[
+                            ("manager", "매니저"),
+                            ("tl", "기술 리드"),
+                            ("member", "팀원"),
+                            ("assignee", "단계 담당자"),
+                        ],
+                        max_length=20,
+                        verbose_name="역할",
+                    ),
+                ),
+                (
+                    "project",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="memberships",
+                        to="wbs.project",
+                        verbose_name="프로젝트",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="project_memberships",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="사용자",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "프로젝트 참여",
+                "verbose_name_plural": "프로젝트 참여",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "role", "project"),
+                        name="wbs_membership_user_role_project_uniq",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_memberships, migrations.RunPython.noop),
+    ]
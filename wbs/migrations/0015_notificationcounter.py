@@ -0,0 +1,42 @@
+# Generated by Django 5.2.6 on 2026-10-17 21:36
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("wbs", "0014_projectmembership"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NotificationCounter",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="notification_counter",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="사용자",
+                    ),
+                ),
+                (
+                    "unread_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="미읽음 알림 수"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "알림 카운터",
+                "verbose_name_plural": "알림 카운터",
+            },
+        ),
+    ]
@@ -0,0 +1,99 @@
+# Generated by Django 5.2.6 on 2026-10-17 21:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wbs", "0015_notificationcounter"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DeadlineNotice",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "source",
+                    models.CharField(
+                        choices=[
+                            ("project", "프로젝트"),
+                            ("phase", "프로젝트 단계"),
+                            ("personal_task", "개인 작업"),
+                        ],
+                        max_length=20,
+                        verbose_name="대상 유형",
+                    ),
+                ),
+                ("object_id", models.BigIntegerField(verbose_name="대상 ID")),
+                ("end_date", models.DateField(verbose_name="마감일")),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="발송일"),
+                ),
+            ],
+            options={
+                "verbose_name": "마감 알림 기록",
+                "verbose_name_plural": "마감 알림 기록",
+            },
+        ),
+        migrations.CreateModel(
+            name="ScanWatermark",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(max_length=50, unique=True, verbose_name="작업"),
+                ),
+                ("scanned_through", models.DateField(verbose_name="처리 완료일")),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="수정일"),
+                ),
+            ],
+            options={
+                "verbose_name": "스캔 워터마크",
+                "verbose_name_plural": "스캔 워터마크",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="personaltask",
+            index=models.Index(fields=["end_date", "id"], name="wbs_ptask_end_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                fields=["end_date", "id"], name="wbs_project_end_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="projectphase",
+            index=models.Index(fields=["end_date", "id"], name="wbs_phase_end_id_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="deadlinenotice",
+            constraint=models.UniqueConstraint(
+                fields=("source", "object_id", "end_date"),
+                name="wbs_deadline_notice_uniq",
+            ),
+        ),
+    ]
@@ -0,0 +1,97 @@
+# Generated by Django 5.2.6 on 2026-10-17 21:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wbs", "0016_deadline_scanner"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NotificationArchive",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("title", models.CharField(max_length=200, verbose_name="제목")),
+                ("message", models.TextField(verbose_name="메시지")),
+                (
+                    "notification_type",
+                    models.CharField(
+                        choices=[
+                            ("project_update", "프로젝트 업데이트"),
+                            ("approval_request", "승인 요청"),
+                            ("approval_approved", "승인 완료"),
+                            ("approval_rejected", "승인 거부"),
+                            ("comment_added", "댓글 추가"),
+                            ("deadline_approaching", "마감일 임박"),
+                            ("task_assigned", "작업 할당"),
+                            ("system", "시스템 알림"),
+                        ],
+                        max_length=30,
+                        verbose_name="알림 유형",
+                    ),
+                ),
+                (
+                    "project_id",
+                    models.BigIntegerField(
+                        blank=True, null=True, verbose_name="관련 프로젝트 ID"
+                    ),
+                ),
+                (
+                    "phase_id",
+                    models.BigIntegerField(
+                        blank=True, null=True, verbose_name="관련 단계 ID"
+                    ),
+                ),
+                ("created_at", models.DateTimeField(verbose_name="생성일")),
+                (
+                    "read_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="읽은 시간"
+                    ),
+                ),
+                (
+                    "archived_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="보관일"),
+                ),
+            ],
+            options={
+                "verbose_name": "보관된 알림",
+                "verbose_name_plural": "보관된 알림",
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                fields=["user", "is_read", "created_at"], name="wbs_notif_user_read_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"], name="wbs_notif_user_created_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="notificationarchive",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="archived_notifications",
+                to=settings.AUTH_USER_MODEL,
+                verbose_name="사용자",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="notificationarchive",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"], name="wbs_notif_arch_user_idx"
+            ),
+        ),
+    ]
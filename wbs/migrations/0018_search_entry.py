@@ -0,0 +1,195 @@
+# Generated by Django 5.2.6 on 2026-10-17 21:50
+
+from django.db import migrations, models
+
+# SQLite: wbs_searchentry 를 외부 콘텐츠로 쓰는 FTS5 테이블 + 동기화 트리거
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE wbs_searchentry_fts USING fts5(
+        title, body, content='wbs_searchentry', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER wbs_searchentry_ai AFTER INSERT ON wbs_searchentry BEGIN
+        INSERT INTO wbs_searchentry_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+    """
+    CREATE TRIGGER wbs_searchentry_ad AFTER DELETE ON wbs_searchentry BEGIN
+        INSERT INTO wbs_searchentry_fts(wbs_searchentry_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+    END
+    """,
+    """
+    CREATE TRIGGER wbs_searchentry_au AFTER UPDATE ON wbs_searchentry BEGIN
+        INSERT INTO wbs_searchentry_fts(wbs_searchentry_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO wbs_searchentry_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+]
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS wbs_searchentry_au",
+    "DROP TRIGGER IF EXISTS wbs_searchentry_ad",
+    "DROP TRIGGER IF EXISTS wbs_searchentry_ai",
+    "DROP TABLE IF EXISTS wbs_searchentry_fts",
+]
+
+# PostgreSQL: title/body tsvector 식에 GIN 인덱스 (wbs.search 의 WHERE 절과 같은 식이어야 인덱스를 탄다)
+POSTGRES_FORWARD = [
+    """
+    CREATE INDEX wbs_searchentry_tsv_idx ON wbs_searchentry
+    USING GIN (to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(body, '')))
+    """,
+]
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS wbs_searchentry_tsv_idx",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+
+    return run
+
+
+create_fulltext_index = _run({"sqlite": SQLITE_FORWARD, "postgresql": POSTGRES_FORWARD})
+drop_fulltext_index = _run({"sqlite": SQLITE_REVERSE, "postgresql": POSTGRES_REVERSE})
+
+
+# 대상 유형 -> (앱, 모델, 읽을 컬럼, 행 -> (제목, 본문, 소유자 id)), wbs.search.SEARCH_SOURCES 와 같은 문서
+BACKFILL_SOURCES = {
+    "project": (
+        "wbs",
+        "Project",
+        ("title", "description"),
+        lambda title, description: (title, description, None),
+    ),
+    "comment": ("wbs", "Comment", ("content",), lambda content: ("", content, None)),
+    "event": (
+        "wbs",
+        "Event",
+        ("title", "description", "location"),
+        lambda title, description, location: (
+            title,
+            f"{description} {location}".strip(),
+            None,
+        ),
+    ),
+    "personal_task": (
+        "wbs",
+        "PersonalTask",
+        ("content", "team_name"),
+        lambda content, team_name: (content, team_name, None),
+    ),
+    "notification": (
+        "wbs",
+        "Notification",
+        ("title", "message", "user_id"),
+        lambda title, message, user_id: (title, message, user_id),
+    ),
+    "user": (
+        "auth",
+        "User",
+        ("username", "first_name", "last_name", "email"),
+        lambda username, first_name, last_name, email: (
+            username,
+            f"{first_name} {last_name} {email}".strip(),
+            None,
+        ),
+    ),
+}
+BACKFILL_BATCH_SIZE = 1000
+
+
+def backfill_search_entries(apps, schema_editor):
+    """기존 데이터로 검색 문서를 채운다 (SQLite FTS5 테이블은 트리거가 함께 채움)"""
+    SearchEntry = apps.get_model("wbs", "SearchEntry")
+    for source, (app_label, model_name, columns, document) in BACKFILL_SOURCES.items():
+        model = apps.get_model(app_label, model_name)
+        batch = []
+        rows = model.objects.order_by("pk").values_list("pk", *columns)
+        for pk, *values in rows.iterator(chunk_size=BACKFILL_BATCH_SIZE):
+            title, body, owner_id = document(*values)
+            batch.append(
+                SearchEntry(
+                    source=source,
+                    object_id=pk,
+                    owner_id=owner_id,
+                    title=(title or "")[:255],
+                    body=body or "",
+                )
+            )
+            if len(batch) >= BACKFILL_BATCH_SIZE:
+                SearchEntry.objects.bulk_create(batch)
+                batch = []
+        SearchEntry.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wbs", "0017_notification_archive"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "source",
+                    models.CharField(
+                        choices=[
+                            ("project", "프로젝트"),
+                            ("comment", "댓글"),
+                            ("event", "일정"),
+                            ("personal_task", "개인 작업"),
+                            ("notification", "알림"),
+                            ("user", "사용자"),
+                        ],
+                        max_length=20,
+                        verbose_name="대상 유형",
+                    ),
+                ),
+                ("object_id", models.BigIntegerField(verbose_name="대상 ID")),
+                (
+                    "owner_id",
+                    models.BigIntegerField(
+                        blank=True, null=True, verbose_name="소유자 ID"
+                    ),
+                ),
+                (
+                    "title",
+                    models.CharField(blank=True, max_length=255, verbose_name="제목"),
+                ),
+                ("body", models.TextField(blank=True, verbose_name="본문")),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="색인일"),
+                ),
+            ],
+            options={
+                "verbose_name": "검색 문서",
+                "verbose_name_plural": "검색 문서",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("source", "object_id"), name="wbs_search_entry_uniq"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+        migrations.RunPython(backfill_search_entries, migrations.RunPython.noop),
+    ]
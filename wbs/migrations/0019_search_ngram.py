@@ -0,0 +1,109 @@
+# Generated by Django 5.2.6 on 2026-10-17 21:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wbs", "0018_search_entry"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchGram",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "source",
+                    models.CharField(
+                        choices=[
+                            ("project", "프로젝트"),
+                            ("comment", "댓글"),
+                            ("event", "일정"),
+                            ("personal_task", "개인 작업"),
+                            ("notification", "알림"),
+                            ("user", "사용자"),
+                        ],
+                        max_length=20,
+                        verbose_name="대상 유형",
+                    ),
+                ),
+                (
+                    "field",
+                    models.CharField(
+                        choices=[("title", "제목"), ("body", "본문")],
+                        max_length=5,
+                        verbose_name="필드",
+                    ),
+                ),
+                ("gram", models.CharField(max_length=3, verbose_name="n-gram")),
+                ("doc_count", models.IntegerField(verbose_name="문서 수")),
+                ("postings", models.BinaryField(verbose_name="포스팅")),
+            ],
+            options={
+                "verbose_name": "n-gram 포스팅",
+                "verbose_name_plural": "n-gram 포스팅",
+            },
+        ),
+        migrations.CreateModel(
+            name="SearchGramSegment",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("built_at", models.DateTimeField(verbose_name="색인 기준 시각")),
+                ("entry_count", models.IntegerField(default=0, verbose_name="문서 수")),
+                (
+                    "gram_count",
+                    models.IntegerField(default=0, verbose_name="n-gram 수"),
+                ),
+                (
+                    "size_bytes",
+                    models.BigIntegerField(default=0, verbose_name="포스팅 크기"),
+                ),
+            ],
+            options={
+                "verbose_name": "n-gram 검색 색인",
+                "verbose_name_plural": "n-gram 검색 색인",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="searchentry",
+            index=models.Index(
+                fields=["source", "updated_at"], name="wbs_search_entry_updated_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="searchgram",
+            name="segment",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="grams",
+                to="wbs.searchgramsegment",
+                verbose_name="색인",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="searchgram",
+            constraint=models.UniqueConstraint(
+                fields=("segment", "source", "field", "gram"),
+                name="wbs_search_gram_uniq",
+            ),
+        ),
+    ]
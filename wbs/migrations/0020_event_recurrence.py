@@ -0,0 +1,60 @@
+# Generated by Django 5.2.6 on 2026-10-17 22:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wbs", "0019_search_ngram"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="recurrence_count",
+            field=models.PositiveIntegerField(
+                blank=True, null=True, verbose_name="반복 횟수"
+            ),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="recurrence_end",
+            field=models.DateField(
+                blank=True, editable=False, null=True, verbose_name="반복 마지막 날짜"
+            ),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="recurrence_exceptions",
+            field=models.JSONField(blank=True, default=list, verbose_name="제외 날짜"),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="recurrence_freq",
+            field=models.CharField(
+                blank=True,
+                choices=[("daily", "매일"), ("weekly", "매주"), ("monthly", "매월")],
+                max_length=10,
+                verbose_name="반복 주기",
+            ),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="recurrence_interval",
+            field=models.PositiveSmallIntegerField(default=1, verbose_name="반복 간격"),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="recurrence_until",
+            field=models.DateField(blank=True, null=True, verbose_name="반복 종료일"),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["start_date", "end_date"], name="wbs_event_dates_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,100 @@
+# Generated by Django 5.2.6 on 2026-10-17 22:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wbs", "0020_event_recurrence"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EventReminder",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("occurrence_date", models.DateField(verbose_name="회차 날짜")),
+                (
+                    "sent_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="발송일"),
+                ),
+            ],
+            options={
+                "verbose_name": "일정 알림 기록",
+                "verbose_name_plural": "일정 알림 기록",
+            },
+        ),
+        migrations.AlterField(
+            model_name="notification",
+            name="notification_type",
+            field=models.CharField(
+                choices=[
+                    ("project_update", "프로젝트 업데이트"),
+                    ("approval_request", "승인 요청"),
+                    ("approval_approved", "승인 완료"),
+                    ("approval_rejected", "승인 거부"),
+                    ("comment_added", "댓글 추가"),
+                    ("deadline_approaching", "마감일 임박"),
+                    ("task_assigned", "작업 할당"),
+                    ("reminder", "일정 알림"),
+                    ("system", "시스템 알림"),
+                ],
+                default="system",
+                max_length=30,
+                verbose_name="알림 유형",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="notificationarchive",
+            name="notification_type",
+            field=models.CharField(
+                choices=[
+                    ("project_update", "프로젝트 업데이트"),
+                    ("approval_request", "승인 요청"),
+                    ("approval_approved", "승인 완료"),
+                    ("approval_rejected", "승인 거부"),
+                    ("comment_added", "댓글 추가"),
+                    ("deadline_approaching", "마감일 임박"),
+                    ("task_assigned", "작업 할당"),
+                    ("reminder", "일정 알림"),
+                    ("system", "시스템 알림"),
+                ],
+                max_length=30,
+                verbose_name="알림 유형",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["start_date", "start_time"], name="wbs_event_start_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="eventreminder",
+            name="event",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="reminders",
+                to="wbs.event",
+                verbose_name="일정",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="eventreminder",
+            constraint=models.UniqueConstraint(
+                fields=("event", "occurrence_date"), name="wbs_event_reminder_uniq"
+            ),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.6 on 2026-10-17 22:43
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wbs", "0021_event_reminders"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SyncAccessChange",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("model_name", models.CharField(max_length=50, verbose_name="모델")),
+                ("object_id", models.BigIntegerField(verbose_name="객체 ID")),
+                (
+                    "changed_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="변경일"),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="sync_access_changes",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="사용자",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "동기화 접근 변경",
+                "verbose_name_plural": "동기화 접근 변경",
+                "ordering": ["changed_at", "id"],
+                "indexes": [
+                    models.Index(
+                        fields=["user", "changed_at", "id"],
+                        name="wbs_sync_access_user_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,16 @@
+# Generated by Django 5.2.6 on 2026-10-17 22:53
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wbs", "0022_sync_access_changes"),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name="ScanWatermark",
+        ),
+    ]
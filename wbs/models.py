@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import F
 from django.contrib.auth.models import User
 from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
@@ -92,6 +93,8 @@ class Project(models.Model):
     is_team_project = models.BooleanField(default=True, verbose_name='팀 프로젝트')
     color_theme = models.CharField(max_length=20, choices=COLOR_THEMES, default='blue', verbose_name='색상 테마')
     progress = models.IntegerField(default=0, validators=[MinValueValidator(0), MaxValueValidator(100)], verbose_name='진행률')
+    # 댓글 수 (Comment 생성/삭제 시그널로 갱신, 상세 화면 헤더에서 COUNT(*) 없이 사용)
+    comment_count = models.PositiveIntegerField(default=0, editable=False, verbose_name='댓글 수')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -122,6 +125,26 @@ class Project(models.Model):
         verbose_name = '프로젝트'
         verbose_name_plural = '프로젝트'
         ordering = ['-created_at']
+        indexes = [
+            # 모바일 API 키셋 페이지네이션 (created_at, id)
+            models.Index(fields=['-created_at', '-id'], name='wbs_project_created_id_idx'),
+            # 모바일 델타 동기화 (updated_at 워터마크)
+            models.Index(fields=['updated_at', 'id'], name='wbs_project_updated_id_idx'),
+            # 마감 임박 알림 스캐너 (종료일 범위 조회)
+            models.Index(fields=['end_date', 'id'], name='wbs_project_end_id_idx'),
+        ]
+
+    # 시그널이 F() 로만 증감하는 카운터 (일반 저장에서는 제외)
+    COUNTER_FIELDS = ('comment_count',)
+
+    def save(self, *args, **kwargs):
+        # 수정 폼 등 미리 읽어 둔 인스턴스를 저장할 때 그사이 바뀐 댓글 수를 낡은 값으로 덮어쓰지 않는다
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.title
@@ -151,10 +174,42 @@ class ProjectPhase(models.Model):
         verbose_name = '프로젝트 단계'
         verbose_name_plural = '프로젝트 단계'
         ordering = ['order']
+        indexes = [
+            # 마감 임박 알림 스캐너 (종료일 범위 조회)
+            models.Index(fields=['end_date', 'id'], name='wbs_phase_end_id_idx'),
+        ]
 
     def __str__(self):
         return f"{self.project.title} - {self.title}"
 
+class ProjectMembership(models.Model):
+    """사용자-프로젝트 참여 색인
+
+    Project.manager/tl/team_members 와 ProjectPhase.assignees 로부터 시그널로
+    유지되는 비정규화 테이블. "내가 참여한 프로젝트" 조회를 다중 JOIN 대신
+    (user, role) 인덱스 한 번으로 처리하기 위해 사용한다.
+    """
+    ROLE_CHOICES = [
+        ('manager', '매니저'),
+        ('tl', '기술 리드'),
+        ('member', '팀원'),
+        ('assignee', '단계 담당자'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='project_memberships', verbose_name='사용자')
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='memberships', verbose_name='프로젝트')
+    role = models.CharField(max_length=20, choices=ROLE_CHOICES, verbose_name='역할')
+
+    class Meta:
+        verbose_name = '프로젝트 참여'
+        verbose_name_plural = '프로젝트 참여'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'role', 'project'], name='wbs_membership_user_role_project_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.project.title} ({self.get_role_display()})"
+
 class ApprovalLine(models.Model):
     """승인 라인 모델"""
     STATUS_CHOICES = [
@@ -190,6 +245,12 @@ class Comment(models.Model):
         verbose_name = '댓글'
         verbose_name_plural = '댓글'
         ordering = ['-created_at']
+        indexes = [
+            # 모바일 델타 동기화 (updated_at 워터마크)
+            models.Index(fields=['updated_at', 'id'], name='wbs_comment_updated_id_idx'),
+            # 프로젝트 상세 댓글 키셋 페이지네이션
+            models.Index(fields=['project', '-created_at', '-id'], name='wbs_comment_project_page_idx'),
+        ]
 
     def __str__(self):
         return f"{self.project.title} - {self.author.username}"
@@ -207,6 +268,10 @@ class ProjectDocument(models.Model):
         verbose_name = '프로젝트 문서'
         verbose_name_plural = '프로젝트 문서'
         ordering = ['-created_at']
+        indexes = [
+            # 프로젝트 상세 문서 키셋 페이지네이션
+            models.Index(fields=['project', '-created_at', '-id'], name='wbs_document_project_page_idx'),
+        ]
 
     def __str__(self):
         return f"{self.project.title} - {self.title}"
@@ -225,6 +290,10 @@ class DailyProgress(models.Model):
         verbose_name_plural = '일별 진행상황'
         unique_together = ['project', 'date']
         ordering = ['-date']
+        indexes = [
+            # 모바일 델타 동기화 (updated_at 워터마크)
+            models.Index(fields=['updated_at', 'id'], name='wbs_dailyprog_updated_id_idx'),
+        ]
 
     def __str__(self):
         return f"{self.project.title} - {self.date}"
@@ -257,6 +326,7 @@ class Notification(models.Model):
         ('comment_added', '댓글 추가'),
         ('deadline_approaching', '마감일 임박'),
         ('task_assigned', '작업 할당'),
+        ('reminder', '일정 알림'),
         ('system', '시스템 알림'),
     ]
 
@@ -274,16 +344,71 @@ class Notification(models.Model):
         verbose_name = '알림'
         verbose_name_plural = '알림'
         ordering = ['-created_at']
+        indexes = [
+            # 미읽음 수/읽은 알림 보관 정책 조회
+            models.Index(fields=['user', 'is_read', 'created_at'], name='wbs_notif_user_read_idx'),
+            # 알림 목록 키셋 페이지네이션 (created_at, id)
+            models.Index(fields=['user', '-created_at', '-id'], name='wbs_notif_user_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.title}"
 
     def mark_as_read(self):
-        """알림을 읽음으로 표시"""
+        """알림을 읽음으로 표시 (실제로 바뀐 경우에만 미읽음 카운터 -1)"""
         if not self.is_read:
-            self.is_read = True
             self.read_at = timezone.now()
-            self.save()
+            # 조건부 UPDATE 로 동시에 두 번 읽음 처리돼도 한 번만 차감
+            updated = Notification.objects.filter(pk=self.pk, is_read=False).update(is_read=True, read_at=self.read_at)
+            self.is_read = True
+            if updated:
+                from .notifications import adjust_unread_count
+                adjust_unread_count(self.user_id, -updated)
+
+
+class NotificationArchive(models.Model):
+    """보관 기간이 지난 읽은 알림 (archive_notifications 명령이 Notification 에서 옮겨 옴)
+
+    원본 id 를 그대로 기본키로 쓰고, 프로젝트/단계는 삭제와 무관하게 남도록 id 값만 보관한다.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_notifications', verbose_name='사용자')
+    title = models.CharField(max_length=200, verbose_name='제목')
+    message = models.TextField(verbose_name='메시지')
+    notification_type = models.CharField(max_length=30, choices=Notification.NOTIFICATION_TYPE_CHOICES, verbose_name='알림 유형')
+    project_id = models.BigIntegerField(null=True, blank=True, verbose_name='관련 프로젝트 ID')
+    phase_id = models.BigIntegerField(null=True, blank=True, verbose_name='관련 단계 ID')
+    created_at = models.DateTimeField(verbose_name='생성일')
+    read_at = models.DateTimeField(null=True, blank=True, verbose_name='읽은 시간')
+    archived_at = models.DateTimeField(auto_now_add=True, verbose_name='보관일')
+
+    class Meta:
+        verbose_name = '보관된 알림'
+        verbose_name_plural = '보관된 알림'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id'], name='wbs_notif_arch_user_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.title}"
+
+
+class NotificationCounter(models.Model):
+    """사용자별 미읽음 알림 수 (DB 기준값)
+
+    폴링마다 COUNT(*) 를 하지 않도록 알림 생성/읽음/삭제 시 F() 로 원자적으로 증감한다.
+    조회는 이 행의 PK 조회 한 번이며, 어긋나면 reconcile_unread_counts 명령으로 복구한다.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='notification_counter', verbose_name='사용자')
+    unread_count = models.PositiveIntegerField(default=0, verbose_name='미읽음 알림 수')
+
+    class Meta:
+        verbose_name = '알림 카운터'
+        verbose_name_plural = '알림 카운터'
+
+    def __str__(self):
+        return f"{self.user.username} - {self.unread_count}"
 
 class SubscriptionPlan(models.Model):
     """구독 플랜 모델"""
@@ -443,16 +568,18 @@ class AdCampaign(models.Model):
                 self.current_impressions < self.max_impressions)
     
     def record_impression(self):
-        """노출 기록"""
+        """노출 기록 (즉시 반영). 화면 노출은 wbs.ad_counters 버퍼를 사용한다"""
         if self.is_running():
-            self.current_impressions += 1
-            self.save()
+            AdCampaign.objects.filter(pk=self.pk, current_impressions__lt=F('max_impressions')).update(
+                current_impressions=F('current_impressions') + 1
+            )
     
     def record_click(self):
-        """클릭 기록"""
-        if self.is_running() and self.current_clicks < self.max_clicks:
-            self.current_clicks += 1
-            self.save()
+        """클릭 기록 (즉시 반영). 클릭 처리 뷰는 wbs.ad_counters 버퍼를 사용한다"""
+        if self.is_running():
+            AdCampaign.objects.filter(pk=self.pk, current_clicks__lt=F('max_clicks')).update(
+                current_clicks=F('current_clicks') + 1
+            )
 
 
 class Event(models.Model):
@@ -473,6 +600,12 @@ class Event(models.Model):
         ('urgent', '긴급'),
     ]
     
+    RECURRENCE_FREQ_CHOICES = [
+        ('daily', '매일'),
+        ('weekly', '매주'),
+        ('monthly', '매월'),
+    ]
+    
     title = models.CharField(max_length=200, verbose_name='제목')
     description = models.TextField(blank=True, verbose_name='설명')
     event_type = models.CharField(max_length=20, choices=EVENT_TYPES, default='personal', verbose_name='일정 유형')
@@ -499,6 +632,15 @@ class Event(models.Model):
     # 알림 설정
     reminder_minutes = models.IntegerField(default=15, verbose_name='알림 시간(분)')
     is_recurring = models.BooleanField(default=False, verbose_name='반복 일정')
+
+    # 반복 규칙 (RRULE 의 FREQ/INTERVAL/COUNT/UNTIL + 제외 날짜, wbs.recurrence 가 구간별로 펼침)
+    recurrence_freq = models.CharField(max_length=10, choices=RECURRENCE_FREQ_CHOICES, blank=True, verbose_name='반복 주기')
+    recurrence_interval = models.PositiveSmallIntegerField(default=1, verbose_name='반복 간격')
+    recurrence_count = models.PositiveIntegerField(null=True, blank=True, verbose_name='반복 횟수')
+    recurrence_until = models.DateField(null=True, blank=True, verbose_name='반복 종료일')
+    recurrence_exceptions = models.JSONField(default=list, blank=True, verbose_name='제외 날짜')
+    # 마지막 회차 종료일 (저장 시 계산, 끝없는 반복은 비움) - 구간 조회에서 끝난 시리즈를 거르는 용도
+    recurrence_end = models.DateField(null=True, blank=True, editable=False, verbose_name='반복 마지막 날짜')
     
     # 상태
     is_completed = models.BooleanField(default=False, verbose_name='완료됨')
@@ -512,10 +654,28 @@ class Event(models.Model):
         verbose_name = '일정'
         verbose_name_plural = '일정'
         ordering = ['start_date', 'start_time']
+        indexes = [
+            # 모바일 API 키셋 페이지네이션 (created_at, id)
+            models.Index(fields=['-created_at', '-id'], name='wbs_event_created_id_idx'),
+            # 모바일 델타 동기화 (updated_at 워터마크)
+            models.Index(fields=['updated_at', 'id'], name='wbs_event_updated_id_idx'),
+            # 달력 구간 조회 (반복 일정은 recurrence_end 로 끝난 시리즈 제외)
+            models.Index(fields=['start_date', 'end_date'], name='wbs_event_dates_idx'),
+            # 알림 워커의 시작 시각 구간 조회
+            models.Index(fields=['start_date', 'start_time'], name='wbs_event_start_idx'),
+        ]
     
     def __str__(self):
         return f"{self.title} ({self.start_date})"
     
+    def save(self, *args, **kwargs):
+        from .recurrence import RecurrenceRule, is_expandable
+        self.recurrence_end = RecurrenceRule(self).last_end() if is_expandable(self) else None
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'recurrence_end' not in update_fields:
+            kwargs['update_fields'] = [*update_fields, 'recurrence_end']
+        super().save(*args, **kwargs)
+    
     def clean(self):
         """유효성 검사"""
         if self.end_date < self.start_date:
@@ -565,6 +725,23 @@ class Event(models.Model):
         return icons.get(self.event_type, 'fas fa-calendar')
 
 
+class EventReminder(models.Model):
+    """일정 알림 발송 기록 (같은 일정/회차에는 한 번만 발송)"""
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='reminders', verbose_name='일정')
+    occurrence_date = models.DateField(verbose_name='회차 날짜')
+    sent_at = models.DateTimeField(auto_now_add=True, verbose_name='발송일')
+
+    class Meta:
+        verbose_name = '일정 알림 기록'
+        verbose_name_plural = '일정 알림 기록'
+        constraints = [
+            models.UniqueConstraint(fields=['event', 'occurrence_date'], name='wbs_event_reminder_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.event_id} ({self.occurrence_date})"
+
+
 class PersonalTask(models.Model):
     """개인 프로젝트 상세 화면에서 사용하는 작업 항목"""
     PROGRESS_CHOICES = [
@@ -589,6 +766,158 @@ class PersonalTask(models.Model):
         verbose_name = '개인 작업'
         verbose_name_plural = '개인 작업'
         ordering = ['start_date', 'end_date', 'team_name']
+        indexes = [
+            # 모바일 델타 동기화 (updated_at 워터마크)
+            models.Index(fields=['updated_at', 'id'], name='wbs_ptask_updated_id_idx'),
+            # 마감 임박 알림 스캐너 (종료일 범위 조회)
+            models.Index(fields=['end_date', 'id'], name='wbs_ptask_end_id_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.project.title} - {self.team_name} - {self.content}"
+
+
+class SyncTombstone(models.Model):
+    """모바일 델타 동기화용 삭제 기록 (삭제된 행의 모델/ID만 보관)"""
+    model_name = models.CharField(max_length=50, verbose_name='모델')
+    object_id = models.BigIntegerField(verbose_name='객체 ID')
+    deleted_at = models.DateTimeField(auto_now_add=True, verbose_name='삭제일')
+
+    class Meta:
+        verbose_name = '삭제 기록'
+        verbose_name_plural = '삭제 기록'
+        ordering = ['deleted_at', 'id']
+        indexes = [
+            models.Index(fields=['deleted_at', 'id'], name='wbs_tombstone_deleted_id_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.model_name}#{self.object_id} ({self.deleted_at})"
+
+
+class SyncAccessChange(models.Model):
+    """모바일 델타 동기화용 사용자별 접근 변경 기록
+
+    프로젝트 참여/일정 참석/작업 담당이 바뀌면 대상 행의 updated_at 은 그대로이므로,
+    해당 사용자의 다음 동기화에서 대상의 현재 접근 여부를 다시 판정하도록 남긴다.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='sync_access_changes', verbose_name='사용자')
+    model_name = models.CharField(max_length=50, verbose_name='모델')
+    object_id = models.BigIntegerField(verbose_name='객체 ID')
+    changed_at = models.DateTimeField(auto_now_add=True, verbose_name='변경일')
+
+    class Meta:
+        verbose_name = '동기화 접근 변경'
+        verbose_name_plural = '동기화 접근 변경'
+        ordering = ['changed_at', 'id']
+        indexes = [
+            models.Index(fields=['user', 'changed_at', 'id'], name='wbs_sync_access_user_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id}: {self.model_name}#{self.object_id} ({self.changed_at})"
+
+
+class DeadlineNotice(models.Model):
+    """마감 임박 알림 발송 기록 (같은 대상/마감일에는 한 번만 발송)"""
+    SOURCE_CHOICES = [
+        ('project', '프로젝트'),
+        ('phase', '프로젝트 단계'),
+        ('personal_task', '개인 작업'),
+    ]
+
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES, verbose_name='대상 유형')
+    object_id = models.BigIntegerField(verbose_name='대상 ID')
+    end_date = models.DateField(verbose_name='마감일')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='발송일')
+
+    class Meta:
+        verbose_name = '마감 알림 기록'
+        verbose_name_plural = '마감 알림 기록'
+        constraints = [
+            models.UniqueConstraint(fields=['source', 'object_id', 'end_date'], name='wbs_deadline_notice_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.source}#{self.object_id} ({self.end_date})"
+
+
+class SearchEntry(models.Model):
+    """통합 검색 문서 (wbs.search 가 원본 모델 변경 시 갱신)
+
+    실제 전문 색인은 DB 별로 따로 둔다: SQLite 는 이 테이블을 외부 콘텐츠로 쓰는 FTS5 가상 테이블,
+    PostgreSQL 은 title/body 의 tsvector GIN 식 인덱스 (0018 마이그레이션).
+    """
+    SOURCE_CHOICES = [
+        ('project', '프로젝트'),
+        ('comment', '댓글'),
+        ('event', '일정'),
+        ('personal_task', '개인 작업'),
+        ('notification', '알림'),
+        ('user', '사용자'),
+    ]
+
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES, verbose_name='대상 유형')
+    object_id = models.BigIntegerField(verbose_name='대상 ID')
+    # 알림처럼 본인만 볼 수 있는 문서의 소유자 (나머지는 비움)
+    owner_id = models.BigIntegerField(null=True, blank=True, verbose_name='소유자 ID')
+    title = models.CharField(max_length=255, blank=True, verbose_name='제목')
+    body = models.TextField(blank=True, verbose_name='본문')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='색인일')
+
+    class Meta:
+        verbose_name = '검색 문서'
+        verbose_name_plural = '검색 문서'
+        constraints = [
+            models.UniqueConstraint(fields=['source', 'object_id'], name='wbs_search_entry_uniq'),
+        ]
+        indexes = [
+            # n-gram 색인 이후 바뀐 문서(델타) 조회
+            models.Index(fields=['source', 'updated_at'], name='wbs_search_entry_updated_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.source}#{self.object_id}"
+
+
+class SearchGramSegment(models.Model):
+    """n-gram 검색 색인 한 벌 (wbs.ngram_search 가 통째로 다시 만들고 최신 것만 사용)
+
+    built_at 이후에 바뀐 SearchEntry 는 색인에 없으므로 검색 시 따로 훑는다.
+    """
+    built_at = models.DateTimeField(verbose_name='색인 기준 시각')
+    entry_count = models.IntegerField(default=0, verbose_name='문서 수')
+    gram_count = models.IntegerField(default=0, verbose_name='n-gram 수')
+    size_bytes = models.BigIntegerField(default=0, verbose_name='포스팅 크기')
+
+    class Meta:
+        verbose_name = 'n-gram 검색 색인'
+        verbose_name_plural = 'n-gram 검색 색인'
+
+    def __str__(self):
+        return f"{self.built_at:%Y-%m-%d %H:%M} ({self.entry_count}건)"
+
+
+class SearchGram(models.Model):
+    """(대상 유형, 필드, n-gram) 하나의 포스팅 리스트 (대상 id 를 정렬 후 차분 varint 로 압축)"""
+    FIELD_CHOICES = [
+        ('title', '제목'),
+        ('body', '본문'),
+    ]
+
+    segment = models.ForeignKey(SearchGramSegment, on_delete=models.CASCADE, related_name='grams', verbose_name='색인')
+    source = models.CharField(max_length=20, choices=SearchEntry.SOURCE_CHOICES, verbose_name='대상 유형')
+    field = models.CharField(max_length=5, choices=FIELD_CHOICES, verbose_name='필드')
+    gram = models.CharField(max_length=3, verbose_name='n-gram')
+    doc_count = models.IntegerField(verbose_name='문서 수')
+    postings = models.BinaryField(verbose_name='포스팅')
+
+    class Meta:
+        verbose_name = 'n-gram 포스팅'
+        verbose_name_plural = 'n-gram 포스팅'
+        constraints = [
+            models.UniqueConstraint(fields=['segment', 'source', 'field', 'gram'], name='wbs_search_gram_uniq'),
+        ]
 
     def __str__(self):
-        return f"{self.project.title} - {self.team_name} - {self.content}"
\ No newline at end of file
+        return f"{self.source}.{self.field}:{self.gram} ({self.doc_count})"
@@ -0,0 +1,228 @@
+import heapq
+import zlib
+from array import array
+from collections import Counter, defaultdict
+from itertools import accumulate, chain
+from operator import itemgetter
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import SearchEntry, SearchGram, SearchGramSegment
+from .search import BaseSearchBackend, LikeSearchBackend, TERM_RE
+
+# 한국어는 조사/합성어가 붙어 공백 단위 토큰으로는 "프로젝트관리" 안의 "관리" 를 못 찾으므로
+# 토큰 안의 글자 2-gram/3-gram 을 색인한다 (토큰 경계를 넘는 n-gram 은 만들지 않음)
+GRAM_SIZES = (2, 3)
+TITLE_WEIGHT = 10
+BUILD_CHUNK_SIZE = 2000
+GRAM_BATCH_SIZE = 1000
+# 대상 유형별로 소유자 제한이 있는 문서 (검색 시 소유자 문서와 교집합)
+OWNED_SOURCES = {'notification'}
+
+
+# ── 포스팅 리스트 압축 ─────────────────────────────────────
+
+def encode_postings(ids):
+    """정렬된 id 목록 -> 차분(delta) uint32 배열을 zlib 으로 압축 (차분이 작아 id 당 1~2바이트 수준)"""
+    deltas = array('I', (value - previous for previous, value in zip(chain((0,), ids), ids)))
+    return zlib.compress(deltas.tobytes())
+
+
+def decode_postings(data):
+    """압축 해제/누적합이 모두 C 로 돌아 수만 건도 수 ms 안에 풀린다"""
+    deltas = array('I')
+    deltas.frombytes(zlib.decompress(bytes(data)))
+    return list(accumulate(deltas))
+
+
+# ── n-gram ────────────────────────────────────────────────
+
+def text_grams(text):
+    """텍스트의 토큰 안 2/3-gram 집합 (소문자)"""
+    grams = set()
+    for token in TERM_RE.findall((text or '').lower()):
+        for size in GRAM_SIZES:
+            grams.update(token[i:i + size] for i in range(len(token) - size + 1))
+    return grams
+
+
+def term_grams(term):
+    """검색어 한 단어를 찾는 데 쓸 n-gram (가장 긴 크기 하나만, 한 글자면 없음)"""
+    size = min(len(term), GRAM_SIZES[-1])
+    if size < GRAM_SIZES[0]:
+        return set()
+    return {term[i:i + size] for i in range(len(term) - size + 1)}
+
+
+def current_segment():
+    return SearchGramSegment.objects.order_by('-built_at', '-id').first()
+
+
+def build_segment(chunk_size=BUILD_CHUNK_SIZE):
+    """SearchEntry 전체로 n-gram 색인을 새로 만들고 이전 색인을 지운다
+
+    색인 기준 시각은 읽기 시작 전으로 잡으므로 만드는 동안 바뀐 문서는 델타로 검색된다.
+    """
+    built_at = timezone.now()
+    postings = defaultdict(list)
+    entry_count = 0
+    rows = SearchEntry.objects.order_by('source', 'object_id').values_list('source', 'object_id', 'title', 'body')
+    for source, object_id, title, body in rows.iterator(chunk_size=chunk_size):
+        entry_count += 1
+        for gram in text_grams(title):
+            postings[source, 'title', gram].append(object_id)
+        for gram in text_grams(body):
+            postings[source, 'body', gram].append(object_id)
+
+    with transaction.atomic():
+        segment = SearchGramSegment.objects.create(built_at=built_at, entry_count=entry_count)
+        size_bytes = 0
+        batch = []
+        for (source, field, gram), ids in postings.items():
+            data = encode_postings(ids)
+            size_bytes += len(data)
+            batch.append(SearchGram(segment=segment, source=source, field=field, gram=gram, doc_count=len(ids), postings=data))
+            if len(batch) >= GRAM_BATCH_SIZE:
+                SearchGram.objects.bulk_create(batch)
+                batch = []
+        SearchGram.objects.bulk_create(batch)
+        segment.gram_count = len(postings)
+        segment.size_bytes = size_bytes
+        segment.save(update_fields=['gram_count', 'size_bytes'])
+        SearchGramSegment.objects.exclude(pk=segment.pk).delete()
+    return segment
+
+
+# ── 검색 백엔드 ───────────────────────────────────────────
+
+def _document_text(title, body):
+    return (title or '').lower(), (body or '').lower()
+
+
+class NgramSearchBackend(BaseSearchBackend):
+    """n-gram 포스팅 리스트 교집합으로 찾는 기본 검색 백엔드 (wbs.search.get_backend)
+
+    - 색인(세그먼트)은 build_search_grams / rebuild_search_index 로 주기적으로 다시 만든다.
+    - 색인 이후 바뀐 SearchEntry(updated_at > built_at)는 델타로 따로 읽어 본문으로 판정한다.
+    - 점수: 검색어가 제목에 있으면 TITLE_WEIGHT, 본문에 있으면 1 을 단어마다 더한다.
+    - 세그먼트가 없거나 모든 단어가 한 글자면 LIKE 검색으로 대체한다.
+    """
+
+    def __init__(self):
+        self._segment = None
+
+    @property
+    def segment(self):
+        if self._segment is None:
+            self._segment = current_segment() or False
+        return self._segment
+
+    def search(self, source, terms, limit, owner_id=None, allowed=None):
+        segment = self.segment
+        gram_terms = [term for term in terms if term_grams(term)]
+        if not segment or not gram_terms:
+            return LikeSearchBackend().search(source, terms, limit, owner_id=owner_id, allowed=allowed)
+
+        postings = self._load_postings(segment, source, set().union(*(term_grams(term) for term in gram_terms)))
+        candidates = None
+        in_title = {}
+        in_body = {}
+        for term in gram_terms:
+            grams = term_grams(term)
+            in_title[term] = self._intersect(postings, 'title', grams)
+            in_body[term] = self._intersect(postings, 'body', grams)
+            matched = in_title[term] | in_body[term]
+            candidates = matched if candidates is None else candidates & matched
+            if not candidates:
+                break
+
+        # 색인 이후 바뀐 문서는 포스팅이 낡았을 수 있으므로 본문으로 다시 판정
+        delta = self._delta(segment, source, owner_id, allowed)
+        candidates = (candidates or set()) - set(delta)
+        if owner_id is not None and source in OWNED_SOURCES and candidates:
+            candidates &= set(
+                SearchEntry.objects.filter(source=source, owner_id=owner_id).values_list('object_id', flat=True)
+            )
+        if allowed is not None and candidates:
+            candidates &= set(allowed.filter(pk__in=candidates).values_list('pk', flat=True))
+
+        # 단어별 제목/본문 일치 수를 Counter 로 누적 (집합 단위 갱신이라 문서마다 파이썬 루프를 돌지 않음)
+        title_hits = Counter()
+        body_hits = Counter()
+        for term in gram_terms:
+            title_hits.update(in_title[term] & candidates)
+            body_hits.update(in_body[term] & candidates)
+        scores = {object_id: title_hits[object_id] * TITLE_WEIGHT + body_hits[object_id] for object_id in candidates}
+        for object_id, (title, body) in delta.items():
+            score = self._score_text(title, body, terms)
+            if score:
+                scores[object_id] = score
+
+        # 4글자 이상 단어는 3-gram 교집합이라 드물게 오탐이 있고, 한 글자 단어는 색인에 없으므로 본문으로 확인
+        if any(len(term) > GRAM_SIZES[-1] or not term_grams(term) for term in terms):
+            ranked = sorted(scores.items(), key=itemgetter(1, 0), reverse=True)
+            return self._verify(source, ranked, terms, limit, set(delta))
+        return heapq.nlargest(limit, scores.items(), key=itemgetter(1, 0))
+
+    def rebuild(self):
+        build_segment()
+        self._segment = None
+
+    @staticmethod
+    def _load_postings(segment, source, grams):
+        rows = SearchGram.objects.filter(segment=segment, source=source, gram__in=grams).values_list('field', 'gram', 'postings')
+        return {(field, gram): data for field, gram, data in rows}
+
+    @staticmethod
+    def _intersect(postings, field, grams):
+        lists = [postings.get((field, gram)) for gram in grams]
+        if any(data is None for data in lists):
+            return set()
+        # 짧은 리스트부터 교집합 (바이트 길이 ~ 문서 수)
+        lists.sort(key=len)
+        result = set(decode_postings(lists[0]))
+        for data in lists[1:]:
+            if not result:
+                break
+            result.intersection_update(decode_postings(data))
+        return result
+
+    @staticmethod
+    def _delta(segment, source, owner_id, allowed=None):
+        entries = SearchEntry.objects.filter(source=source, updated_at__gt=segment.built_at)
+        if owner_id is not None:
+            entries = entries.filter(owner_id=owner_id)
+        if allowed is not None:
+            entries = entries.filter(object_id__in=allowed.values('pk'))
+        return {object_id: (title, body) for object_id, title, body in entries.values_list('object_id', 'title', 'body')}
+
+    @staticmethod
+    def _score_text(title, body, terms):
+        title, body = _document_text(title, body)
+        score = 0
+        for term in terms:
+            hit = (TITLE_WEIGHT if term in title else 0) + (1 if term in body else 0)
+            if not hit:
+                return 0
+            score += hit
+        return score
+
+    def _verify(self, source, scored, terms, limit, verified_ids):
+        """점수 순으로 본문을 읽어 모든 단어가 실제로 들어 있는 문서만 limit 개까지"""
+        results = []
+        step = max(limit * 4, 1)
+        for start in range(0, len(scored), step):
+            chunk = scored[start:start + step]
+            texts = dict(
+                (object_id, (title, body)) for object_id, title, body in
+                SearchEntry.objects.filter(source=source, object_id__in=[
+                    object_id for object_id, _ in chunk if object_id not in verified_ids
+                ]).values_list('object_id', 'title', 'body')
+            )
+            for object_id, score in chunk:
+                if object_id in verified_ids or (object_id in texts and self._score_text(*texts[object_id], terms)):
+                    results.append((object_id, score))
+                    if len(results) >= limit:
+                        return results
+        return results
@@ -0,0 +1,231 @@
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import Notification, NotificationArchive, NotificationCounter, ProjectMembership
+from .search import index_objects
+from .realtime import get_broker, publish_notification, publish_unread_count, user_channel
+
+def _count_unread(user_id):
+    return Notification.objects.filter(user_id=user_id, is_read=False).count()
+
+
+def _rebuild_counter(user_id):
+    """실제 COUNT 로 DB 카운터를 다시 쓴다"""
+    count = _count_unread(user_id)
+    try:
+        with transaction.atomic():
+            NotificationCounter.objects.update_or_create(user_id=user_id, defaults={'unread_count': count})
+    except IntegrityError:
+        # 동시에 다른 요청이 행을 만든 경우
+        NotificationCounter.objects.filter(user_id=user_id).update(unread_count=count)
+    return count
+
+
+def get_unread_count(user):
+    """미읽음 알림 수: DB 카운터 행 (PK 조회) → 없으면 COUNT 로 생성"""
+    return get_unread_count_for(user.pk)
+
+
+def get_unread_count_for(user_id):
+    # 프로세스별 캐시에 두면 워커 명령 등 다른 프로세스가 바꾼 값이 늦게 보이므로 매번 카운터 행을 읽는다
+    count = NotificationCounter.objects.filter(pk=user_id).values_list('unread_count', flat=True).first()
+    if count is None:
+        return _rebuild_counter(user_id)
+    return count
+
+
+def adjust_unread_count(user_id, delta):
+    """DB 카운터를 F() 로 원자적으로 증감"""
+    if not delta:
+        return
+    updated = NotificationCounter.objects.filter(pk=user_id).update(
+        unread_count=Greatest(F('unread_count') + delta, 0)
+    )
+    if not updated:
+        # 카운터 행이 아직 없으면 실제 COUNT 로 생성 (이번 변경도 이미 반영돼 있음)
+        _rebuild_counter(user_id)
+    # 연결된 SSE 클라이언트에 새 개수 푸시 (커밋 후)
+    transaction.on_commit(lambda: publish_unread_count(user_id, get_unread_count_for(user_id)))
+
+
+def mark_all_read(user):
+    """사용자의 모든 알림을 읽음으로 표시하고 바뀐 건수만큼 카운터 차감"""
+    updated = Notification.objects.filter(user=user, is_read=False).update(
+        is_read=True,
+        read_at=timezone.now()
+    )
+    adjust_unread_count(user.pk, -updated)
+    return updated
+
+
+def reconcile_unread_counts(user_ids=None):
+    """DB 카운터를 실제 미읽음 수와 맞춘다. 어긋나 있던 사용자 수를 반환
+
+    실제 값은 user 별 GROUP BY 한 번으로 계산하고, 다른 행만 다시 쓴다.
+    """
+    unread = Notification.objects.filter(is_read=False)
+    counters = NotificationCounter.objects.all()
+    if user_ids is not None:
+        unread = unread.filter(user_id__in=user_ids)
+        counters = counters.filter(user_id__in=user_ids)
+    actual = dict(unread.order_by().values('user_id').annotate(count=Count('id')).values_list('user_id', 'count'))
+    stored = dict(counters.values_list('user_id', 'unread_count'))
+
+    drifted = 0
+    for user_id in set(actual) | set(stored):
+        count = actual.get(user_id, 0)
+        if stored.get(user_id) != count:
+            drifted += 1
+            NotificationCounter.objects.update_or_create(user_id=user_id, defaults={'unread_count': count})
+    return drifted
+
+
+# ── 대량 발송 ─────────────────────────────────────────────
+
+DISPATCH_BATCH_SIZE = 1000
+DEFAULT_DEDUPE_WINDOW = timedelta(hours=1)
+
+
+def project_recipient_ids(project, roles=None, exclude=None):
+    """프로젝트 관련자(매니저/TL/팀원/단계 담당자) id 목록 - 참여 색인으로 한 번에 조회"""
+    memberships = ProjectMembership.objects.filter(project=project)
+    if roles is not None:
+        memberships = memberships.filter(role__in=roles)
+    user_ids = set(memberships.values_list('user_id', flat=True))
+    if exclude is not None:
+        user_ids.discard(getattr(exclude, 'pk', exclude))
+    return sorted(user_ids)
+
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _recently_notified(user_ids, since, title, notification_type, project, phase, batch_size):
+    """dedupe 구간 안에 같은 알림을 이미 받은 사용자 id"""
+    sent = set()
+    duplicates = Notification.objects.filter(
+        created_at__gte=since,
+        notification_type=notification_type,
+        title=title,
+        project=project,
+        phase=phase,
+    )
+    for chunk in _chunks(user_ids, batch_size):
+        sent.update(duplicates.filter(user_id__in=chunk).values_list('user_id', flat=True))
+    return sent
+
+
+def bulk_adjust_unread_counts(user_ids, delta):
+    """여러 사용자의 카운터를 UPDATE 한 번으로 증감 (카운터 행이 없는 사용자는 첫 조회 때 COUNT 로 생성)"""
+    if not user_ids or not delta:
+        return
+    NotificationCounter.objects.filter(user_id__in=user_ids).update(
+        unread_count=Greatest(F('unread_count') + delta, 0)
+    )
+
+
+def _publish_dispatched(notifications):
+    broker = get_broker()
+    pushed = set()
+    for notification in notifications:
+        if broker.has_subscribers(user_channel(notification.user_id)):
+            publish_notification(notification)
+            pushed.add(notification.user_id)
+    # 받은 사용자 전원의 개수를 카운터 조회 한 번으로 (행이 없는 사용자만 따로 생성)
+    counts = dict(NotificationCounter.objects.filter(pk__in=pushed).values_list('pk', 'unread_count'))
+    for user_id in pushed:
+        publish_unread_count(user_id, counts[user_id] if user_id in counts else get_unread_count_for(user_id))
+
+
+def dispatch_notifications(user_ids, title, message, notification_type='system', project=None, phase=None,
+                           dedupe_window=DEFAULT_DEDUPE_WINDOW, batch_size=DISPATCH_BATCH_SIZE):
+    """여러 사용자에게 같은 알림을 bulk_create 로 배치 발송
+
+    - 같은 사용자에게 dedupe_window 안에 유형/제목/프로젝트/단계가 같은 알림이 이미 있으면 건너뛴다
+      (dedupe_window=None 이면 중복 검사 생략)
+    반환값: 생성된 알림 수
+    """
+    user_ids = sorted({pk for pk in user_ids if pk is not None})
+    if dedupe_window is not None and user_ids:
+        sent = _recently_notified(user_ids, timezone.now() - dedupe_window, title, notification_type, project, phase, batch_size)
+        user_ids = [user_id for user_id in user_ids if user_id not in sent]
+
+    return len(bulk_notify([
+        Notification(
+            user_id=user_id, title=title, message=message,
+            notification_type=notification_type, project=project, phase=phase,
+        )
+        for user_id in user_ids
+    ], batch_size=batch_size))
+
+
+def bulk_notify(notifications, batch_size=DISPATCH_BATCH_SIZE):
+    """저장 전 Notification 목록을 배치 bulk_create 하고 미읽음 카운터/SSE 푸시까지 처리
+
+    bulk_create 는 post_save 시그널을 보내지 않으므로 카운터는 사용자별 증가량이 같은
+    사용자끼리 묶어 UPDATE 한 번씩으로 반영하고, 검색 문서도 배치 단위로 색인한다.
+    """
+    created = []
+    with transaction.atomic():
+        for chunk in _chunks(list(notifications), batch_size):
+            chunk = Notification.objects.bulk_create(chunk)
+            created.extend(chunk)
+            index_objects(chunk, batch_size)
+            by_delta = defaultdict(list)
+            for user_id, delta in Counter(n.user_id for n in chunk if not n.is_read).items():
+                by_delta[delta].append(user_id)
+            for delta, user_ids in by_delta.items():
+                bulk_adjust_unread_counts(user_ids, delta)
+        transaction.on_commit(lambda: _publish_dispatched(created))
+    return created
+
+
+def notify_project_members(project, title, message, notification_type='project_update', roles=None, exclude=None, **kwargs):
+    """프로젝트 관련자 전원에게 알림 발송 (exclude: 보낸 사람 등 제외할 사용자)"""
+    recipients = project_recipient_ids(project, roles=roles, exclude=exclude)
+    return dispatch_notifications(recipients, title, message, notification_type=notification_type, project=project, **kwargs)
+
+
+# ── 보관(아카이브) ─────────────────────────────────────────
+
+ARCHIVE_BATCH_SIZE = 1000
+ARCHIVE_FIELDS = ['id', 'user_id', 'title', 'message', 'notification_type', 'project_id', 'phase_id', 'created_at', 'read_at']
+
+
+def read_retention_days():
+    return getattr(settings, 'NOTIFICATION_READ_RETENTION_DAYS', 90)
+
+
+def archive_read_notifications(retention_days=None, batch_size=ARCHIVE_BATCH_SIZE, dry_run=False):
+    """보관 기간이 지난 읽은 알림을 NotificationArchive 로 배치 이동
+
+    배치마다 (복사 → 원본 삭제)를 한 트랜잭션으로 처리하므로 중간에 멈춰도
+    다시 실행하면 이어서 진행된다. 미읽음 알림은 기간과 상관없이 남긴다.
+    반환값: 옮긴(dry_run 이면 옮길) 알림 수
+    """
+    retention_days = read_retention_days() if retention_days is None else retention_days
+    cutoff = timezone.now() - timedelta(days=retention_days)
+    expired = Notification.objects.filter(is_read=True, created_at__lt=cutoff)
+    if dry_run:
+        return expired.count()
+
+    moved = 0
+    while True:
+        with transaction.atomic():
+            rows = list(expired.order_by('id').values(*ARCHIVE_FIELDS)[:batch_size])
+            if not rows:
+                break
+            NotificationArchive.objects.bulk_create(
+                [NotificationArchive(**row) for row in rows], ignore_conflicts=True
+            )
+            Notification.objects.filter(pk__in=[row['id'] for row in rows]).delete()
+        moved += len(rows)
+    return moved
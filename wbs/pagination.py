@@ -0,0 +1,78 @@
+import base64
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class PaginationError(ValueError):
+    """잘못된 커서/페이지/필드 파라미터"""
+
+
+def encode_cursor(timestamp, pk):
+    """(시각, id) 쌍을 불투명한 커서 문자열로 변환"""
+    raw = json.dumps([timestamp.isoformat(), pk], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """encode_cursor 로 만든 커서를 (시각, id) 로 복원"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        timestamp_str, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        timestamp = parse_datetime(timestamp_str)
+        if timestamp is None or not isinstance(pk, int):
+            raise ValueError
+        return timestamp, pk
+    except (ValueError, TypeError, json.JSONDecodeError):
+        raise PaginationError('잘못된 커서입니다.')
+
+
+def parse_limit(value, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    if value in (None, ''):
+        return default
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise PaginationError('limit 은 정수여야 합니다.')
+    return max(1, min(limit, maximum))
+
+
+def keyset_page(queryset, cursor=None, limit=DEFAULT_PAGE_SIZE, time_field='created_at'):
+    """(time_field, id) 내림차순 키셋 페이지네이션
+
+    OFFSET 없이 마지막으로 받은 행 다음부터 limit 개만 조회하므로
+    테이블 크기와 무관하게 페이지당 비용이 일정하다.
+    반환값: (행 목록, 다음 페이지 커서 또는 None)
+    """
+    queryset = queryset.order_by(f'-{time_field}', '-id')
+    if cursor:
+        timestamp, pk = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(**{f'{time_field}__lt': timestamp}) |
+            Q(**{time_field: timestamp, 'id__lt': pk})
+        )
+    rows = list(queryset[:limit + 1])
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, time_field), last.pk)
+    return rows, next_cursor
+
+
+def parse_fields(value, available):
+    """fields=a,b,c 파라미터를 검증해 필드 이름 목록으로 반환 (미지정 시 전체)"""
+    if not value:
+        return list(available)
+    fields = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in fields if name not in available]
+    if unknown:
+        raise PaginationError(f"알 수 없는 필드: {', '.join(unknown)}")
+    # 키셋 커서를 만들기 위해 id 는 항상 포함
+    if 'id' not in fields:
+        fields.insert(0, 'id')
+    return fields
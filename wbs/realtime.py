@@ -0,0 +1,230 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+USER_CHANNEL = 'user:{user_id}'
+SUBSCRIPTION_QUEUE_SIZE = 100
+REDIS_CHANNEL_PREFIX = 'wbs:realtime:'
+REDIS_RECONNECT_SECONDS = 1
+
+
+def user_channel(user_id):
+    return USER_CHANNEL.format(user_id=user_id)
+
+
+class Subscription:
+    """한 SSE 연결의 구독. 구독한 이벤트 루프의 큐로 메시지를 받는다"""
+
+    def __init__(self, broker, channel, maxsize=SUBSCRIPTION_QUEUE_SIZE):
+        self.broker = broker
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=maxsize)
+
+    def deliver(self, message):
+        """발행 스레드에서 호출 → 구독 루프에서 큐에 넣는다"""
+        self.loop.call_soon_threadsafe(self._put, message)
+
+    def _put(self, message):
+        if self.queue.full():
+            # 느린 클라이언트: 가장 오래된 메시지를 버린다 (재접속 시 Last-Event-ID 로 보충)
+            self.queue.get_nowait()
+        self.queue.put_nowait(message)
+
+    async def get(self, timeout=None):
+        """다음 메시지 (timeout 동안 없으면 None)"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class BaseBroker:
+    """알림 푸시용 pub/sub 백엔드 인터페이스
+
+    - publish(channel, message): 동기 코드(시그널/뷰)에서 호출, 블로킹 없이 반환
+    - subscribe(channel): SSE 뷰(이벤트 루프 안)에서 호출, Subscription 반환
+    - unsubscribe(subscription)
+
+    cross_process 가 True 인 브로커는 다른 프로세스(워커 명령, 다른 웹 워커)에서 발행한 메시지도
+    전달하므로 SSE 뷰가 DB 를 다시 확인하지 않는다.
+    """
+    cross_process = False
+
+    def publish(self, channel, message):
+        raise NotImplementedError
+
+    def subscribe(self, channel):
+        raise NotImplementedError
+
+    def unsubscribe(self, subscription):
+        raise NotImplementedError
+
+    def has_subscribers(self, channel):
+        """대량 발행 시 연결된 사용자만 골라내기 위한 힌트 (모르면 True)"""
+        return True
+
+
+class InProcessBroker(BaseBroker):
+    """단일 프로세스용 브로커: 같은 프로세스의 구독자에게만 전달
+
+    워커 명령(run_reminder_worker, scan_deadlines 등)이나 다른 웹 프로세스에서 발행한 메시지는
+    오지 않는다. SSE 뷰가 heartbeat 마다 DB 에서 놓친 알림을 확인하므로 전달은 되지만 최대
+    heartbeat 간격만큼 늦는다. 여러 프로세스로 배포할 때는 RedisBroker 를 쓴다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = {}
+
+    def publish(self, channel, message):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.deliver(message)
+            except RuntimeError:
+                # 구독 루프가 이미 닫힘
+                self.unsubscribe(subscription)
+        return len(subscriptions)
+
+    def subscribe(self, channel):
+        subscription = Subscription(self, channel)
+        with self._lock:
+            self._subscriptions.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.channel)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.channel]
+
+    def subscriber_count(self, channel):
+        with self._lock:
+            return len(self._subscriptions.get(channel, ()))
+
+    def has_subscribers(self, channel):
+        return self.subscriber_count(channel) > 0
+
+
+class RedisBroker(BaseBroker):
+    """Redis pub/sub 브로커: 워커 명령/다른 웹 프로세스에서 발행한 메시지도 바로 전달
+
+    settings.REDIS_URL 을 쓴다. 프로세스마다 구독 연결 하나(패턴 구독)를 백그라운드 스레드에서
+    읽어 같은 프로세스의 구독자에게 InProcessBroker 로 나눠 준다. 연결이 끊긴 동안의 메시지는
+    EventSource 재접속 시 Last-Event-ID 로 보충된다.
+    """
+    cross_process = True
+
+    def __init__(self, url=None):
+        import redis
+
+        self._redis = redis.Redis.from_url(url or settings.REDIS_URL)
+        self._errors = redis.RedisError
+        self._local = InProcessBroker()
+        self._listener = None
+        self._listener_lock = threading.Lock()
+
+    def publish(self, channel, message):
+        # 푸시는 부가 기능이므로 Redis 장애가 알림 저장 요청을 실패시키지 않게 한다
+        try:
+            return self._redis.publish(REDIS_CHANNEL_PREFIX + channel, json.dumps(message))
+        except self._errors:
+            logger.warning('Redis 에 실시간 메시지를 발행하지 못했습니다', exc_info=True)
+            return 0
+
+    def subscribe(self, channel):
+        self._ensure_listener()
+        return self._local.subscribe(channel)
+
+    def unsubscribe(self, subscription):
+        self._local.unsubscribe(subscription)
+
+    def has_subscribers(self, channel):
+        # 다른 프로세스의 구독자는 알 수 없다
+        return True
+
+    def _ensure_listener(self):
+        with self._listener_lock:
+            if self._listener is None:
+                self._listener = threading.Thread(target=self._listen, name='wbs-realtime-redis', daemon=True)
+                self._listener.start()
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe(REDIS_CHANNEL_PREFIX + '*')
+                for item in pubsub.listen():
+                    channel = item['channel'].decode()[len(REDIS_CHANNEL_PREFIX):]
+                    self._local.publish(channel, json.loads(item['data']))
+            except self._errors:
+                logger.warning('Redis 연결이 끊겨 실시간 브로커 구독을 다시 연결합니다', exc_info=True)
+                time.sleep(REDIS_RECONNECT_SECONDS)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """settings.WBS_REALTIME_BROKER (점 경로) 로 지정한 브로커, 기본은 InProcessBroker"""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                path = getattr(settings, 'WBS_REALTIME_BROKER', 'wbs.realtime.InProcessBroker')
+                _broker = import_string(path)()
+    return _broker
+
+
+def publish_to_user(user_id, event, data, event_id=None):
+    get_broker().publish(user_channel(user_id), {'event': event, 'data': data, 'id': event_id})
+
+
+def notification_payload(notification):
+    return {
+        'id': notification.pk,
+        'title': notification.title,
+        'message': notification.message,
+        'notification_type': notification.notification_type,
+        'project_id': notification.project_id,
+        'created_at': notification.created_at.isoformat(),
+    }
+
+
+def publish_notification(notification):
+    publish_to_user(notification.user_id, 'notification', notification_payload(notification), event_id=notification.pk)
+
+
+def publish_unread_count(user_id, count):
+    publish_to_user(user_id, 'unread_count', {'unread_count': count})
+
+
+def format_sse(message):
+    """브로커 메시지를 SSE 프레임 문자열로 변환"""
+    lines = []
+    if message.get('id') is not None:
+        lines.append(f"id: {message['id']}")
+    lines.append(f"event: {message['event']}")
+    lines.append(f"data: {json.dumps(message['data'], ensure_ascii=False)}")
+    return '\n'.join(lines) + '\n\n'
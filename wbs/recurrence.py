@@ -0,0 +1,173 @@
+import calendar as cal_module
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+RECURRENCE_CACHE_KEY = 'wbs:recurrence:{event_id}:{version}:{start}:{end}'
+# 폼에서 받는 반복 횟수 상한 (COUNT 규칙도 끝이 있는 시리즈로 유지)
+MAX_COUNT = 1000
+# 매일/매주 반복의 한 주기 일수
+FREQ_DAYS = {'daily': 1, 'weekly': 7}
+
+
+def _cache_timeout():
+    return getattr(settings, 'RECURRENCE_CACHE_TIMEOUT', 60 * 60)
+
+
+def add_months(day, months):
+    """months 개월 뒤 같은 날짜 (그 달에 없는 날짜면 말일로)"""
+    month_index = day.year * 12 + day.month - 1 + months
+    year, month = divmod(month_index, 12)
+    month += 1
+    return date(year, month, min(day.day, cal_module.monthrange(year, month)[1]))
+
+
+def _months_between(first, second):
+    return (second.year - first.year) * 12 + second.month - first.month
+
+
+def is_expandable(event):
+    return bool(event.is_recurring and event.recurrence_freq)
+
+
+def format_rrule(event):
+    """RFC 5545 RRULE 문자열 (반복이 아니면 빈 문자열)"""
+    if not is_expandable(event):
+        return ''
+    parts = [f'FREQ={event.recurrence_freq.upper()}', f'INTERVAL={event.recurrence_interval or 1}']
+    if event.recurrence_count:
+        parts.append(f'COUNT={event.recurrence_count}')
+    if event.recurrence_until:
+        parts.append(f'UNTIL={event.recurrence_until:%Y%m%d}')
+    return ';'.join(parts)
+
+
+class RecurrenceRule:
+    """Event 의 반복 규칙 (매일/매주/매월, 간격, 횟수/종료일, 제외 날짜)
+
+    k 번째 회차의 시작일을 바로 계산할 수 있으므로, 조회 구간의 첫 회차로 건너뛴 뒤
+    구간이 끝날 때까지만 만들어 낸다 (끝없는 시리즈도 구간 크기만큼만 생성).
+    """
+
+    def __init__(self, event):
+        self.start = event.start_date
+        self.duration = event.end_date - event.start_date
+        self.freq = event.recurrence_freq
+        self.interval = max(event.recurrence_interval or 1, 1)
+        self.count = event.recurrence_count
+        self.until = event.recurrence_until
+        self.exceptions = {date.fromisoformat(value) for value in event.recurrence_exceptions or []}
+
+    def nth_start(self, index):
+        if self.freq == 'monthly':
+            return add_months(self.start, index * self.interval)
+        return self.start + timedelta(days=index * self.interval * FREQ_DAYS[self.freq])
+
+    def _first_index_from(self, day):
+        """시작일이 day 이상인 첫 회차 번호 (이전 회차는 계산하지 않음)"""
+        if day <= self.start:
+            return 0
+        if self.freq == 'monthly':
+            index = max(_months_between(self.start, day) // self.interval - 1, 0)
+            while self.nth_start(index) < day:
+                index += 1
+            return index
+        step = self.interval * FREQ_DAYS[self.freq]
+        return -(-(day - self.start).days // step)
+
+    def _in_series(self, index, start):
+        if self.count is not None and index >= self.count:
+            return False
+        return self.until is None or start <= self.until
+
+    def occurrences(self, window_start, window_end):
+        """window_start~window_end 와 겹치는 회차 (시작일, 종료일) 를 순서대로 지연 생성"""
+        index = self._first_index_from(window_start - self.duration)
+        while True:
+            start = self.nth_start(index)
+            if start > window_end or not self._in_series(index, start):
+                return
+            if start not in self.exceptions:
+                yield start, start + self.duration
+            index += 1
+
+    def last_end(self):
+        """마지막 회차의 종료일 (횟수/종료일이 없으면 None = 끝없음)"""
+        last = None
+        if self.count is not None:
+            last = self.count - 1
+        if self.until is not None:
+            until_index = self._first_index_from(self.until + timedelta(days=1)) - 1
+            last = until_index if last is None else min(last, until_index)
+        if last is None:
+            return None
+        return self.nth_start(max(last, 0)) + self.duration
+
+
+class EventOccurrence:
+    """반복 일정의 한 회차 (날짜만 회차 기준이고 나머지 속성은 원본 Event 에 위임)"""
+    is_occurrence = True
+
+    def __init__(self, event, start_date, end_date):
+        self.event = event
+        self.start_date = start_date
+        self.end_date = end_date
+
+    def __getattr__(self, name):
+        return getattr(self.event, name)
+
+    def __repr__(self):
+        return f'<EventOccurrence {self.event.pk} {self.start_date}>'
+
+
+def window_q(start, end, prefix=''):
+    """start~end 구간에 회차가 있을 수 있는 일정 조건 (반복 일정은 시리즈 종료일로 거름)
+
+    prefix: 다른 모델에서 관계를 따라 걸 때의 경로 (예: 'event__')
+    """
+    def field(name):
+        return prefix + name
+    series = (
+        Q(**{field('is_recurring'): True}) & ~Q(**{field('recurrence_freq'): ''})
+        & (Q(**{field('recurrence_end__isnull'): True}) | Q(**{field('recurrence_end__gte'): start}))
+    )
+    return Q(**{field('start_date__lte'): end}) & (Q(**{field('end_date__gte'): start}) | series)
+
+
+def _version(event):
+    return f'{event.updated_at.timestamp():.6f}' if event.updated_at else '0'
+
+
+def _cache_key(event, start, end):
+    return RECURRENCE_CACHE_KEY.format(event_id=event.pk, version=_version(event), start=start.isoformat(), end=end.isoformat())
+
+
+def expand_events(events, start, end):
+    """일정 목록을 start~end 구간의 회차 목록으로 (반복이 아닌 일정은 그대로, 시작일 순)
+
+    반복 일정의 구간별 회차는 (일정 id, 수정 시각, 구간) 키로 캐시하므로 일정이 수정되면
+    키가 바뀌어 자연히 다시 계산된다.
+    """
+    events = list(events)
+    recurring = [event for event in events if is_expandable(event)]
+    keys = {event.pk: _cache_key(event, start, end) for event in recurring}
+    cached = cache.get_many(list(keys.values()))
+    missing = {}
+
+    expanded = []
+    for event in events:
+        if not is_expandable(event):
+            if event.start_date <= end and event.end_date >= start:
+                expanded.append(event)
+            continue
+        spans = cached.get(keys[event.pk])
+        if spans is None:
+            spans = list(RecurrenceRule(event).occurrences(start, end))
+            missing[keys[event.pk]] = spans
+        expanded.extend(EventOccurrence(event, first, last) for first, last in spans)
+    if missing:
+        cache.set_many(missing, _cache_timeout())
+    expanded.sort(key=lambda item: item.start_date)
+    return expanded
@@ -0,0 +1,176 @@
+import heapq
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from .models import Event, EventReminder, Notification
+from .notifications import bulk_notify
+from .recurrence import RecurrenceRule, is_expandable, window_q
+
+# 폼에서 허용하는 최대 알림 시간(분) - 이만큼 뒤에 시작하는 일정까지 미리 읽는다
+MAX_REMINDER_MINUTES = 1440
+DEFAULT_HORIZON = timedelta(hours=6)
+
+
+def _grace():
+    """워커가 멈춰 있던 동안 놓친 알림을 몇 분 전 것까지 늦게라도 보낼지"""
+    return timedelta(minutes=getattr(settings, 'REMINDER_GRACE_MINUTES', 10))
+
+
+def _all_day_time():
+    """시간이 없는(하루 종일) 일정의 기준 시각"""
+    return getattr(settings, 'REMINDER_ALL_DAY_TIME', time(9, 0))
+
+
+def starts_at(event, day):
+    start_time = None if event.is_all_day else event.start_time
+    return timezone.make_aware(datetime.combine(day, start_time or _all_day_time()))
+
+
+def fire_times(event, first, last):
+    """[first, last) 사이에 울려야 하는 (알림 시각, 회차 날짜) 목록 (반복 일정은 회차별)"""
+    if event.reminder_minutes is None or event.reminder_minutes < 0 or event.is_completed:
+        return []
+    lead = timedelta(minutes=event.reminder_minutes)
+    # 알림 시각이 구간 안이려면 시작 시각은 first+lead ~ last+lead 사이
+    first_day = timezone.localtime(first + lead).date()
+    last_day = timezone.localtime(last + lead).date()
+    if is_expandable(event):
+        days = [start for start, _ in RecurrenceRule(event).occurrences(first_day, last_day) if start >= first_day]
+    else:
+        days = [event.start_date] if first_day <= event.start_date <= last_day else []
+    fires = []
+    for day in days:
+        fire_at = starts_at(event, day) - lead
+        if first <= fire_at < last:
+            fires.append((fire_at, day))
+    return fires
+
+
+class ReminderScheduler:
+    """다가오는 일정 알림을 최소 힙으로 들고 있다가 시각이 되면 꺼내 보내는 스케줄러
+
+    - 앞으로 horizon 만큼의 알림만 (start_date, start_time) 인덱스 구간 조회로 한 번에 읽고,
+      절반쯤 지나면 다음 구간을 이어서 읽는다 (매분 전체 테이블을 훑지 않음).
+    - 바뀐 일정은 updated_at 워터마크 이후 행만 읽어 다시 넣는다. 힙 항목에 일정 버전(updated_at)을
+      함께 넣어 두고, 꺼낼 때 버전이 다르면 버린다 (힙에서 지우지 않는 지연 삭제).
+    - 발송 기록(EventReminder)으로 같은 회차는 한 번만 보낸다.
+    """
+
+    def __init__(self, horizon=DEFAULT_HORIZON):
+        self.horizon = horizon
+        self.heap = []
+        self.versions = {}
+        self.loaded_until = None
+        self.watermark = None
+
+    def __len__(self):
+        return len(self.heap)
+
+    def _push(self, event, first, last):
+        version = event.updated_at
+        self.versions[event.pk] = version
+        for fire_at, day in fire_times(event, first, last):
+            heapq.heappush(self.heap, (fire_at, event.pk, day, version))
+
+    def _candidates(self, first, last):
+        """알림 시각이 [first, last) 일 수 있는 일정 (단발은 시작일 구간, 반복은 구간 조건)"""
+        first_day = timezone.localtime(first).date()
+        last_day = timezone.localtime(last + timedelta(minutes=MAX_REMINDER_MINUTES)).date()
+        single = Q(start_date__range=(first_day, last_day)) & ~(Q(is_recurring=True) & ~Q(recurrence_freq=''))
+        recurring = Q(is_recurring=True) & ~Q(recurrence_freq='') & window_q(first_day, last_day)
+        return Event.objects.filter(single | recurring, is_completed=False)
+
+    def load(self, now):
+        """처음 시작할 때: 유예 구간부터 horizon 까지 읽고 워터마크를 잡는다"""
+        self.watermark = Event.objects.aggregate(latest=Max('updated_at'))['latest']
+        first = now - _grace()
+        self.loaded_until = now + self.horizon
+        for event in self._candidates(first, self.loaded_until).order_by('start_date', 'start_time'):
+            self._push(event, first, self.loaded_until)
+
+    def extend(self, now):
+        """읽어 둔 구간이 절반 이하로 남으면 다음 구간을 이어서 읽는다"""
+        if self.loaded_until - now > self.horizon / 2:
+            return 0
+        first, last = self.loaded_until, now + self.horizon
+        before = len(self.heap)
+        for event in self._candidates(first, last):
+            if self.versions.get(event.pk, event.updated_at) == event.updated_at:
+                self._push(event, first, last)
+        self.loaded_until = last
+        return len(self.heap) - before
+
+    def refresh(self, now):
+        """워터마크 이후 수정/생성된 일정만 읽어 힙에 다시 넣는다 (이전 항목은 버전으로 무효화)"""
+        changed = Event.objects.all()
+        if self.watermark is not None:
+            changed = changed.filter(updated_at__gt=self.watermark)
+        count = 0
+        for event in changed.order_by('updated_at'):
+            self._push(event, now - _grace(), self.loaded_until)
+            self.watermark = event.updated_at
+            count += 1
+        return count
+
+    def pop_due(self, now):
+        """시각이 된 (일정 id, 회차 날짜) 목록 (버전이 바뀐 항목은 버림)"""
+        due = []
+        while self.heap and self.heap[0][0] <= now:
+            _, event_id, day, version = heapq.heappop(self.heap)
+            if self.versions.get(event_id) == version:
+                due.append((event_id, day))
+        return due
+
+    def next_fire_at(self):
+        return self.heap[0][0] if self.heap else None
+
+
+def _message(event, day):
+    start = starts_at(event, day)
+    when = f'{day:%Y-%m-%d}' if event.is_all_day or not event.start_time else f'{start:%Y-%m-%d %H:%M}'
+    location = f' · {event.location}' if event.location else ''
+    return f'{when} 에 시작합니다{location}.'
+
+
+def send_reminders(due):
+    """(일정 id, 회차 날짜) 목록에 대해 생성자/참석자에게 reminder 알림 발송
+
+    삭제되었거나 완료된 일정, 이미 보낸 회차는 건너뛴다. 반환값: 생성된 알림 수
+    """
+    if not due:
+        return 0
+    events = Event.objects.in_bulk({event_id for event_id, _ in due})
+    due = [(event_id, day) for event_id, day in dict.fromkeys(due) if event_id in events and not events[event_id].is_completed]
+    sent = set(
+        EventReminder.objects.filter(event_id__in={event_id for event_id, _ in due}, occurrence_date__in={day for _, day in due})
+        .values_list('event_id', 'occurrence_date')
+    )
+    due = [item for item in due if item not in sent]
+    if not due:
+        return 0
+
+    recipients = defaultdict(set)
+    for event_id, user_id in Event.attendees.through.objects.filter(event_id__in={event_id for event_id, _ in due}).values_list('event_id', 'user_id'):
+        recipients[event_id].add(user_id)
+
+    notifications = []
+    for event_id, day in due:
+        event = events[event_id]
+        notifications.extend(
+            Notification(
+                user_id=user_id, title=f'일정 알림: {event.title}'[:200], message=_message(event, day),
+                notification_type='reminder', project_id=event.related_project_id,
+            )
+            for user_id in sorted(recipients[event_id] | {event.creator_id})
+        )
+    with transaction.atomic():
+        EventReminder.objects.bulk_create(
+            [EventReminder(event_id=event_id, occurrence_date=day) for event_id, day in due], ignore_conflicts=True,
+        )
+        bulk_notify(notifications)
+    return len(notifications)
@@ -0,0 +1,289 @@
+import re
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils.module_loading import import_string
+
+from .membership import membership_project_ids
+from .models import Project, Comment, Event, PersonalTask, Notification, SearchEntry
+
+DEFAULT_RESULT_LIMIT = 10
+# LIKE 검색이 제목 일치 순으로 다시 정렬할 후보 수 (limit 의 배수)
+CANDIDATE_FACTOR = 5
+MAX_QUERY_TERMS = 8
+REBUILD_CHUNK_SIZE = 1000
+TERM_RE = re.compile(r'\w+')
+
+# 대상 유형 -> (모델, 색인에 쓰는 필드, 인스턴스 -> (제목, 본문, 소유자 id))
+SEARCH_SOURCES = {
+    'project': (Project, ('title', 'description'), lambda p: (p.title, p.description, None)),
+    'comment': (Comment, ('content',), lambda c: ('', c.content, None)),
+    'event': (Event, ('title', 'description', 'location'), lambda e: (e.title, f'{e.description} {e.location}'.strip(), None)),
+    'personal_task': (PersonalTask, ('content', 'team_name'), lambda t: (t.content, t.team_name, None)),
+    'notification': (Notification, ('title', 'message', 'user'), lambda n: (n.title, n.message, n.user_id)),
+    'user': (User, ('username', 'first_name', 'last_name', 'email'), lambda u: (u.username, f'{u.first_name} {u.last_name} {u.email}'.strip(), None)),
+}
+MODEL_SOURCES = {model: source for source, (model, _, _) in SEARCH_SOURCES.items()}
+
+
+def query_terms(query):
+    """검색어를 단어 목록으로 (FTS 연산자/따옴표는 버리고 소문자로)"""
+    return [term.lower() for term in TERM_RE.findall(query or '')][:MAX_QUERY_TERMS]
+
+
+# ── 백엔드 ─────────────────────────────────────────────
+
+class BaseSearchBackend:
+    """SearchEntry 에서 검색어와 맞는 문서를 점수 순으로 찾는 백엔드
+
+    search() 는 [(object_id, 점수), ...] 를 점수가 높은 순으로 돌려준다.
+    allowed 는 사용자가 볼 수 있는 원본 queryset 으로, 주어지면 그 안의 문서만 후보로 삼는다.
+    """
+
+    def search(self, source, terms, limit, owner_id=None, allowed=None):
+        raise NotImplementedError
+
+    def rebuild(self):
+        """SearchEntry 를 다시 채운 뒤 DB 전문 색인을 정리"""
+
+
+def _allowed_sql(allowed):
+    """권한 queryset 을 object_id IN (...) 서브쿼리용 SQL 로"""
+    return allowed.order_by().values('pk').query.sql_with_params()
+
+
+class SQLiteFTSBackend(BaseSearchBackend):
+    """FTS5 가상 테이블 (wbs_searchentry_fts) + bm25 순위, 제목 일치에 가중치
+
+    unicode61 토큰(공백 단위)의 접두사로만 찾으므로 "프로젝트관리" 안의 "관리" 같은 부분 문자열은
+    못 찾는다. 기본값이 아니며 settings.WBS_SEARCH_BACKEND 로 지정할 때만 쓴다.
+    """
+    TITLE_WEIGHT = 10.0
+
+    def search(self, source, terms, limit, owner_id=None, allowed=None):
+        # 단어마다 접두사 검색 ("프로젝트" 로 "프로젝트를" 도 찾도록)
+        match = ' '.join(f'"{term}"*' for term in terms)
+        sql = (
+            'SELECT e.object_id, bm25(wbs_searchentry_fts, %s, 1.0) AS score '
+            'FROM wbs_searchentry_fts JOIN wbs_searchentry e ON e.id = wbs_searchentry_fts.rowid '
+            'WHERE wbs_searchentry_fts MATCH %s AND e.source = %s'
+        )
+        params = [self.TITLE_WEIGHT, match, source]
+        if owner_id is not None:
+            sql += ' AND e.owner_id = %s'
+            params.append(owner_id)
+        if allowed is not None:
+            allowed_sql, allowed_params = _allowed_sql(allowed)
+            sql += f' AND e.object_id IN ({allowed_sql})'
+            params.extend(allowed_params)
+        sql += ' ORDER BY score LIMIT %s'
+        params.append(limit)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            # bm25 는 낮을수록 관련도가 높다
+            return [(object_id, -score) for object_id, score in cursor.fetchall()]
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute("INSERT INTO wbs_searchentry_fts(wbs_searchentry_fts) VALUES ('rebuild')")
+            cursor.execute("INSERT INTO wbs_searchentry_fts(wbs_searchentry_fts) VALUES ('optimize')")
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """tsvector GIN 식 인덱스 (wbs_searchentry_tsv_idx) + ts_rank, 제목은 가중치 A
+
+    SQLiteFTSBackend 와 마찬가지로 단어 접두사로만 찾으므로 settings.WBS_SEARCH_BACKEND 로 지정할 때만 쓴다.
+    """
+    DOCUMENT = "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(body, ''))"
+
+    def search(self, source, terms, limit, owner_id=None, allowed=None):
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        sql = (
+            "SELECT object_id, ts_rank("
+            "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(body, '')), 'B'), q) AS score "
+            "FROM wbs_searchentry, to_tsquery('simple', %s) q "
+            f"WHERE {self.DOCUMENT} @@ q AND source = %s"
+        )
+        params = [tsquery, source]
+        if owner_id is not None:
+            sql += ' AND owner_id = %s'
+            params.append(owner_id)
+        if allowed is not None:
+            allowed_sql, allowed_params = _allowed_sql(allowed)
+            sql += f' AND object_id IN ({allowed_sql})'
+            params.extend(allowed_params)
+        sql += ' ORDER BY score DESC LIMIT %s'
+        params.append(limit)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE wbs_searchentry')
+
+
+class LikeSearchBackend(BaseSearchBackend):
+    """SearchEntry 에 icontains, 제목 일치 수로 순위 (기존 views.search 와 같은 부분 문자열 검색)"""
+
+    def search(self, source, terms, limit, owner_id=None, allowed=None):
+        entries = SearchEntry.objects.filter(source=source)
+        if owner_id is not None:
+            entries = entries.filter(owner_id=owner_id)
+        if allowed is not None:
+            entries = entries.filter(object_id__in=allowed.values('pk'))
+        for term in terms:
+            entries = entries.filter(Q(title__icontains=term) | Q(body__icontains=term))
+        ranked = [
+            (object_id, sum(term in title.lower() for term in terms))
+            for object_id, title in entries.order_by('-updated_at').values_list('object_id', 'title')[:limit * CANDIDATE_FACTOR]
+        ]
+        ranked.sort(key=lambda row: row[1], reverse=True)
+        return ranked[:limit]
+
+
+# 부분 문자열까지 찾는 n-gram 색인 (색인이 아직 없으면 스스로 LIKE 검색으로 대체)
+DEFAULT_BACKEND = 'wbs.ngram_search.NgramSearchBackend'
+
+
+def get_backend():
+    """settings.WBS_SEARCH_BACKEND (점 경로) 로 지정한 백엔드, 없으면 n-gram 검색
+
+    DB 전문 색인(SQLiteFTSBackend, PostgresSearchBackend)은 단어 접두사로만 찾아 기존 부분 문자열 검색보다
+    찾는 범위가 좁으므로 기본값으로 쓰지 않는다.
+    """
+    return import_string(getattr(settings, 'WBS_SEARCH_BACKEND', None) or DEFAULT_BACKEND)()
+
+
+# ── 색인 갱신 ──────────────────────────────────────────
+
+def source_for(model):
+    return MODEL_SOURCES.get(model)
+
+
+def needs_reindex(model, update_fields):
+    """update_fields 저장이 색인 필드를 건드리지 않으면 다시 색인할 필요 없음 (예: 읽음 처리, 로그인 시각)"""
+    if update_fields is None:
+        return True
+    _, fields, _ = SEARCH_SOURCES[source_for(model)]
+    return bool(set(fields) & set(update_fields))
+
+
+def _entry(source, obj):
+    _, _, document = SEARCH_SOURCES[source]
+    title, body, owner_id = document(obj)
+    return SearchEntry(source=source, object_id=obj.pk, owner_id=owner_id, title=(title or '')[:255], body=body or '')
+
+
+def index_objects(objects, batch_size=REBUILD_CHUNK_SIZE):
+    """저장된 인스턴스들의 검색 문서를 upsert (같은 모델 목록이어야 함, 한 배치당 쿼리 1번)"""
+    objects = [obj for obj in objects if obj.pk is not None]
+    if not objects:
+        return 0
+    source = source_for(type(objects[0]))
+    SearchEntry.objects.bulk_create(
+        [_entry(source, obj) for obj in objects],
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=['source', 'object_id'],
+        update_fields=['owner_id', 'title', 'body', 'updated_at'],
+    )
+    return len(objects)
+
+
+def unindex_object(obj):
+    SearchEntry.objects.filter(source=source_for(type(obj)), object_id=obj.pk).delete()
+
+
+def rebuild_search_index(sources=None, chunk_size=REBUILD_CHUNK_SIZE):
+    """원본 테이블에서 검색 문서를 다시 만든다 (색인 누락/손상 복구, 최초 도입 시 백필)
+
+    반환값: {대상 유형: 색인한 문서 수}
+    """
+    counts = {}
+    for source in sources or SEARCH_SOURCES:
+        model, fields, _ = SEARCH_SOURCES[source]
+        with transaction.atomic():
+            SearchEntry.objects.filter(source=source).delete()
+            batch = []
+            counts[source] = 0
+            for obj in model.objects.only(*fields).order_by('pk').iterator(chunk_size=chunk_size):
+                batch.append(obj)
+                if len(batch) >= chunk_size:
+                    counts[source] += index_objects(batch, chunk_size)
+                    batch = []
+            counts[source] += index_objects(batch, chunk_size)
+    get_backend().rebuild()
+    return counts
+
+
+# ── 검색 ───────────────────────────────────────────────
+
+def _ordered(queryset, ranked, limit):
+    """DB 에서 읽은 객체를 검색 점수 순서로 (그 사이 지워진 것은 제외)"""
+    by_pk = {obj.pk: obj for obj in queryset.filter(pk__in=[object_id for object_id, _ in ranked])}
+    return [by_pk[object_id] for object_id, _ in ranked if object_id in by_pk][:limit]
+
+
+def _visible(source, user):
+    """대상 유형별로 사용자가 볼 수 있는 queryset"""
+    if source == 'project':
+        return Project.objects.select_related('manager')
+    if source == 'comment':
+        return Comment.objects.select_related('project', 'author')
+    if source == 'event':
+        return Event.objects.filter(Q(creator=user) | Q(attendees=user)).distinct().select_related('related_project')
+    if source == 'personal_task':
+        tasks = PersonalTask.objects.select_related('project')
+        if user.is_staff:
+            return tasks
+        return tasks.filter(Q(assignees=user) | Q(project_id__in=membership_project_ids(user))).distinct()
+    if source == 'notification':
+        return Notification.objects.filter(user=user).select_related('project')
+    if source == 'user':
+        return User.objects.all()
+    raise ValueError(source)
+
+
+def _allowed(source, user):
+    """검색 후보를 좁힐 권한 queryset (모두 볼 수 있는 유형, 소유자로 거르는 알림은 None)"""
+    if source == 'event' or (source == 'personal_task' and not user.is_staff):
+        return _visible(source, user)
+    return None
+
+
+def search_source(user, source, query, limit=DEFAULT_RESULT_LIMIT, backend=None):
+    """한 대상 유형에서 관련도 순 검색 (사용자 권한 적용)"""
+    terms = query_terms(query)
+    if not terms:
+        return []
+    backend = backend or get_backend()
+    owner_id = user.pk if source == 'notification' else None
+    # 권한은 후보를 고를 때 적용한다 (남의 문서가 상위 후보를 차지해 내 일정/할 일이 밀려나지 않도록)
+    ranked = backend.search(source, terms, limit, owner_id=owner_id, allowed=_allowed(source, user))
+    return _ordered(_visible(source, user), ranked, limit)
+
+
+def search_all(user, query, limit=DEFAULT_RESULT_LIMIT):
+    """통합 검색 결과 (views.search / SearchViewSet 공용)
+
+    사용자 검색은 관리자만. 반환값은 템플릿 컨텍스트로 바로 쓸 수 있는 dict.
+    """
+    backend = get_backend()
+    sources = {
+        'projects': 'project',
+        'comments': 'comment',
+        'events': 'event',
+        'personal_tasks': 'personal_task',
+        'notifications': 'notification',
+    }
+    if user.is_staff:
+        sources['users'] = 'user'
+    results = {key: search_source(user, source, query, limit, backend) for key, source in sources.items()}
+    results.setdefault('users', [])
+    results['query'] = query
+    results['total_count'] = sum(len(results[key]) for key in sources)
+    return results
@@ -4,7 +4,7 @@ from .models import (
     Project, ProjectPhase, ApprovalLine, Comment, 
     ProjectDocument, DailyProgress, TaskChecklistItem, 
     UserProfile, Notification, SubscriptionPlan, 
-    UserSubscription, AdCampaign
+    UserSubscription, AdCampaign, Event, PersonalTask
 )
 
 class UserSerializer(serializers.ModelSerializer):
@@ -87,6 +87,20 @@ class NotificationSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ['created_at', 'read_at']
 
+class EventSerializer(serializers.ModelSerializer):
+    creator = UserSerializer(read_only=True)
+    
+    class Meta:
+        model = Event
+        fields = '__all__'
+        read_only_fields = ['created_at', 'updated_at']
+
+class PersonalTaskSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PersonalTask
+        fields = '__all__'
+        read_only_fields = ['created_at', 'updated_at']
+
 class SubscriptionPlanSerializer(serializers.ModelSerializer):
     class Meta:
         model = SubscriptionPlan
@@ -114,6 +128,7 @@ class DashboardStatsSerializer(serializers.Serializer):
     active_projects = serializers.IntegerField()
     completed_projects = serializers.IntegerField()
     total_comments = serializers.IntegerField()
+    monthly_project_count = serializers.IntegerField()
     recent_projects = ProjectSerializer(many=True)
     pending_approvals = ApprovalLineSerializer(many=True)
     monthly_projects = ProjectSerializer(many=True)
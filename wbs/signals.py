@@ -0,0 +1,182 @@
+from django.db import transaction
+from django.db.models import F
+from django.contrib.auth.models import User
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from .models import Project, ProjectPhase, ProjectMembership, Notification, AdCampaign, Comment, ApprovalLine, DailyProgress, Event, PersonalTask
+from .dashboard import invalidate_dashboard_stats
+from .sync import record_access_changes, record_tombstone
+from .membership import remove_stale_assignee_memberships, sync_project_memberships
+from .notifications import adjust_unread_count
+from .realtime import publish_notification
+from .ad_selection import invalidate_running_campaigns
+from .search import index_objects, needs_reindex, unindex_object
+from .autocomplete import mark_stale as mark_autocomplete_stale
+
+
+@receiver([post_save, post_delete], sender=Project)
+@receiver([post_save, post_delete], sender=Comment)
+@receiver([post_save, post_delete], sender=ApprovalLine)
+def invalidate_dashboard_on_change(sender, **kwargs):
+    """대시보드 통계에 영향을 주는 모델이 바뀌면 캐시 무효화"""
+    invalidate_dashboard_stats()
+
+
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=Comment)
+@receiver(post_delete, sender=DailyProgress)
+@receiver(post_delete, sender=Event)
+@receiver(post_delete, sender=PersonalTask)
+def record_sync_tombstone(sender, instance, **kwargs):
+    """모바일 델타 동기화가 삭제를 알 수 있도록 삭제 기록 저장"""
+    record_tombstone(instance)
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, **kwargs):
+    """프로젝트 댓글 수 +1 (원자적 UPDATE)"""
+    if created:
+        Project.objects.filter(pk=instance.project_id).update(comment_count=F('comment_count') + 1)
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    """프로젝트 댓글 수 -1 (원자적 UPDATE)"""
+    Project.objects.filter(pk=instance.project_id, comment_count__gt=0).update(comment_count=F('comment_count') - 1)
+
+
+@receiver(post_save, sender=Project)
+def sync_memberships_on_project_save(sender, instance, update_fields=None, **kwargs):
+    """매니저/TL 변경을 참여 색인에 반영"""
+    if update_fields is not None and not {'manager', 'tl'} & set(update_fields):
+        return
+    sync_project_memberships([instance.pk])
+
+
+@receiver(post_save, sender=ProjectPhase)
+def sync_memberships_on_phase_save(sender, instance, **kwargs):
+    """단계가 추가/이동되면 담당자 참여 색인 갱신"""
+    sync_project_memberships([instance.project_id])
+
+
+@receiver(post_delete, sender=ProjectPhase)
+def sync_memberships_on_phase_delete(sender, instance, origin=None, **kwargs):
+    """단계가 삭제되면 남은 단계에 없는 담당자 참여만 삭제 (프로젝트 연쇄 삭제 중 행을 다시 만들지 않도록)"""
+    # 단계 자체를 지운 경우만 접근 변경 기록 (프로젝트/사용자 연쇄 삭제 중에는 그 사용자가 곧 지워질 수 있음)
+    direct = isinstance(origin, ProjectPhase) or getattr(origin, 'model', None) is ProjectPhase
+    remove_stale_assignee_memberships(instance.project_id, log_access=direct)
+
+
+@receiver(m2m_changed, sender=Project.team_members.through)
+def sync_memberships_on_team_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """팀원 추가/제거를 참여 색인에 반영 (user.projects 쪽 역방향 변경 포함)"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        sync_project_memberships([instance.pk])
+    elif pk_set is not None:
+        sync_project_memberships(pk_set)
+    else:
+        # 역방향 clear 는 pk_set 이 없으므로 해당 사용자의 기존 팀원 색인으로 대상 결정
+        sync_project_memberships(
+            ProjectMembership.objects.filter(user=instance, role='member').values_list('project_id', flat=True)
+        )
+
+
+@receiver(m2m_changed, sender=ProjectPhase.assignees.through)
+def sync_memberships_on_assignee_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """단계 담당자 추가/제거를 참여 색인에 반영"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        sync_project_memberships([instance.project_id])
+    elif pk_set is not None:
+        sync_project_memberships(
+            ProjectPhase.objects.filter(pk__in=pk_set).values_list('project_id', flat=True)
+        )
+    else:
+        sync_project_memberships(
+            ProjectMembership.objects.filter(user=instance, role='assignee').values_list('project_id', flat=True)
+        )
+
+
+@receiver(m2m_changed, sender=Event.attendees.through)
+@receiver(m2m_changed, sender=PersonalTask.assignees.through)
+def record_sync_access_on_m2m_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """일정 참석자/작업 담당자 변경을 모바일 동기화 접근 변경으로 기록 (역방향 변경 포함)"""
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    key, field = ('events', 'event_id') if sender is Event.attendees.through else ('personal_tasks', 'personaltask_id')
+    if action == 'pre_clear':
+        # clear 는 pk_set 이 없으므로 지우기 전에 대상 쌍을 읽는다
+        rows = sender.objects.filter(**{'user_id' if reverse else field: instance.pk}).values_list(field, 'user_id')
+    elif reverse:
+        rows = [(object_id, instance.pk) for object_id in pk_set]
+    else:
+        rows = [(instance.pk, user_id) for user_id in pk_set]
+    record_access_changes(key, rows)
+
+
+@receiver(post_save, sender=Notification)
+def push_new_notification(sender, instance, created, **kwargs):
+    """새 알림을 연결된 SSE 클라이언트에 푸시 (커밋 후)"""
+    if created:
+        transaction.on_commit(lambda: publish_notification(instance))
+
+
+@receiver(post_save, sender=Notification)
+def increment_unread_count(sender, instance, created, **kwargs):
+    """새 미읽음 알림이면 사용자 카운터 +1"""
+    if created and not instance.is_read:
+        adjust_unread_count(instance.user_id, 1)
+
+
+@receiver(post_delete, sender=Notification)
+def decrement_unread_count(sender, instance, **kwargs):
+    """미읽음 알림이 삭제되면 사용자 카운터 -1"""
+    if not instance.is_read:
+        adjust_unread_count(instance.user_id, -1)
+
+
+@receiver([post_save, post_delete], sender=AdCampaign)
+@receiver(m2m_changed, sender=AdCampaign.target_plans.through)
+def invalidate_ads_on_change(sender, **kwargs):
+    """캠페인/타겟 플랜이 바뀌면 광고 후보 캐시 삭제"""
+    invalidate_running_campaigns()
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Comment)
+@receiver(post_save, sender=Event)
+@receiver(post_save, sender=PersonalTask)
+@receiver(post_save, sender=Notification)
+@receiver(post_save, sender=User)
+def update_search_index(sender, instance, update_fields=None, **kwargs):
+    """검색 문서 갱신 (색인 필드를 건드리지 않는 update_fields 저장은 건너뜀)"""
+    if needs_reindex(sender, update_fields):
+        index_objects([instance])
+
+
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=Comment)
+@receiver(post_delete, sender=Event)
+@receiver(post_delete, sender=PersonalTask)
+@receiver(post_delete, sender=Notification)
+@receiver(post_delete, sender=User)
+def remove_from_search_index(sender, instance, **kwargs):
+    """삭제된 대상의 검색 문서 제거"""
+    unindex_object(instance)
+
+
+@receiver([post_save, post_delete], sender=Project)
+@receiver([post_save, post_delete], sender=Event)
+@receiver([post_save, post_delete], sender=User)
+@receiver(m2m_changed, sender=Event.attendees.through)
+def invalidate_autocomplete(sender, update_fields=None, action=None, **kwargs):
+    """자동완성 색인 대상(제목/사용자명/일정 참석자)이 바뀌면 다시 만들도록 표시"""
+    if update_fields is not None and not {'title', 'username', 'first_name', 'last_name', 'is_active'} & set(update_fields):
+        return
+    if action is not None and not action.startswith('post_'):
+        return
+    mark_autocomplete_stale()
@@ -0,0 +1,242 @@
+import base64
+import binascii
+import json
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .membership import membership_project_ids
+from .models import Project, Comment, DailyProgress, Event, PersonalTask, SyncAccessChange, SyncTombstone
+
+# 동기화 대상: 응답 키 -> 모델 (모두 updated_at 을 가진 모델)
+SYNC_MODELS = {
+    'projects': Project,
+    'comments': Comment,
+    'daily_progress': DailyProgress,
+    'events': Event,
+    'personal_tasks': PersonalTask,
+}
+# 토큰에 담는 커서 키 (모델별 + 삭제 기록 + 사용자별 접근 변경 기록)
+DELETED_CURSOR = 'deleted'
+ACCESS_CURSOR = 'access'
+# 프로젝트 접근이 바뀌면 함께 다시 판정하는 프로젝트 하위 행
+PROJECT_CHILDREN = ('comments', 'daily_progress', 'personal_tasks')
+
+DEFAULT_SYNC_LIMIT = 500
+MAX_SYNC_LIMIT = 2000
+
+
+class InvalidSyncToken(ValueError):
+    """잘못된 since 토큰"""
+
+
+def _safety_lag():
+    """워터마크를 현재 시각보다 늦추는 폭. 이보다 오래 걸려 커밋되는 트랜잭션의 행만 놓칠 수 있다"""
+    return timedelta(seconds=getattr(settings, 'SYNC_SAFETY_LAG_SECONDS', 30))
+
+
+def encode_sync_token(cursors):
+    """{커서 키: (시각, id 또는 None)} -> 불투명 토큰"""
+    data = {key: [moment.isoformat(), pk] for key, (moment, pk) in cursors.items()}
+    return base64.urlsafe_b64encode(json.dumps(data, separators=(',', ':')).encode()).decode().rstrip('=')
+
+
+def decode_sync_token(token):
+    """토큰 -> {커서 키: (시각, id 또는 None)}
+
+    id 가 None 이면 그 시각까지 모두 받은 것이고, 아니면 같은 시각의 id 다음부터 이어 받는다.
+    예전 형식(시각 하나)은 모든 키에 '그 시각 이상'으로 해석한다.
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        text = base64.urlsafe_b64decode(padded.encode()).decode()
+        if not text.startswith('{'):
+            moment = parse_datetime(text)
+            if moment is None:
+                raise ValueError(text)
+            return {key: (moment, 0) for key in [*SYNC_MODELS, DELETED_CURSOR]}
+        cursors = {}
+        for key, (moment, pk) in json.loads(text).items():
+            moment = parse_datetime(moment)
+            if moment is None or not (pk is None or isinstance(pk, int)):
+                raise ValueError(key)
+            cursors[key] = (moment, pk)
+        return cursors
+    except (ValueError, TypeError, AttributeError, UnicodeDecodeError, binascii.Error):
+        raise InvalidSyncToken('잘못된 since 토큰입니다.')
+
+
+def sync_key_for(model):
+    """모델 클래스의 동기화 응답 키 (동기화 대상이 아니면 None)"""
+    for key, sync_model in SYNC_MODELS.items():
+        if sync_model is model:
+            return key
+    return None
+
+
+def _json_value(value):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def serialize_row(obj):
+    """모델 인스턴스의 일반 컬럼을 JSON 직렬화 가능한 dict 로 변환 (FK 는 *_id 값)"""
+    row = {}
+    for field in obj._meta.concrete_fields:
+        row[field.attname] = _json_value(getattr(obj, field.attname))
+    return row
+
+
+def visible_querysets(user):
+    """사용자에게 내려줄 행만 남긴 동기화 대상 queryset (응답 키 -> queryset)
+
+    참여한 프로젝트(참여 색인)와 그 댓글/진행상황, 만들었거나 참석하는 일정,
+    담당이거나 참여 프로젝트의 개인 작업. 스태프는 전체.
+    """
+    querysets = {key: model.objects.all() for key, model in SYNC_MODELS.items()}
+    if user.is_staff:
+        return querysets
+    project_ids = membership_project_ids(user)
+    attending = Event.attendees.through.objects.filter(user=user).values('event_id')
+    assigned = PersonalTask.assignees.through.objects.filter(user=user).values('personaltask_id')
+    querysets['projects'] = querysets['projects'].filter(pk__in=project_ids)
+    querysets['comments'] = querysets['comments'].filter(project_id__in=project_ids)
+    querysets['daily_progress'] = querysets['daily_progress'].filter(project_id__in=project_ids)
+    querysets['events'] = querysets['events'].filter(Q(creator=user) | Q(pk__in=attending))
+    querysets['personal_tasks'] = querysets['personal_tasks'].filter(Q(pk__in=assigned) | Q(project_id__in=project_ids))
+    return querysets
+
+
+def _access_changes(querysets, entries):
+    """접근 변경 기록의 대상들을 지금 권한으로 다시 판정
+
+    반환값: (다시 보낼 행 {응답 키: [인스턴스]}, 지울 id {응답 키: [id]}).
+    프로젝트 접근이 바뀌면 그 댓글/진행상황/개인 작업도 함께 보내거나 지운다
+    (담당 작업처럼 다른 경로로 여전히 보이는 행은 지우지 않음).
+    """
+    targets = defaultdict(set)
+    for entry in entries:
+        targets[entry.model_name].add(entry.object_id)
+    rows = defaultdict(list)
+    gone = defaultdict(list)
+
+    project_ids = targets.pop('projects', set())
+    if project_ids:
+        rows['projects'] = list(querysets['projects'].filter(pk__in=project_ids))
+        visible = {project.pk for project in rows['projects']}
+        lost = project_ids - visible
+        gone['projects'] = sorted(lost)
+        for key in PROJECT_CHILDREN:
+            rows[key] += querysets[key].filter(project_id__in=visible)
+            if lost:
+                lost_rows = SYNC_MODELS[key].objects.filter(project_id__in=lost).exclude(pk__in=querysets[key].values('pk'))
+                gone[key] += lost_rows.values_list('pk', flat=True)
+
+    for key, object_ids in targets.items():
+        visible_rows = list(querysets[key].filter(pk__in=object_ids))
+        rows[key] += visible_rows
+        gone[key] += sorted(object_ids - {obj.pk for obj in visible_rows})
+    return rows, gone
+
+
+def record_access_changes(key, pairs):
+    """(대상 id, 사용자 id) 쌍의 접근이 바뀌었을 수 있음을 기록 (참석자/담당자 m2m 변경 시그널용)"""
+    SyncAccessChange.objects.bulk_create([
+        SyncAccessChange(user_id=user_id, model_name=key, object_id=object_id)
+        for object_id, user_id in set(pairs)
+    ])
+
+
+def _take(queryset, time_field, cursor, watermark, limit):
+    """커서 다음부터 워터마크까지의 변경분을 (time_field, id) 순으로 limit 개 조회
+
+    반환값: (행 목록, 다음 커서, 잘렸는지). 같은 시각의 행이 limit 보다 많아도 id 로 이어 받는다.
+    """
+    queryset = queryset.filter(**{f'{time_field}__lte': watermark})
+    if cursor is not None:
+        moment, pk = cursor
+        after = Q(**{f'{time_field}__gt': moment})
+        if pk is not None:
+            after |= Q(**{time_field: moment, 'id__gt': pk})
+        queryset = queryset.filter(after)
+    rows = list(queryset.order_by(time_field, 'id')[:limit + 1])
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, (getattr(rows[-1], time_field), rows[-1].pk), True
+    return rows, (watermark, None), False
+
+
+def build_sync_payload(user, since_token=None, limit=DEFAULT_SYNC_LIMIT):
+    """since 토큰 이후 user 에게 보이는 변경/삭제된 행과 다음 토큰을 담은 응답 dict 생성
+
+    - since 가 없으면 전체 동기화(처음 설치한 클라이언트)
+    - 토큰은 모델별 (updated_at, id) 커서라 행이 중복되거나 빠지지 않는다.
+    - 워터마크는 현재 시각보다 SYNC_SAFETY_LAG_SECONDS 앞이다. updated_at 은 저장 시각이고
+      커밋은 그 뒤라서, 늦게 커밋된 행이 이미 지나간 커서 뒤로 끼어들지 않게 한다.
+    - 모델별로 limit 을 넘으면 has_more=True 이고 그 모델만 잘린 지점부터 이어 받는다.
+    - 삭제 기록은 삭제된 행의 권한을 알 수 없어 모든 사용자에게 id 만 내려준다.
+    - 프로젝트 참여/일정 참석/작업 담당이 바뀌어도 대상의 updated_at 은 그대로이므로, 사용자별
+      접근 변경 기록(SyncAccessChange)으로 새로 보이게 된 행은 changes 에, 더는 볼 수 없는 행은
+      deleted 에 넣는다.
+    """
+    cursors = decode_sync_token(since_token) if since_token else {}
+    now = timezone.now()
+    watermark = now - _safety_lag()
+    has_more = False
+    changes = {}
+    next_cursors = {}
+    querysets = visible_querysets(user)
+    for key, queryset in querysets.items():
+        rows, next_cursors[key], truncated = _take(queryset, 'updated_at', cursors.get(key), watermark, limit)
+        changes[key] = [serialize_row(obj) for obj in rows]
+        has_more |= truncated
+
+    deleted = {key: [] for key in SYNC_MODELS}
+    if since_token:
+        tombstones, next_cursors[DELETED_CURSOR], truncated = _take(
+            SyncTombstone.objects.all(), 'deleted_at', cursors.get(DELETED_CURSOR), watermark, limit,
+        )
+        for tombstone in tombstones:
+            deleted.setdefault(tombstone.model_name, []).append(tombstone.object_id)
+        has_more |= truncated
+
+        entries, next_cursors[ACCESS_CURSOR], truncated = _take(
+            SyncAccessChange.objects.filter(user=user), 'changed_at', cursors.get(ACCESS_CURSOR), watermark, limit,
+        )
+        granted, revoked = _access_changes(querysets, entries)
+        for key, rows in granted.items():
+            sent = {row['id'] for row in changes[key]}
+            for obj in rows:
+                if obj.pk not in sent:
+                    sent.add(obj.pk)
+                    changes[key].append(serialize_row(obj))
+        for key, object_ids in revoked.items():
+            deleted[key] += object_ids
+        has_more |= truncated
+    else:
+        # 전체 동기화는 현재 행을 모두 받으므로 그 이전 삭제/접근 변경 기록은 필요 없다
+        next_cursors[DELETED_CURSOR] = (watermark, None)
+        next_cursors[ACCESS_CURSOR] = (watermark, None)
+
+    return {
+        'changes': changes,
+        'deleted': deleted,
+        'next_since': encode_sync_token(next_cursors),
+        'has_more': has_more,
+        'server_time': now.isoformat(),
+    }
+
+
+def record_tombstone(instance):
+    """동기화 대상 행이 삭제되면 삭제 기록을 남긴다"""
+    key = sync_key_for(type(instance))
+    if key is not None:
+        SyncTombstone.objects.create(model_name=key, object_id=instance.pk)
@@ -1,3 +1,1196 @@
-from django.test import TestCase
+import importlib.util
+import random
+import shutil
+import tempfile
+import unittest
+from datetime import date, datetime, time, timedelta
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db import DatabaseError, connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import ad_counters, autocomplete, deadlines, views
+from .ad_selection import running_campaigns, select_ads, weighted_sample
+from .dashboard import compute_dashboard_stats, get_cache_counters, get_dashboard_stats
+from .deadlines import scan_deadlines
+from .capacity import allocated_hours, capacity_report
+from .forms import ProjectForm
+from .intervals import DateIntervalIndex
+from .pagination import PaginationError, decode_cursor, encode_cursor, keyset_page, parse_fields, parse_limit
+from .models import Project, ProjectPhase, Comment, ProjectDocument, DeadlineNotice, Notification, Event, ProjectMembership, NotificationCounter, SearchEntry, NotificationArchive, AdCampaign, SubscriptionPlan, EventReminder, PersonalTask
+from .notifications import archive_read_notifications, dispatch_notifications, get_unread_count_for, notify_project_members
+from .ngram_search import NgramSearchBackend, build_segment, decode_postings, encode_postings
+from .realtime import InProcessBroker, user_channel
+from .recurrence import RecurrenceRule, add_months, expand_events, window_q
+from .reminders import ReminderScheduler, send_reminders
+from .search import SQLiteFTSBackend, get_backend, search_source
+from .timeline import Timeline
+
+
+class ProjectDetailQueryCountTests(TestCase):
+    """프로젝트 상세 페이지 쿼리 수가 단계/댓글/문서 수와 무관한지 확인"""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = self.settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.manager = User.objects.create_user(username='manager', password='pw')
+        self.members = [User.objects.create_user(username=f'member{i}', password='pw') for i in range(3)]
+
+    def _make_project(self, size):
+        today = date.today()
+        project = Project.objects.create(
+            title=f'프로젝트 {size}', description='설명', manager=self.manager,
+            start_date=today, end_date=today + timedelta(days=30),
+        )
+        for i in range(size):
+            phase = ProjectPhase.objects.create(
+                project=project, title=f'단계 {i}', description='내용',
+                start_date=today, end_date=today + timedelta(days=3), order=i,
+            )
+            phase.assignees.set(self.members[: i % 3 + 1])
+            Comment.objects.create(project=project, author=self.members[i % 3], content=f'댓글 {i}')
+            ProjectDocument.objects.create(
+                project=project, title=f'문서 {i}', uploaded_by=self.members[i % 3],
+                file=ContentFile(b'data', name=f'doc{i}.txt'),
+            )
+        return project
+
+    def _count_queries(self, project):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('wbs:project_detail', args=[project.pk]))
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_query_count_is_independent_of_related_rows(self):
+        # 사이드바 광고 후보/카운터 캐시를 먼저 채워 두고 페이지 자체의 쿼리만 비교
+        cache.clear()
+        self._count_queries(self._make_project(0))
+        small = self._count_queries(self._make_project(1))
+        large = self._count_queries(self._make_project(15))
+        self.assertEqual(small, large)
+        # 프로젝트(+매니저) / 단계 / 단계 담당자
+        self.assertEqual(large, 3)
+
+    def test_query_count_for_logged_in_member(self):
+        member = self.members[0]
+        self.client.force_login(member)
+        cache.clear()
+        self._count_queries(self._make_project(0))
+        small = self._make_project(1)
+        large = self._make_project(15)
+        for project in (small, large):
+            project.team_members.add(member)
+        self.assertEqual(self._count_queries(small), self._count_queries(large))
+        # 페이지 3개 + 세션 / 사용자 / 구독(광고 노출 여부)
+        self.assertEqual(self._count_queries(large), 6)
+
+    def test_phase_owner_falls_back_to_manager(self):
+        today = date.today()
+        project = self._make_project(1)
+        ProjectPhase.objects.create(
+            project=project, title='담당자 없음', description='내용', start_date=today, end_date=today, order=1,
+        )
+        response = self.client.get(reverse('wbs:project_detail', args=[project.pk]))
+        owners = {row['title']: row['owner'] for row in response.context['phase_rows']}
+        self.assertEqual(owners, {'단계 0': 'member0', '담당자 없음': 'manager'})
+
+
+class ProjectCommentCountTests(TestCase):
+    """미리 읽어 둔 프로젝트를 저장해도 시그널이 올린 댓글 수를 덮어쓰지 않는지 확인"""
+
+    def setUp(self):
+        self.manager = User.objects.create_user(username='manager', password='pw')
+        self.project = Project.objects.create(
+            title='프로젝트', description='설명', manager=self.manager,
+            start_date=date(2026, 3, 2), end_date=date(2026, 3, 31),
+        )
+
+    def test_edit_form_keeps_comments_added_meanwhile(self):
+        loaded = Project.objects.get(pk=self.project.pk)
+        Comment.objects.create(project=self.project, author=self.manager, content='그사이 달린 댓글')
+        form = ProjectForm({
+            'title': '수정한 제목', 'description': '설명', 'start_date': '2026-03-02', 'end_date': '2026-03-31',
+            'status': loaded.status, 'priority': loaded.priority, 'color_theme': loaded.color_theme,
+        }, instance=loaded)
+        self.assertTrue(form.is_valid(), form.errors)
+        form.save()
+        self.project.refresh_from_db()
+        self.assertEqual((self.project.title, self.project.comment_count), ('수정한 제목', 1))
+
+
+class DeadlineScanTests(TestCase):
+    """마감 임박 스캔이 이전 실행 뒤에 생긴/바뀐 마감일도 찾고 중복 발송하지 않는지 확인"""
+
+    def setUp(self):
+        self.today = date(2026, 3, 2)
+        self.manager = User.objects.create_user(username='manager', password='pw')
+        self.project = Project.objects.create(
+            title='기존 프로젝트', description='설명', manager=self.manager,
+            start_date=self.today, end_date=self.today + timedelta(days=60),
+        )
+
+    def _notices(self, source):
+        return DeadlineNotice.objects.filter(source=source).count()
+
+    def test_row_created_after_scan_is_noticed_once(self):
+        scan_deadlines(today=self.today, lead_days=3)
+        project = Project.objects.create(
+            title='새 프로젝트', description='설명', manager=self.manager,
+            start_date=self.today, end_date=self.today + timedelta(days=1),
+        )
+        result = scan_deadlines(today=self.today, lead_days=3)
+        self.assertEqual(result['deadlines'], 1)
+        self.assertTrue(Notification.objects.filter(
+            user=self.manager, project=project, notification_type='deadline_approaching',
+        ).exists())
+
+        result = scan_deadlines(today=self.today, lead_days=3)
+        self.assertEqual(result['deadlines'], 0)
+        self.assertEqual(Notification.objects.filter(project=project).count(), 1)
+
+    def test_end_date_moved_into_scanned_range_is_noticed(self):
+        phase = ProjectPhase.objects.create(
+            project=self.project, title='단계', description='내용',
+            start_date=self.today, end_date=self.today + timedelta(days=30),
+        )
+        scan_deadlines(today=self.today, lead_days=3)
+        self.assertEqual(self._notices('phase'), 0)
+
+        phase.end_date = self.today + timedelta(days=2)
+        phase.save()
+        scan_deadlines(today=self.today + timedelta(days=1), lead_days=3)
+        self.assertEqual(self._notices('phase'), 1)
+
+    def test_concurrent_run_does_not_notify_twice(self):
+        project = Project.objects.create(
+            title='동시 실행', description='설명', manager=self.manager,
+            start_date=self.today, end_date=self.today + timedelta(days=1),
+        )
+        # 다른 실행이 이번 실행의 기록 조회와 INSERT 사이에 먼저 발송 기록을 넣은 상황
+        DeadlineNotice.objects.create(source='project', object_id=project.pk, end_date=project.end_date)
+        with mock.patch.object(deadlines, '_already_noticed', return_value=set()):
+            result = scan_deadlines(today=self.today, lead_days=3)
+        self.assertEqual(result, {'range': (self.today, self.today + timedelta(days=3)), 'deadlines': 0, 'notifications': 0})
+        self.assertFalse(Notification.objects.filter(project=project).exists())
+
+
+class NotificationStreamTests(TestCase):
+    """SSE 스트림이 WSGI 에서는 열리지 않고, 다른 프로세스가 만든 알림도 (DB 확인 또는 브로커로) 전달하는지 확인"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='viewer', password='pw')
+
+    def test_wsgi_request_does_not_hold_a_stream(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('wbs:notification_stream'))
+        self.assertEqual(response.status_code, 204)
+
+    @mock.patch.object(views, 'SSE_HEARTBEAT_SECONDS', 0.05)
+    @mock.patch.object(views, 'SSE_MAX_SECONDS', 2)
+    async def test_notification_created_outside_the_broker_is_delivered(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse('wbs:notification_stream'))
+        self.assertEqual(response.status_code, 200)
+        chunks = aiter(response.streaming_content)
+        frame = b''
+        while b'event: unread_count' not in frame:
+            frame = await anext(chunks)
+
+        # bulk_create 는 시그널(브로커 발행)을 거치지 않는다: 워커 프로세스에서 만든 알림과 같은 상황
+        notification, = await sync_to_async(Notification.objects.bulk_create)([
+            Notification(user=self.user, title='워커 알림', message='내용', notification_type='reminder'),
+        ])
+        received = b''
+        async for chunk in chunks:
+            received += chunk
+            if f'id: {notification.pk}'.encode() in received:
+                break
+        self.assertIn('워커 알림'.encode(), received)
+
+    @mock.patch.object(views, 'SSE_HEARTBEAT_SECONDS', 0.01)
+    @mock.patch.object(views, 'SSE_MAX_SECONDS', 2)
+    async def test_cross_process_broker_does_not_poll_the_db_per_heartbeat(self):
+        broker = CrossProcessBroker()
+        await self.async_client.aforce_login(self.user)
+        with mock.patch.object(views, 'get_broker', return_value=broker), \
+                mock.patch.object(views, '_missed_notifications', wraps=views._missed_notifications) as missed:
+            response = await self.async_client.get(reverse('wbs:notification_stream'))
+            chunks = aiter(response.streaming_content)
+            keepalives = 0
+            while keepalives < 3:
+                keepalives += (await anext(chunks)) == b': keepalive\n\n'
+            # 다른 프로세스가 발행한 메시지는 브로커로 바로 온다
+            broker.publish(user_channel(self.user.pk), {'event': 'unread_count', 'data': {'unread_count': 7}, 'id': None})
+            frame = b''
+            while b'unread_count' not in frame:
+                frame = await anext(chunks)
+        self.assertIn(b'"unread_count": 7', frame)
+        missed.assert_not_called()
+
+
+class CrossProcessBroker(InProcessBroker):
+    """프로세스 간 브로커처럼 동작한다고 알리는 테스트용 브로커"""
+    cross_process = True
+
+
+class UnreadCountTests(TestCase):
+    """미읽음 개수가 프로세스 캐시가 아니라 DB 카운터 행에서 읽히는지 확인"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='reader', password='pw')
+        self.client.force_login(self.user)
+
+    def _count(self):
+        return self.client.get(reverse('wbs:get_notifications_count')).json()['unread_count']
+
+    def test_counter_follows_create_and_read(self):
+        notification = Notification.objects.create(user=self.user, title='알림', message='내용')
+        Notification.objects.create(user=self.user, title='알림 2', message='내용')
+        self.assertEqual(self._count(), 2)
+        notification.mark_as_read()
+        self.assertEqual(self._count(), 1)
+
+    def test_update_from_another_process_is_seen_immediately(self):
+        Notification.objects.create(user=self.user, title='알림', message='내용')
+        self.assertEqual(self._count(), 1)
+        # 워커 프로세스가 카운터만 바꾼 상황 (이 프로세스의 시그널/캐시는 거치지 않음)
+        with connection.cursor() as cursor:
+            cursor.execute('UPDATE wbs_notificationcounter SET unread_count = 4 WHERE user_id = %s', [self.user.pk])
+        self.assertEqual(self._count(), 4)
+
+
+class SyncApiTests(TestCase):
+    """델타 동기화가 로그인/사용자 범위를 지키고 (updated_at, id) 커서로 빠짐없이 이어지는지 확인"""
+
+    def setUp(self):
+        today = date.today()
+        self.user = User.objects.create_user(username='member', password='pw')
+        self.other = User.objects.create_user(username='other', password='pw')
+        self.project = Project.objects.create(
+            title='내 프로젝트', description='설명', manager=self.user, start_date=today, end_date=today + timedelta(days=30),
+        )
+        self.hidden = Project.objects.create(
+            title='남의 프로젝트', description='설명', manager=self.other, start_date=today, end_date=today + timedelta(days=30),
+        )
+        Comment.objects.create(project=self.hidden, author=self.other, content='비공개 댓글')
+        self.past = timezone.now() - timedelta(hours=1)
+
+    def _sync(self, since=None, limit=None):
+        params = {key: value for key, value in (('since', since), ('limit', limit)) if value is not None}
+        response = self.client.get(reverse('wbs:api_sync'), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_requires_login(self):
+        self.assertEqual(self.client.get(reverse('wbs:api_sync')).status_code, 401)
+
+    def test_only_rows_visible_to_the_user(self):
+        self.client.force_login(self.user)
+        Project.objects.update(updated_at=self.past)
+        Comment.objects.update(updated_at=self.past)
+        payload = self._sync()
+        self.assertEqual([row['id'] for row in payload['changes']['projects']], [self.project.pk])
+        self.assertEqual(payload['changes']['comments'], [])
+
+    def test_rows_sharing_a_timestamp_page_past_the_limit(self):
+        self.client.force_login(self.user)
+        comments = [Comment.objects.create(project=self.project, author=self.user, content=f'댓글 {i}') for i in range(5)]
+        Comment.objects.update(updated_at=self.past)
+        received = []
+        payload = self._sync(limit=2)
+        for _ in range(5):
+            received += [row['id'] for row in payload['changes']['comments']]
+            if not payload['has_more']:
+                break
+            payload = self._sync(payload['next_since'], limit=2)
+        self.assertFalse(payload['has_more'])
+        self.assertEqual(received, [comment.pk for comment in comments])
+
+    def _catch_up(self, since):
+        """로그 시각이 워터마크 안에 들도록 지연 없이 다음 동기화"""
+        with self.settings(SYNC_SAFETY_LAG_SECONDS=0):
+            return self._sync(since)
+
+    def test_access_granted_to_existing_rows_is_synced(self):
+        self.client.force_login(self.user)
+        Project.objects.update(updated_at=self.past)
+        Comment.objects.update(updated_at=self.past)
+        event = Event.objects.create(title='기존 회의', creator=self.other, start_date=date.today(), end_date=date.today())
+        Event.objects.update(updated_at=self.past)
+        since = self._sync()['next_since']
+
+        # 이미 커서보다 오래된 행: updated_at 은 바뀌지 않는다
+        self.hidden.team_members.add(self.user)
+        event.attendees.add(self.user)
+        payload = self._catch_up(since)
+        self.assertIn(self.hidden.pk, [row['id'] for row in payload['changes']['projects']])
+        self.assertEqual([row['content'] for row in payload['changes']['comments']], ['비공개 댓글'])
+        self.assertEqual([row['id'] for row in payload['changes']['events']], [event.pk])
+
+    def test_access_revoked_sends_tombstones(self):
+        self.client.force_login(self.user)
+        self.hidden.team_members.add(self.user)
+        event = Event.objects.create(title='기존 회의', creator=self.other, start_date=date.today(), end_date=date.today())
+        event.attendees.add(self.user)
+        since = self._catch_up(None)['next_since']
+
+        self.hidden.team_members.remove(self.user)
+        self.user.attending_events.clear()
+        payload = self._catch_up(since)
+        comment = Comment.objects.get(project=self.hidden)
+        self.assertEqual(payload['deleted']['projects'], [self.hidden.pk])
+        self.assertEqual(payload['deleted']['comments'], [comment.pk])
+        self.assertEqual(payload['deleted']['events'], [event.pk])
+        self.assertNotIn(self.hidden.pk, [row['id'] for row in payload['changes']['projects']])
+
+    @override_settings(SYNC_SAFETY_LAG_SECONDS=60)
+    def test_rows_newer_than_the_safety_lag_wait_for_the_next_sync(self):
+        self.client.force_login(self.user)
+        Project.objects.update(updated_at=self.past)
+        payload = self._sync()
+        # 방금 저장된(아직 커밋 중일 수 있는) 행은 이번 워터마크 뒤
+        comment = Comment.objects.create(project=self.project, author=self.user, content='방금 쓴 댓글')
+        Comment.objects.filter(pk=comment.pk).update(updated_at=timezone.now() - timedelta(seconds=10))
+        payload = self._sync(payload['next_since'])
+        self.assertEqual(payload['changes']['comments'], [])
+        with self.settings(SYNC_SAFETY_LAG_SECONDS=0):
+            payload = self._sync(payload['next_since'])
+        self.assertEqual([row['id'] for row in payload['changes']['comments']], [comment.pk])
+
+
+class EventConflictTests(TestCase):
+    """참석자 일정이 겹치면 저장하기 전에 경고하고, 확인을 받은 뒤에만 저장하는지 확인"""
+
+    def setUp(self):
+        self.day = date(2026, 5, 6)
+        self.user = User.objects.create_user(username='organizer', password='pw')
+        self.attendee = User.objects.create_user(username='busy', password='pw')
+        Event.objects.create(
+            title='기존 회의', creator=self.attendee, start_date=self.day, end_date=self.day,
+            start_time='10:00', end_time='11:00',
+        )
+        self.client.force_login(self.user)
+
+    def _post(self, **extra):
+        data = {
+            'title': '새 회의', 'event_type': 'meeting', 'priority': 'medium',
+            'start_date': self.day.isoformat(), 'end_date': self.day.isoformat(),
+            'start_time': '10:30', 'end_time': '11:30', 'reminder_minutes': 15,
+            'attendees': [self.attendee.pk], **extra,
+        }
+        return self.client.post(reverse('wbs:event_create'), data)
+
+    def test_conflict_is_shown_before_saving(self):
+        response = self._post()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('busy(1건)', response.context['conflicts'])
+        self.assertFalse(Event.objects.filter(title='새 회의').exists())
+
+    def test_confirmed_conflict_is_saved(self):
+        response = self._post(confirm_conflicts='1')
+        event = Event.objects.get(title='새 회의')
+        self.assertRedirects(response, reverse('wbs:event_detail', args=[event.pk]), fetch_redirect_response=False)
+        self.assertEqual(list(event.attendees.all()), [self.attendee])
+
+
+class TimelinePlaceTests(TestCase):
+    """구간 밖 행의 막대 좌표가 기존 플래너 계산과 같은지 확인"""
+
+    def setUp(self):
+        # 2026-03-02(월) ~ 03-08(일), 하루 100px
+        self.timeline = Timeline.for_zoom(date(2026, 3, 4), 'week')
+
+    def test_rows_outside_the_window(self):
+        before, inside, after = self.timeline.place([
+            (date(2026, 2, 20), date(2026, 2, 25)),
+            (date(2026, 3, 1), date(2026, 3, 10)),
+            (date(2026, 3, 12), date(2026, 3, 14)),
+        ], skip_outside=False)
+        self.assertEqual(before, {'left': 0, 'width': 100, 'grid_col_start': 1, 'grid_span': 1})
+        self.assertEqual(inside, {'left': 0, 'width': 700, 'grid_col_start': 1, 'grid_span': 7})
+        # 구간 뒤에 시작하는 행은 마지막 날에 붙이지 않고 그리드 밖에 둔다
+        self.assertEqual(after, {'left': 1000, 'width': 100, 'grid_col_start': 11, 'grid_span': 1})
+
+    def test_skip_outside(self):
+        self.assertEqual(self.timeline.place([(date(2026, 3, 12), date(2026, 3, 14))]), [None])
+
+
+class ProjectPlannerNavigationTests(TestCase):
+    """명시 구간(start~end)의 이전/다음 이동이 구간 길이를 유지하는지 확인"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='planner', password='pw')
+        self.project = Project.objects.create(
+            title='프로젝트', description='설명', manager=self.user,
+            start_date=date(2026, 1, 1), end_date=date(2026, 12, 31),
+        )
+        self.client.force_login(self.user)
+
+    def test_explicit_range_keeps_its_length(self):
+        params = {'start': '2026-03-02', 'end': '2026-03-11'}
+        data = self.client.get(reverse('wbs:project_planner_data', args=[self.project.pk]), params).json()
+        self.assertEqual((data['prev_start'], data['prev_end']), ('2026-02-20', '2026-03-01'))
+        self.assertEqual((data['next_start'], data['next_end']), ('2026-03-12', '2026-03-21'))
+
+        response = self.client.get(reverse('wbs:project_planner', args=[self.project.pk]), params)
+        self.assertContains(response, 'start=2026-03-12&end=2026-03-21')
+
+        following = self.client.get(
+            reverse('wbs:project_planner_data', args=[self.project.pk]),
+            {'start': data['next_start'], 'end': data['next_end']},
+        ).json()
+        self.assertEqual(following['day_count'], 10)
+
+    def test_zoom_range_links_only_carry_start(self):
+        data = self.client.get(
+            reverse('wbs:project_planner_data', args=[self.project.pk]), {'mode': 'month', 'start': '2026-03-15'},
+        ).json()
+        self.assertEqual((data['next_start'], data['next_end']), ('2026-04-01', None))
+
+
+class MembershipCascadeTests(TestCase):
+    """단계가 있는 프로젝트/매니저 삭제가 참여 색인 때문에 실패하지 않는지 확인"""
+
+    def setUp(self):
+        today = date.today()
+        self.manager = User.objects.create_user(username='manager', password='pw')
+        self.assignee = User.objects.create_user(username='assignee', password='pw')
+        self.project = Project.objects.create(
+            title='프로젝트', description='설명', manager=self.manager, start_date=today, end_date=today,
+        )
+        for i in range(2):
+            phase = ProjectPhase.objects.create(
+                project=self.project, title=f'단계 {i}', description='내용', start_date=today, end_date=today,
+            )
+            phase.assignees.add(self.assignee)
+
+    def test_delete_project_with_phases(self):
+        self.project.delete()
+        self.assertFalse(ProjectMembership.objects.exists())
+
+    def test_delete_manager_with_projects(self):
+        self.manager.delete()
+        self.assertFalse(Project.objects.exists())
+        self.assertFalse(ProjectMembership.objects.exists())
+
+    def test_deleting_last_phase_of_an_assignee_drops_the_membership(self):
+        phases = list(self.project.phases.all())
+        phases[0].delete()
+        self.assertTrue(ProjectMembership.objects.filter(user=self.assignee, role='assignee').exists())
+        phases[1].delete()
+        self.assertFalse(ProjectMembership.objects.filter(user=self.assignee, role='assignee').exists())
+
+
+class SearchTests(TestCase):
+    """기본 검색이 기존 부분 문자열 검색만큼 찾고, 권한 필터가 후보 단계에서 적용되는지 확인"""
+
+    def setUp(self):
+        today = date.today()
+        self.user = User.objects.create_user(username='member', password='pw')
+        self.other = User.objects.create_user(username='other', password='pw')
+        self.today = today
+        for title in ('프로젝트관리 시스템', 'WBSproject alpha'):
+            Project.objects.create(title=title, description='', manager=self.other, start_date=today, end_date=today)
+
+    def _titles(self, source, query, **kwargs):
+        return sorted(obj.title for obj in search_source(self.user, source, query, **kwargs))
+
+    def test_default_backend_matches_inside_words(self):
+        self.assertEqual(self._titles('project', '관리'), ['프로젝트관리 시스템'])
+        self.assertEqual(self._titles('project', 'project'), ['WBSproject alpha'])
+
+    def test_own_events_are_not_crowded_out_by_hidden_ones(self):
+        Event.objects.create(title='주간 회의 (내 일정)', creator=self.user, start_date=self.today, end_date=self.today)
+        for i in range(20):
+            Event.objects.create(title=f'주간 회의 {i}', creator=self.other, start_date=self.today, end_date=self.today)
+        backends = [None]
+        if connection.vendor == 'sqlite':
+            backends.append(SQLiteFTSBackend())
+        for backend in backends:
+            self.assertEqual(self._titles('event', '회의', limit=1, backend=backend), ['주간 회의 (내 일정)'])
+
+
+class NgramSearchTests(TestCase):
+    """n-gram 색인: 포스팅 압축, 색인 이후 바뀐 문서(델타), 알림 소유자 제한"""
+
+    def setUp(self):
+        self.today = date.today()
+        self.user = User.objects.create_user(username='member', password='pw')
+        self.other = User.objects.create_user(username='other', password='pw')
+
+    def _project(self, title):
+        return Project.objects.create(title=title, description='', manager=self.other, start_date=self.today, end_date=self.today)
+
+    def _titles(self, source, query):
+        return sorted(obj.title for obj in search_source(self.user, source, query, backend=NgramSearchBackend()))
+
+    def test_is_the_default_backend(self):
+        self.assertIsInstance(get_backend(), NgramSearchBackend)
+
+    def test_postings_round_trip(self):
+        for ids in ([], [1], [1, 2, 3, 10, 11], [7, 1000, 70000, 2 ** 31]):
+            self.assertEqual(decode_postings(encode_postings(ids)), ids)
+        # 연속된 id 는 차분이 1 이라 잘 압축된다
+        self.assertLess(len(encode_postings(list(range(1, 10001)))), 200)
+
+    def test_changes_after_the_segment_are_searched_as_delta(self):
+        renamed = self._project('프로젝트관리 시스템')
+        self._project('결제 모듈')
+        build_segment()
+        self.assertEqual(self._titles('project', '관리'), ['프로젝트관리 시스템'])
+
+        self._project('일정관리 도구')
+        renamed.title = '정산 시스템'
+        renamed.save()
+        # 색인에는 옛 제목이 남아 있지만 델타의 현재 제목으로 판정한다
+        self.assertEqual(self._titles('project', '관리'), ['일정관리 도구'])
+        self.assertEqual(self._titles('project', '정산'), ['정산 시스템'])
+
+    def test_notifications_are_limited_to_their_owner(self):
+        for user in (self.user, self.other):
+            Notification.objects.create(user=user, title='마감 임박', message=f'{user.username} 의 작업', notification_type='system')
+        build_segment()
+        Notification.objects.create(user=self.other, title='마감 임박 (추가)', message='새 알림', notification_type='system')
+        found = search_source(self.user, 'notification', '마감', backend=NgramSearchBackend())
+        self.assertEqual([notification.user_id for notification in found], [self.user.pk])
+        ranked = NgramSearchBackend().search('notification', ['마감'], 10, owner_id=self.other.pk)
+        self.assertEqual(len(ranked), 2)
+
+
+@unittest.skipUnless(importlib.util.find_spec('rest_framework'), 'djangorestframework 가 설치되어 있지 않음')
+class CalendarApiQueryCountTests(TestCase):
+    """월간 캘린더 API 의 쿼리 수가 프로젝트/팀원 수와 무관한지 확인"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='viewer', password='pw')
+        self.members = [User.objects.create_user(username=f'member{i}', password='pw') for i in range(3)]
+
+    def _add_projects(self, count):
+        for i in range(count):
+            project = Project.objects.create(
+                title=f'프로젝트 {i}', description='설명', manager=self.user,
+                start_date=date(2026, 3, 1 + i), end_date=date(2026, 3, 10 + i),
+            )
+            project.team_members.add(*self.members)
+
+    def _count_queries(self):
+        from rest_framework.test import APIRequestFactory, force_authenticate
+        from .api_views import CalendarViewSet
+
+        request = APIRequestFactory().get('/api/calendar/', {'year': 2026, 'month': 3})
+        force_authenticate(request, user=self.user)
+        with CaptureQueriesContext(connection) as ctx:
+            response = CalendarViewSet.as_view({'get': 'list'})(request)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_team_members_are_prefetched(self):
+        self._add_projects(1)
+        small = self._count_queries()
+        self._add_projects(5)
+        self.assertEqual(self._count_queries(), small)
+
+
+class DateIntervalIndexTests(SimpleTestCase):
+    """스윕 방식 날짜 인덱스가 날짜마다 전체를 훑는 단순 계산과 같은 결과를 내는지 확인"""
+
+    def _spans(self, seed, count=200):
+        rng = random.Random(seed)
+        base = date(2026, 1, 1)
+        spans = []
+        for i in range(count):
+            start = base + timedelta(days=rng.randrange(90))
+            spans.append(SimpleNamespace(id=i, start_date=start, end_date=start + timedelta(days=rng.randrange(20))))
+        return spans
+
+    def test_bucket_by_day_matches_day_by_day_scan(self):
+        for seed in range(5):
+            spans = self._spans(seed)
+            first, last = date(2026, 2, 1), date(2026, 2, 28)
+            # 기존 달력 구성: 날짜마다 전체 목록을 훑고 시작일 순(같으면 입력 순)으로
+            ordered = sorted(spans, key=lambda span: span.start_date)
+            expected = {}
+            day = first
+            while day <= last:
+                hits = [span.id for span in ordered if span.start_date <= day <= span.end_date]
+                if hits:
+                    expected[day] = hits
+                day += timedelta(days=1)
+            buckets = DateIntervalIndex(spans).bucket_by_day(first, last)
+            self.assertEqual({day: [span.id for span in items] for day, items in buckets.items()}, expected)
+
+    def test_overlapping(self):
+        spans = self._spans(7)
+        first, last = date(2026, 2, 10), date(2026, 2, 12)
+        expected = sorted(
+            (span for span in spans if span.start_date <= last and span.end_date >= first),
+            key=lambda span: span.start_date,
+        )
+        self.assertEqual(DateIntervalIndex(spans).overlapping(first, last), expected)
+
+    def test_empty_and_reversed_ranges(self):
+        index = DateIntervalIndex(self._spans(1, count=5))
+        self.assertEqual(index.bucket_by_day(date(2026, 3, 2), date(2026, 3, 1)), {})
+        self.assertEqual(DateIntervalIndex([]).bucket_by_day(date(2026, 1, 1), date(2026, 1, 31)), {})
+
+
+class DashboardStatsTests(TestCase):
+    """대시보드 집계 한 번이 모델별 COUNT 와 같고, 캐시가 변경 시 무효화되는지 확인"""
+
+    def setUp(self):
+        cache.clear()
+        self.today = timezone.localdate()
+        self.manager = User.objects.create_user(username='manager', password='pw')
+        first = self.today.replace(day=1)
+        for i, status in enumerate(['planning', 'in_progress', 'in_progress', 'completed']):
+            project = Project.objects.create(
+                title=f'프로젝트 {i}', description='설명', manager=self.manager, status=status,
+                # 두 개는 이번 달 시작, 두 개는 지난달 시작
+                start_date=first - timedelta(days=40 * (i % 2)), end_date=first + timedelta(days=60),
+            )
+            for j in range(i):
+                Comment.objects.create(project=project, author=self.manager, content=f'댓글 {j}')
+
+    def test_counters_match_separate_counts(self):
+        stats = compute_dashboard_stats(self.today)
+        in_month = Project.objects.filter(start_date__year=self.today.year, start_date__month=self.today.month)
+        self.assertEqual(
+            {key: stats[key] for key in ('total_projects', 'active_projects', 'completed_projects', 'monthly_project_count', 'total_comments')},
+            {
+                'total_projects': Project.objects.count(),
+                'active_projects': Project.objects.filter(status='in_progress').count(),
+                'completed_projects': Project.objects.filter(status='completed').count(),
+                'monthly_project_count': in_month.count(),
+                'total_comments': Comment.objects.count(),
+            },
+        )
+        self.assertEqual((stats['total_projects'], stats['monthly_project_count'], stats['total_comments']), (4, 2, 6))
+
+    def test_cache_hits_and_invalidation(self):
+        get_dashboard_stats()
+        self.assertEqual(get_dashboard_stats()['total_comments'], 6)
+        self.assertEqual(get_cache_counters(), {'hits': 1, 'misses': 1, 'hit_rate': 0.5})
+
+        Comment.objects.create(project=Project.objects.first(), author=self.manager, content='새 댓글')
+        self.assertEqual(get_dashboard_stats()['total_comments'], 7)
+        self.assertEqual(get_cache_counters()['misses'], 2)
+
+
+class KeysetPaginationTests(TestCase):
+    """(created_at, id) 커서 페이지가 같은 시각의 행도 빠짐/중복 없이 이어지는지 확인"""
+
+    def setUp(self):
+        self.manager = User.objects.create_user(username='manager', password='pw')
+        today = date(2026, 3, 2)
+        self.projects = [
+            Project.objects.create(title=f'프로젝트 {i}', description='설명', manager=self.manager, start_date=today, end_date=today)
+            for i in range(7)
+        ]
+        # 7건 중 5건이 같은 created_at
+        same = timezone.now() - timedelta(days=1)
+        Project.objects.filter(pk__in=[p.pk for p in self.projects[:5]]).update(created_at=same)
+
+    def _pages(self, limit, **params):
+        ids, cursor = [], None
+        while True:
+            query = {'limit': limit, **params, **({'cursor': cursor} if cursor else {})}
+            data = self.client.get(reverse('wbs:api_projects'), query).json()
+            ids.append([row['id'] for row in data['projects']])
+            cursor = data['next_cursor']
+            if not cursor:
+                return ids
+
+    def test_pages_cover_every_row_once_in_order(self):
+        pages = self._pages(2)
+        expected = list(Project.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual([pk for page in pages for pk in page], expected)
+        self.assertEqual([len(page) for page in pages], [2, 2, 2, 1])
+
+    def test_rows_inserted_meanwhile_do_not_shift_pages(self):
+        first, cursor = keyset_page(Project.objects.all(), limit=3)
+        Project.objects.create(title='새 프로젝트', description='설명', manager=self.manager, start_date=date(2026, 3, 2), end_date=date(2026, 3, 2))
+        rest, _ = keyset_page(Project.objects.all(), cursor, limit=10)
+        self.assertEqual(len(first) + len(rest), 7)
+        self.assertFalse({p.pk for p in first} & {p.pk for p in rest})
+
+    def test_fields_and_limit(self):
+        data = self.client.get(reverse('wbs:api_projects'), {'fields': 'title', 'limit': 1}).json()
+        self.assertEqual(set(data['projects'][0]), {'id', 'title'})
+        self.assertEqual(parse_limit('1000'), 200)
+        self.assertEqual(parse_limit('0'), 1)
+        with self.assertRaises(PaginationError):
+            parse_fields('title,password', {'id': None, 'title': None})
+
+    def test_cursor_round_trip_and_bad_cursor(self):
+        timestamp = timezone.now()
+        self.assertEqual(decode_cursor(encode_cursor(timestamp, 42)), (timestamp, 42))
+        response = self.client.get(reverse('wbs:api_projects'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 400)
+
+
+class BulkNotifyTests(TestCase):
+    """대량 발송이 사용자 수와 무관한 쿼리 수로 알림/카운터/검색 문서를 만들고 중복을 건너뛰는지 확인"""
+
+    def setUp(self):
+        self.users = User.objects.bulk_create([User(username=f'user{i}') for i in range(30)])
+        # 절반은 카운터 행이 이미 있음
+        for user in self.users[:15]:
+            get_unread_count_for(user.pk)
+
+    def _dispatch(self, users, **kwargs):
+        with CaptureQueriesContext(connection) as ctx:
+            created = dispatch_notifications([user.pk for user in users], '공지', '내용', **kwargs)
+        return created, len(ctx.captured_queries)
+
+    def test_query_count_does_not_grow_with_recipients(self):
+        _, few = self._dispatch(self.users[:2] + self.users[15:17])
+        _, many = self._dispatch(self.users[2:15] + self.users[17:])
+        self.assertEqual(few, many)
+
+    def test_counters_search_entries_and_dedupe(self):
+        created, _ = self._dispatch(self.users)
+        self.assertEqual(created, 30)
+        self.assertEqual({get_unread_count_for(user.pk) for user in self.users}, {1})
+        self.assertEqual(NotificationCounter.objects.filter(unread_count=1).count(), 30)
+        self.assertEqual(SearchEntry.objects.filter(source='notification').count(), 30)
+
+        # 같은 알림은 dedupe 구간 안에서 다시 보내지 않는다
+        created, _ = self._dispatch(self.users)
+        self.assertEqual(created, 0)
+        created, _ = self._dispatch(self.users[:3], dedupe_window=None)
+        self.assertEqual(created, 3)
+        self.assertEqual(get_unread_count_for(self.users[0].pk), 2)
+
+    def test_project_members_exclude_sender(self):
+        manager, member, outsider = self.users[:3]
+        project = Project.objects.create(
+            title='프로젝트', description='설명', manager=manager, start_date=date(2026, 3, 2), end_date=date(2026, 3, 31),
+        )
+        project.team_members.add(member)
+        self.assertEqual(notify_project_members(project, '변경', '내용', exclude=manager), 1)
+        self.assertEqual(list(Notification.objects.filter(project=project).values_list('user_id', flat=True)), [member.pk])
+
+
+class NotificationArchiveTests(TestCase):
+    """보관 기간이 지난 읽은 알림만 배치로 옮기고, 미읽음/최근 알림과 카운터는 그대로 두는지 확인"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='reader', password='pw')
+        old = timezone.now() - timedelta(days=100)
+        self.expired = []
+        for i in range(5):
+            notification = Notification.objects.create(user=self.user, title=f'지난 알림 {i}', message='내용')
+            notification.mark_as_read()
+            self.expired.append(notification.pk)
+        self.old_unread = Notification.objects.create(user=self.user, title='안 읽은 지난 알림', message='내용').pk
+        Notification.objects.filter(pk__in=self.expired + [self.old_unread]).update(created_at=old)
+        recent = Notification.objects.create(user=self.user, title='최근 알림', message='내용')
+        recent.mark_as_read()
+        self.recent = recent.pk
+
+    def test_moves_only_expired_read_notifications(self):
+        self.assertEqual(archive_read_notifications(90, dry_run=True), 5)
+        self.assertEqual(archive_read_notifications(90, batch_size=2), 5)
+        self.assertEqual(sorted(NotificationArchive.objects.values_list('id', flat=True)), self.expired)
+        self.assertEqual(
+            sorted(Notification.objects.values_list('id', flat=True)), sorted([self.old_unread, self.recent]),
+        )
+        self.assertEqual(get_unread_count_for(self.user.pk), 1)
+        # 다시 실행해도 옮길 것이 없다
+        self.assertEqual(archive_read_notifications(90), 0)
+
+    def test_retention_setting(self):
+        with self.settings(NOTIFICATION_READ_RETENTION_DAYS=200):
+            self.assertEqual(archive_read_notifications(), 0)
+        self.assertEqual(archive_read_notifications(), 5)
+
+
+class AdCounterTests(TestCase):
+    """광고 카운터 버퍼: flush 가 가져간 만큼만 반영하고, 겹친 flush/DB 오류 시 버퍼를 되돌리는지 확인"""
+
+    def setUp(self):
+        self.cache = ad_counters.counter_cache()
+        self.cache.clear()
+        # 기록할 때 자동 flush 가 돌지 않도록 잠금을 미리 잡아 둔다
+        self.cache.add(ad_counters.FLUSH_LOCK_KEY, 1, timeout=None)
+        now = timezone.now()
+        self.ads = [
+            AdCampaign.objects.create(
+                title=f'광고 {i}', description='설명', target_url='https://example.com',
+                start_date=now, end_date=now + timedelta(days=7), max_impressions=5,
+            )
+            for i in range(2)
+        ]
+        self.ids = [ad.pk for ad in self.ads]
+
+    def tearDown(self):
+        self.cache.clear()
+
+    def _impressions(self):
+        return list(AdCampaign.objects.filter(pk__in=self.ids).order_by('pk').values_list('current_impressions', flat=True))
+
+    def test_flush_applies_buffer_up_to_the_maximum(self):
+        for _ in range(3):
+            ad_counters.record_impressions(self.ids)
+        ad_counters.record_impressions(self.ids[:1])
+        ad_counters.record_click(self.ids[1])
+        self.assertEqual(ad_counters.pending_counts('impressions', self.ids), {self.ids[0]: 4, self.ids[1]: 3})
+
+        self.assertEqual(ad_counters.flush_ad_counters(self.ids), {'impressions': 7, 'clicks': 1})
+        self.assertEqual(self._impressions(), [4, 3])
+        self.assertEqual(ad_counters.pending_counts('impressions', self.ids), {})
+
+        for _ in range(3):
+            ad_counters.record_impressions(self.ids[:1])
+        ad_counters.flush_ad_counters(self.ids)
+        self.assertEqual(self._impressions(), [5, 3])
+
+    def test_claim_skips_what_another_flush_already_took(self):
+        ad_counters.record_impressions(self.ids)
+        ad_counters.record_impressions(self.ids[:1])
+        pending = ad_counters.pending_counts('impressions', self.ids)
+        # 다른 flush 가 두 번째 광고의 버퍼를 먼저 가져감
+        self.assertEqual(ad_counters._claim('impressions', {self.ids[1]: 1}), {self.ids[1]: 1})
+        claimed = ad_counters._claim('impressions', pending)
+        self.assertEqual(claimed, {self.ids[0]: 2})
+        # 음수가 된 버퍼는 되돌려 놓는다
+        self.assertEqual(self.cache.get(ad_counters._pending_key('impressions', self.ids[1])), 0)
+
+        ad_counters._unclaim('impressions', claimed)
+        self.assertEqual(ad_counters.pending_counts('impressions', self.ids), {self.ids[0]: 2})
+
+    def test_database_error_returns_the_claim_to_the_buffer(self):
+        ad_counters.record_impressions(self.ids)
+        with mock.patch.object(ad_counters.AdCampaign.objects, 'filter', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                ad_counters.flush_ad_counters(self.ids)
+        self.assertEqual(ad_counters.pending_counts('impressions', self.ids), {self.ids[0]: 1, self.ids[1]: 1})
+        ad_counters.flush_ad_counters(self.ids)
+        self.assertEqual(self._impressions(), [1, 1])
+
+
+class AdSelectionTests(TestCase):
+    """광고 후보 필터/캐시와 남은 노출 예산 가중 추출 확인"""
+
+    def setUp(self):
+        cache.clear()
+        ad_counters.counter_cache().clear()
+        ad_counters.counter_cache().add(ad_counters.FLUSH_LOCK_KEY, 1, timeout=None)
+        self.now = timezone.now()
+
+    def tearDown(self):
+        ad_counters.counter_cache().clear()
+
+    def _ad(self, title, **kwargs):
+        fields = {
+            'description': '설명', 'target_url': 'https://example.com', 'status': 'active', 'position': 'sidebar',
+            'start_date': self.now - timedelta(days=1), 'end_date': self.now + timedelta(days=1),
+            **kwargs,
+        }
+        return AdCampaign.objects.create(title=title, **fields)
+
+    def _titles(self, **kwargs):
+        return sorted(ad.title for ad in select_ads(count=10, **kwargs))
+
+    def test_only_running_matching_campaigns_are_candidates(self):
+        self._ad('실행 중')
+        self._ad('헤더', position='header')
+        self._ad('초안', status='draft')
+        self._ad('종료', end_date=self.now - timedelta(hours=1))
+        self._ad('소진', max_impressions=10, current_impressions=10)
+        self._ad('프로젝트 페이지', target_pages=['/projects/'])
+        premium = SubscriptionPlan.objects.create(name='premium', display_name='프리미엄', price=0)
+        self._ad('프리미엄 대상').target_plans.add(premium)
+
+        self.assertEqual(self._titles(), ['실행 중'])
+        self.assertEqual(self._titles(path='/projects/3/'), ['실행 중', '프로젝트 페이지'])
+        self.assertEqual(self._titles(plan_name='premium'), ['실행 중', '프리미엄 대상'])
+
+    def test_candidates_are_cached_until_a_campaign_changes(self):
+        ad = self._ad('광고')
+        running_campaigns('sidebar')
+        with self.assertNumQueries(0):
+            self.assertEqual([c.pk for c in running_campaigns('sidebar')], [ad.pk])
+        ad.status = 'paused'
+        ad.save()
+        self.assertEqual(running_campaigns('sidebar'), [])
+
+    def test_pending_impressions_use_up_the_budget(self):
+        full = self._ad('곧 소진', max_impressions=3)
+        self._ad('여유', max_impressions=100)
+        ad_counters.record_impressions([full.pk] * 3)
+        self.assertEqual(self._titles(), ['여유'])
+
+    def test_weighted_sample(self):
+        rng = random.Random(5)
+        items = ['a', 'b', 'c']
+        picks = [weighted_sample(items, [1, 9, 0], 1, rng)[0] for _ in range(2000)]
+        self.assertNotIn('c', picks)
+        self.assertAlmostEqual(picks.count('b') / len(picks), 0.9, delta=0.03)
+        # 비복원 추출: 중복 없이 가중치가 있는 것만
+        self.assertEqual(sorted(weighted_sample(items, [1, 9, 0], 5, rng)), ['a', 'b'])
+
+
+class AutocompleteTests(TestCase):
+    """접두사 색인: 앞부분 일치 우선, 중간 단어 일치, 권한(일정/사용자) 적용 확인"""
+
+    def setUp(self):
+        self.staff = User.objects.create_user(username='admin', password='pw', is_staff=True)
+        self.user = User.objects.create_user(username='kim', password='pw', first_name='결제', last_name='담당')
+        today = date(2026, 3, 2)
+        for title in ('결제 시스템 개편', '시스템 점검', 'Payment Gateway'):
+            Project.objects.create(title=title, description='', manager=self.staff, start_date=today, end_date=today)
+        Event.objects.create(title='결제 회의', creator=self.staff, start_date=today, end_date=today)
+        self.index = autocomplete.build_index()
+
+    def _labels(self, prefix, user, limit=autocomplete.DEFAULT_LIMIT):
+        return [label for _, _, label in self.index.lookup(prefix, user, limit)]
+
+    def test_start_matches_come_before_word_matches(self):
+        self.assertEqual(self._labels('시스템', self.user), ['시스템 점검', '결제 시스템 개편'])
+        self.assertEqual(self._labels('PAY', self.user), ['Payment Gateway'])
+        self.assertEqual(self._labels('시스템', self.user, limit=1), ['시스템 점검'])
+        self.assertEqual(self._labels('  ', self.user), [])
+
+    def test_events_and_users_respect_visibility(self):
+        self.assertEqual(self._labels('결제', self.user), ['결제 시스템 개편'])
+        # 일정은 생성자/참석자만, 사용자는 관리자만 (이름 순으로 앞부분 일치)
+        self.assertEqual(
+            self._labels('결제', self.staff),
+            ['kim (결제 담당)', '결제 시스템 개편', '결제 회의 (2026-03-02)'],
+        )
+
+    def test_view_answers_from_memory(self):
+        autocomplete._index = None
+        self.client.force_login(self.user)
+        url = reverse('wbs:search_autocomplete')
+        self.client.get(url, {'q': '시스'})
+        with CaptureQueriesContext(connection) as ctx:
+            data = self.client.get(url, {'q': '시스'}).json()
+        self.assertEqual([row['label'] for row in data['results']], ['시스템 점검', '결제 시스템 개편'])
+        self.assertFalse([q for q in ctx.captured_queries if 'wbs_project' in q['sql']])
+        autocomplete._index = None
+
+
+class RecurrenceTests(TestCase):
+    """반복 규칙의 구간 회차가 첫 회차부터 모두 만드는 단순 계산과 같은지, window_q/expand_events 확인"""
+
+    def _rule(self, **kwargs):
+        fields = {
+            'start_date': date(2026, 1, 31), 'end_date': date(2026, 2, 1), 'recurrence_freq': 'weekly',
+            'recurrence_interval': 1, 'recurrence_count': None, 'recurrence_until': None, 'recurrence_exceptions': [],
+            **kwargs,
+        }
+        return RecurrenceRule(SimpleNamespace(**fields))
+
+    def _naive(self, rule, window_start, window_end):
+        spans = []
+        for index in range(2000):
+            start = rule.nth_start(index)
+            if start > window_end or not rule._in_series(index, start):
+                break
+            end = start + rule.duration
+            if end >= window_start and start not in rule.exceptions:
+                spans.append((start, end))
+        return spans
+
+    def test_window_matches_full_expansion(self):
+        rng = random.Random(22)
+        for freq in ('daily', 'weekly', 'monthly'):
+            for _ in range(30):
+                rule = self._rule(
+                    recurrence_freq=freq,
+                    recurrence_interval=rng.randint(1, 3),
+                    recurrence_count=rng.choice([None, rng.randint(1, 40)]),
+                    recurrence_until=rng.choice([None, date(2026, 1, 31) + timedelta(days=rng.randrange(400))]),
+                    recurrence_exceptions=['2026-02-07', '2026-03-31'],
+                )
+                window_start = date(2026, 1, 1) + timedelta(days=rng.randrange(400))
+                window_end = window_start + timedelta(days=rng.randrange(60))
+                self.assertEqual(list(rule.occurrences(window_start, window_end)), self._naive(rule, window_start, window_end))
+
+    def test_monthly_on_the_31st_clamps_to_month_end(self):
+        rule = self._rule(recurrence_freq='monthly', end_date=date(2026, 1, 31), recurrence_count=4)
+        self.assertEqual(
+            [start for start, _ in rule.occurrences(date(2026, 1, 1), date(2026, 12, 31))],
+            [date(2026, 1, 31), date(2026, 2, 28), date(2026, 3, 31), date(2026, 4, 30)],
+        )
+        self.assertEqual(add_months(date(2024, 1, 31), 1), date(2024, 2, 29))
+        self.assertEqual(rule.last_end(), date(2026, 4, 30))
+
+    def test_window_q_and_expand_events(self):
+        cache.clear()
+        user = User.objects.create_user(username='owner', password='pw')
+        common = {'creator': user, 'start_date': date(2026, 3, 2), 'end_date': date(2026, 3, 2)}
+        weekly = Event.objects.create(title='주간 회의', is_recurring=True, recurrence_freq='weekly', **common)
+        Event.objects.create(title='끝난 반복', is_recurring=True, recurrence_freq='daily', recurrence_count=3, **common)
+        Event.objects.create(title='단발', **common)
+
+        start, end = date(2026, 4, 1), date(2026, 4, 30)
+        events = Event.objects.filter(window_q(start, end)).order_by('id')
+        self.assertEqual([event.title for event in events], ['주간 회의'])
+        occurrences = expand_events(events, start, end)
+        self.assertEqual([item.start_date for item in occurrences], [date(2026, 4, d) for d in (6, 13, 20, 27)])
+        self.assertTrue(all(item.is_occurrence and item.title == '주간 회의' for item in occurrences))
+
+        # 수정하면 캐시 키(수정 시각)가 바뀌어 다시 계산된다
+        weekly.recurrence_exceptions = ['2026-04-13']
+        weekly.save()
+        occurrences = expand_events(Event.objects.filter(pk=weekly.pk), start, end)
+        self.assertEqual([item.start_date for item in occurrences], [date(2026, 4, d) for d in (6, 20, 27)])
+
+
+class ReminderSchedulerTests(TestCase):
+    """힙 스케줄러가 refresh/extend 를 거쳐도 회차마다 한 번만 알림을 보내는지 확인"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner', password='pw')
+        self.now = timezone.make_aware(datetime(2026, 3, 2, 8, 0))
+        # 매일 09:00, 30분 전 알림 → 매일 08:30
+        self.event = Event.objects.create(
+            title='데일리 스탠드업', creator=self.user, start_date=date(2026, 3, 2), end_date=date(2026, 3, 2),
+            start_time=time(9, 0), reminder_minutes=30, is_recurring=True, recurrence_freq='daily',
+        )
+
+    def _run(self, scheduler, until, on_step=None, step=timedelta(minutes=10)):
+        """until 까지 step 간격으로 워커 루프를 흉내 낸다 (refresh → extend → pop_due → 발송)
+
+        반환값: 힙에서 꺼낸 (시각, 회차 날짜) 목록 (발송 기록으로 거르기 전)
+        """
+        fired = []
+        now = self.now
+        while now <= until:
+            if on_step:
+                on_step(now)
+            scheduler.refresh(now)
+            scheduler.extend(now)
+            due = scheduler.pop_due(now)
+            fired.extend((now, day) for _, day in due)
+            send_reminders(due)
+            now += step
+        return fired
+
+    def test_each_occurrence_fires_once_across_extends(self):
+        scheduler = ReminderScheduler(horizon=timedelta(hours=6))
+        scheduler.load(self.now)
+        fired = self._run(scheduler, self.now + timedelta(days=3))
+        self.assertEqual(fired, [(self.now + timedelta(days=d, minutes=30), date(2026, 3, 2 + d)) for d in range(3)])
+        self.assertEqual(
+            list(EventReminder.objects.order_by('occurrence_date').values_list('occurrence_date', flat=True)),
+            [date(2026, 3, 2), date(2026, 3, 3), date(2026, 3, 4)],
+        )
+        self.assertEqual(Notification.objects.filter(notification_type='reminder').count(), 3)
+
+    def test_edits_invalidate_queued_entries(self):
+        scheduler = ReminderScheduler(horizon=timedelta(hours=6))
+        scheduler.load(self.now)
+
+        def edit(now):
+            # 08:10: 오늘 회차를 10:00 로 미룬다 → 08:30 항목은 버려지고 09:30 에 한 번만
+            if now == self.now + timedelta(minutes=10):
+                event = Event.objects.get(pk=self.event.pk)
+                event.start_time = time(10, 0)
+                event.save()
+
+        fired = self._run(scheduler, self.now + timedelta(hours=3), on_step=edit)
+        self.assertEqual(fired, [(self.now + timedelta(minutes=90), date(2026, 3, 2))])
+        self.assertEqual(Notification.objects.filter(notification_type='reminder').count(), 1)
+
+
+@override_settings(CAPACITY_DAILY_HOURS=8)
+class CapacityTests(TestCase):
+    """차분 배열 + 누적합 결과가 날짜별 단순 합산과 같은지 확인"""
+
+    def setUp(self):
+        User.objects.bulk_create([User(username=f'cap{i}') for i in range(4)])
+        self.users = list(User.objects.filter(username__startswith='cap').order_by('username'))
+        self.project = Project.objects.create(
+            title='가동률', description='설명', manager=self.users[0],
+            start_date=date(2026, 1, 1), end_date=date(2026, 12, 31),
+        )
+        self.first, self.last = date(2026, 3, 1), date(2026, 3, 31)
+        rng = random.Random(25)
+        # 구간 밖에서 시작하거나 끝나는 배정, 완료된 배정도 섞는다
+        self.items = []
+        for i in range(40):
+            start = self.first + timedelta(days=rng.randint(-10, 35))
+            end = start + timedelta(days=rng.randint(0, 15))
+            hours = rng.randint(1, 8)
+            done = rng.random() < 0.2
+            if i % 2:
+                item = ProjectPhase.objects.create(
+                    project=self.project, title=f'단계 {i}', description='내용',
+                    start_date=start, end_date=end, daily_hours=hours, order=i,
+                    is_completed=done and i % 4 == 1, status='done' if done and i % 4 == 3 else 'in_progress',
+                )
+            else:
+                item = PersonalTask.objects.create(
+                    project=self.project, team_name='개발', content=f'작업 {i}',
+                    start_date=start, end_date=end, daily_hours=hours,
+                    progress='done' if done else 'in_progress',
+                )
+            assignees = rng.sample(self.users, rng.randint(1, 3))
+            item.assignees.set(assignees)
+            self.items.append((item, assignees, done))
+
+    def _naive(self, user_ids=None):
+        """배정마다 날짜를 하루씩 더하는 기준 구현"""
+        days = (self.last - self.first).days + 1
+        hours = {}
+        for item, assignees, done in self.items:
+            if done:
+                continue
+            for user in assignees:
+                if user_ids is not None and user.pk not in user_ids:
+                    continue
+                row = hours.setdefault(user.pk, [0] * days)
+                day = max(item.start_date, self.first)
+                while day <= min(item.end_date, self.last):
+                    row[(day - self.first).days] += item.daily_hours
+                    day += timedelta(days=1)
+        return hours
+
+    def _dense(self, hours):
+        days = (self.last - self.first).days + 1
+        return {user.pk: hours.get(user.pk, [0] * days) for user in self.users}
+
+    def test_allocated_hours_matches_day_by_day_sum(self):
+        self.assertEqual(self._dense(allocated_hours(self.first, self.last)), self._dense(self._naive()))
+
+    def test_user_filter_matches_day_by_day_sum(self):
+        user_ids = {self.users[1].pk, self.users[2].pk}
+        hours = allocated_hours(self.first, self.last, user_ids)
+        self.assertLessEqual(set(hours), user_ids)
+        self.assertEqual(
+            {pk: row for pk, row in self._dense(hours).items() if pk in user_ids},
+            {pk: row for pk, row in self._dense(self._naive(user_ids)).items() if pk in user_ids},
+        )
+
+    def test_report_totals_and_overallocation(self):
+        expected = self._dense(self._naive())
+        self.assertTrue(any(done for _, _, done in self.items))
+        report = capacity_report(self.first, self.last, user_ids=[user.pk for user in self.users])
+        self.assertEqual([row['id'] for row in report['users']], [user.pk for user in self.users])
+        self.assertEqual(report['hours'], [expected[user.pk] for user in self.users])
+        for row in report['users']:
+            naive = expected[row['id']]
+            self.assertEqual(row['total_hours'], sum(naive))
+            self.assertEqual(row['peak_hours'], max(naive))
+            self.assertEqual(row['overallocated_days'], sum(1 for value in naive if value > 8))
+
+        over = capacity_report(self.first, self.last, user_ids=[user.pk for user in self.users], overallocated_only=True)
+        self.assertTrue(over['users'])
+        self.assertTrue(all(row['overallocated_days'] for row in over['users']))
+        self.assertEqual(len(over['users']), report['overallocated_users'])
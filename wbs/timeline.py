@@ -0,0 +1,103 @@
+from calendar import monthrange
+from datetime import date, timedelta
+
+# 확대 수준별 하루 너비(px)
+ZOOM_PX_PER_DAY = {
+    'week': 100,
+    'month': 24,
+    'quarter': 8,
+}
+
+
+class Timeline:
+    """간트형 타임라인의 표시 구간과 좌표 계산
+
+    표시 구간(start_date~end_date)과 하루 너비(px_per_day)를 기준으로
+    헤더 날짜 좌표와 각 행(시작일/종료일)의 막대 좌표를 계산한다.
+    날짜는 모두 서수(toordinal)로 바꿔 정수 연산만 하므로 행 수가 많아도
+    한 번의 순회로 끝난다.
+    """
+
+    def __init__(self, start_date, end_date, px_per_day, zoom=None):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.px_per_day = px_per_day
+        # for_zoom 으로 만든 경우 확대 수준 (명시 구간이면 None)
+        self.zoom = zoom
+
+    @classmethod
+    def for_zoom(cls, base_date, zoom='week', px_per_day=None):
+        """기준일이 속한 주(월~일)/달/분기를 표시 구간으로 하는 타임라인"""
+        if zoom == 'month':
+            start_date = base_date.replace(day=1)
+            end_date = start_date.replace(day=monthrange(start_date.year, start_date.month)[1])
+        elif zoom == 'quarter':
+            first_month = (base_date.month - 1) // 3 * 3 + 1
+            start_date = base_date.replace(month=first_month, day=1)
+            last_month = first_month + 2
+            end_date = start_date.replace(month=last_month, day=monthrange(start_date.year, last_month)[1])
+        else:
+            zoom = 'week'
+            start_date = base_date - timedelta(days=base_date.weekday())
+            end_date = start_date + timedelta(days=6)
+        return cls(start_date, end_date, px_per_day or ZOOM_PX_PER_DAY[zoom], zoom=zoom)
+
+    @property
+    def day_count(self):
+        return (self.end_date - self.start_date).days + 1
+
+    @property
+    def width(self):
+        return self.day_count * self.px_per_day
+
+    def shifted_start(self, direction):
+        """이전(-1)/다음(+1) 표시 구간의 시작일"""
+        if self.zoom is None:
+            # 명시 구간은 같은 길이만큼 이동
+            return self.start_date + timedelta(days=direction * self.day_count)
+        if direction < 0:
+            return Timeline.for_zoom(self.start_date - timedelta(days=1), self.zoom).start_date
+        return self.end_date + timedelta(days=1)
+
+    def days_with_pos(self):
+        """헤더용 (날짜, left px) 목록"""
+        first = self.start_date.toordinal()
+        px = self.px_per_day
+        return [(date.fromordinal(first + i), i * px) for i in range(self.day_count)]
+
+    def place(self, spans, skip_outside=True):
+        """(시작일, 종료일) 목록의 막대 좌표를 입력 순서대로 반환
+
+        - skip_outside=True: 표시 구간과 겹치지 않는 행은 None
+        - skip_outside=False: 기존 플래너와 같이 좌표를 그대로 계산한다. 구간 전에 끝난 행은
+          첫날에 하루 너비로, 구간 뒤에 시작하는 행은 실제 시작일 위치(그리드 밖)에 놓인다.
+
+        각 좌표는 left/width(px)와 CSS grid 용 grid_col_start(1부터)/grid_span(일수).
+        """
+        window_start = self.start_date.toordinal()
+        window_end = self.end_date.toordinal()
+        px = self.px_per_day
+        bars = []
+        append = bars.append
+        for start, end in spans:
+            s = start.toordinal()
+            e = end.toordinal()
+            if skip_outside and (e < window_start or s > window_end):
+                append(None)
+                continue
+            # 구간 시작/끝으로 자르기 (시작일은 앞쪽만 자르므로 구간 뒤의 행은 그리드 밖에 남는다)
+            if s < window_start:
+                s = window_start
+            if e > window_end:
+                e = window_end
+            if e < s:
+                e = s
+            offset = s - window_start
+            span = e - s + 1
+            append({
+                'left': offset * px,
+                'width': span * px,
+                'grid_col_start': offset + 1,
+                'grid_span': span,
+            })
+        return bars
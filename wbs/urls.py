@@ -19,6 +19,8 @@ urlpatterns = [
     path('projects/', views.project_list, name='project_list'),
     path('projects/create/', views.project_create, name='project_create'),
     path('projects/<int:pk>/', views.project_detail, name='project_detail'),
+    path('projects/<int:pk>/comments/', views.project_comments, name='project_comments'),
+    path('projects/<int:pk>/documents/', views.project_documents, name='project_documents'),
     path('projects/<int:pk>/edit/', views.project_edit, name='project_edit'),
     path('projects/<int:pk>/delete/', views.project_delete, name='project_delete'),
     path('projects/team/', views.team_projects, name='team_projects'),
@@ -40,6 +42,7 @@ urlpatterns = [
     path('projects/<int:pk>/personal/', views.personal_project_detail, name='personal_project_detail'),
     # 프로젝트별 플래너
     path('projects/<int:pk>/planner/', views.project_planner, name='project_planner'),
+    path('projects/<int:pk>/planner/data/', views.project_planner_data, name='project_planner_data'),
     
     # 진행사항 캘린더
     path('projects/<int:project_pk>/progress-calendar/', views.progress_calendar, name='progress_calendar'),
@@ -52,12 +55,15 @@ urlpatterns = [
         path('profile/edit/', views.profile_edit, name='profile_edit'),
         path('users/', views.user_list, name='user_list'),
         path('users/<int:user_id>/', views.user_detail, name='user_detail'),
+        path('capacity/', views.capacity_heatmap, name='capacity_heatmap'),
+        path('api/capacity/', views.api_capacity, name='api_capacity'),
         
         # 알림 관련
         path('notifications/', views.notifications, name='notifications'),
         path('notifications/<int:notification_id>/read/', views.mark_notification_read, name='mark_notification_read'),
         path('notifications/mark-all-read/', views.mark_all_notifications_read, name='mark_all_notifications_read'),
         path('api/notifications/count/', views.get_notifications_count, name='get_notifications_count'),
+        path('api/notifications/stream/', views.notification_stream, name='notification_stream'),
         
         # 구독 관련
         path('subscription/plans/', views.subscription_plans, name='subscription_plans'),
@@ -71,11 +77,13 @@ urlpatterns = [
         
     # 검색
     path('search/', views.search, name='search'),
+    path('api/search/autocomplete/', views.search_autocomplete, name='search_autocomplete'),
 
     # 일정 관련 (복구)
     path('events/', views.event_list, name='event_list'),
     path('events/create/', views.event_create, name='event_create'),
     path('events/range-selector/', views.event_range_selector, name='event_range_selector'),
+    path('api/freebusy/', views.api_freebusy, name='api_freebusy'),
     path('events/<int:pk>/', views.event_detail, name='event_detail'),
     path('events/<int:pk>/edit/', views.event_edit, name='event_edit'),
     path('events/<int:pk>/delete/', views.event_delete, name='event_delete'),
@@ -86,4 +94,5 @@ urlpatterns = [
     path('api/projects/', views.api_projects, name='api_projects'),
     path('api/events/', views.api_events, name='api_events'),
     path('api/users/', views.api_users, name='api_users'),
+    path('api/sync/', views.api_sync, name='api_sync'),
 ]
@@ -1,78 +1,155 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
 from django.shortcuts import render, redirect, get_object_or_404
 from django.urls import reverse
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth import login, authenticate, logout
 from django.contrib.auth.models import User
 from django.contrib import messages
-from django.http import JsonResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.views.decorators.http import require_POST
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.cache import cache_page
 from django.utils import timezone
-from django.db.models import Q, F
-from .models import Project, ProjectPhase, ApprovalLine, Comment, ProjectDocument, DailyProgress, TaskChecklistItem, UserProfile, Notification, SubscriptionPlan, UserSubscription, AdCampaign, Event
+from django.db.models import Q, F, Prefetch
+from .models import Project, ProjectPhase, ApprovalLine, Comment, ProjectDocument, DailyProgress, TaskChecklistItem, UserProfile, Notification, SubscriptionPlan, UserSubscription, AdCampaign, Event, ProjectMembership
 from .forms import ProjectForm, ProjectPhaseForm, CommentForm, DailyProgressForm, TaskChecklistItemForm, UserProfileForm, UserForm, SubscriptionPlanForm, UserSubscriptionForm, AdCampaignForm, EventForm, EventAttendeesForm, PersonalTaskForm
+from .intervals import DateIntervalIndex
+from .dashboard import get_dashboard_stats
+from .pagination import PaginationError, keyset_page, parse_fields, parse_limit
+from .sync import InvalidSyncToken, build_sync_payload, DEFAULT_SYNC_LIMIT, MAX_SYNC_LIMIT
+from .timeline import Timeline
+from .membership import PARTICIPANT_ROLES, projects_for_user
+from .notifications import get_unread_count, get_unread_count_for, mark_all_read
+from .ad_counters import record_click
+from .ad_selection import ads_for_request
+from .search import search_all
+from .recurrence import expand_events, format_rrule, window_q
+from .autocomplete import DEFAULT_LIMIT as AUTOCOMPLETE_LIMIT, MAX_LIMIT as AUTOCOMPLETE_MAX_LIMIT, autocomplete
+from .capacity import MAX_DAYS as CAPACITY_MAX_DAYS, capacity_report, daily_capacity, default_range as default_capacity_range
+from .freebusy import MAX_DAYS as FREEBUSY_MAX_DAYS, MAX_USERS as FREEBUSY_MAX_USERS, busy_times, serialize_busy
+from .realtime import format_sse, get_broker, notification_payload, user_channel
 from datetime import datetime, timedelta, date
 import json
 
 # Flutter 앱용 JSON API 엔드포인트들
+# 필드 이름 -> (조회할 컬럼, 값 추출 함수). fields= 파라미터로 일부만 요청 가능
+PROJECT_API_FIELDS = {
+    'id': (('id',), lambda p: p.id),
+    'title': (('title',), lambda p: p.title),
+    'description': (('description',), lambda p: p.description),
+    'status': (('status',), lambda p: p.status),
+    'start_date': (('start_date',), lambda p: p.start_date.isoformat() if p.start_date else None),
+    'end_date': (('end_date',), lambda p: p.end_date.isoformat() if p.end_date else None),
+    'created_at': (('created_at',), lambda p: p.created_at.isoformat()),
+    'updated_at': (('updated_at',), lambda p: p.updated_at.isoformat()),
+    'manager': (('manager__username',), lambda p: p.manager.username if p.manager else None),
+}
+
+EVENT_API_FIELDS = {
+    'id': (('id',), lambda e: e.id),
+    'title': (('title',), lambda e: e.title),
+    'description': (('description',), lambda e: e.description),
+    'start_time': (('start_time',), lambda e: e.start_time.isoformat() if e.start_time else None),
+    'end_time': (('end_time',), lambda e: e.end_time.isoformat() if e.end_time else None),
+    'location': (('location',), lambda e: e.location),
+    'start_date': (('start_date',), lambda e: e.start_date.isoformat()),
+    'end_date': (('end_date',), lambda e: e.end_date.isoformat()),
+    'recurrence': (('is_recurring', 'recurrence_freq', 'recurrence_interval', 'recurrence_count', 'recurrence_until'), format_rrule),
+    'created_at': (('created_at',), lambda e: e.created_at.isoformat()),
+}
+# start/end 구간 조회 시 반복 일정을 회차로 펼칠 수 있는 최대 일수
+EVENT_WINDOW_MAX_DAYS = 366
+
+USER_API_FIELDS = {
+    'id': (('id',), lambda u: u.id),
+    'username': (('username',), lambda u: u.username),
+    'email': (('email',), lambda u: u.email),
+    'first_name': (('first_name',), lambda u: u.first_name),
+    'last_name': (('last_name',), lambda u: u.last_name),
+    'is_staff': (('is_staff',), lambda u: u.is_staff),
+    'date_joined': (('date_joined',), lambda u: u.date_joined.isoformat()),
+}
+
+def _paginated_api_response(request, queryset, field_spec, result_key, time_field='created_at'):
+    """커서 기반 페이지 + 필드 선택을 적용한 목록 JSON 응답
+
+    파라미터: cursor(이전 응답의 next_cursor), limit(기본 50, 최대 200), fields(쉼표 구분)
+    """
+    try:
+        fields = parse_fields(request.GET.get('fields'), field_spec)
+        limit = parse_limit(request.GET.get('limit'))
+        columns = {'id', time_field}
+        for name in fields:
+            columns.update(field_spec[name][0])
+        # 관계 컬럼(manager__username 등)은 JOIN 으로 함께 조회해 행마다 추가 쿼리가 나가지 않게 한다
+        related = {column.split('__')[0] for column in columns if '__' in column}
+        queryset = queryset.select_related(*related).only(*columns)
+        rows, next_cursor = keyset_page(queryset, request.GET.get('cursor'), limit, time_field)
+    except PaginationError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    data = [{name: field_spec[name][1](row) for name in fields} for row in rows]
+    return JsonResponse({result_key: data, 'next_cursor': next_cursor})
+
 @csrf_exempt
 def api_projects(request):
     """프로젝트 목록 JSON API"""
     if request.method == 'GET':
-        projects = Project.objects.all()
-        data = []
-        for project in projects:
-            data.append({
-                'id': project.id,
-                'title': project.title,
-                'description': project.description,
-                'status': project.status,
-                'start_date': project.start_date.isoformat() if project.start_date else None,
-                'end_date': project.end_date.isoformat() if project.end_date else None,
-                'created_at': project.created_at.isoformat(),
-                'updated_at': project.updated_at.isoformat(),
-                'manager': project.manager.username if project.manager else None,
-            })
-        return JsonResponse({'projects': data})
+        return _paginated_api_response(request, Project.objects.all(), PROJECT_API_FIELDS, 'projects')
     return JsonResponse({'error': 'Method not allowed'}, status=405)
 
+def _event_window_response(request):
+    """start~end 구간의 일정 회차 목록 (반복 일정은 구간 안의 회차만 펼침)"""
+    start = _parse_date_param(request.GET.get('start'))
+    end = _parse_date_param(request.GET.get('end'))
+    if not start or not end or start > end:
+        return JsonResponse({'error': 'start/end 는 YYYY-MM-DD 형식이고 start <= end 여야 합니다.'}, status=400)
+    if (end - start).days >= EVENT_WINDOW_MAX_DAYS:
+        return JsonResponse({'error': f'조회 구간은 최대 {EVENT_WINDOW_MAX_DAYS}일입니다.'}, status=400)
+    try:
+        fields = parse_fields(request.GET.get('fields'), EVENT_API_FIELDS)
+    except PaginationError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    occurrences = expand_events(Event.objects.filter(window_q(start, end)).order_by('start_date', 'id'), start, end)
+    data = [
+        {**{name: EVENT_API_FIELDS[name][1](item) for name in fields}, 'occurrence': getattr(item, 'is_occurrence', False)}
+        for item in occurrences
+    ]
+    return JsonResponse({'events': data, 'start': start.isoformat(), 'end': end.isoformat()})
+
 @csrf_exempt
 def api_events(request):
-    """이벤트 목록 JSON API"""
+    """이벤트 목록 JSON API (start/end 를 주면 구간 회차 목록, 없으면 커서 페이지)"""
     if request.method == 'GET':
-        events = Event.objects.all()
-        data = []
-        for event in events:
-            data.append({
-                'id': event.id,
-                'title': event.title,
-                'description': event.description,
-                'start_time': event.start_time.isoformat() if event.start_time else None,
-                'end_time': event.end_time.isoformat() if event.end_time else None,
-                'location': event.location,
-                'created_at': event.created_at.isoformat(),
-            })
-        return JsonResponse({'events': data})
+        if 'start' in request.GET or 'end' in request.GET:
+            return _event_window_response(request)
+        return _paginated_api_response(request, Event.objects.all(), EVENT_API_FIELDS, 'events')
     return JsonResponse({'error': 'Method not allowed'}, status=405)
 
 @csrf_exempt
 def api_users(request):
     """사용자 목록 JSON API"""
     if request.method == 'GET':
-        users = User.objects.all()
-        data = []
-        for user in users:
-            data.append({
-                'id': user.id,
-                'username': user.username,
-                'email': user.email,
-                'first_name': user.first_name,
-                'last_name': user.last_name,
-                'is_staff': user.is_staff,
-                'date_joined': user.date_joined.isoformat(),
-            })
-        return JsonResponse({'users': data})
+        return _paginated_api_response(request, User.objects.all(), USER_API_FIELDS, 'users', time_field='date_joined')
+    return JsonResponse({'error': 'Method not allowed'}, status=405)
+
+def api_sync(request):
+    """모바일 델타 동기화 JSON API (로그인 사용자에게 보이는 행만)
+
+    since: 이전 응답의 next_since (없으면 전체 동기화), limit: 모델별 최대 행 수
+    """
+    if not request.user.is_authenticated:
+        return JsonResponse({'error': '로그인이 필요합니다.'}, status=401)
+    if request.method == 'GET':
+        try:
+            limit = parse_limit(request.GET.get('limit'), default=DEFAULT_SYNC_LIMIT, maximum=MAX_SYNC_LIMIT)
+            payload = build_sync_payload(request.user, request.GET.get('since'), limit)
+        except (PaginationError, InvalidSyncToken) as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        return JsonResponse(payload)
     return JsonResponse({'error': 'Method not allowed'}, status=405)
 
 def custom_login(request):
@@ -105,37 +182,8 @@ def custom_logout(request):
 @login_required
 def home(request):
     """홈페이지 뷰"""
-    # 통계 데이터
-    total_projects = Project.objects.count()
-    active_projects = Project.objects.filter(status='in_progress').count()
-    completed_projects = Project.objects.filter(status='completed').count()
-    total_comments = Comment.objects.count()
-    
-    # 최근 프로젝트 (최대 5개)
-    recent_projects = Project.objects.order_by('-created_at')[:5]
-    
-    # 승인 대기 중인 프로젝트
-    pending_approvals = Project.objects.filter(
-        Q(approval_lines__status='pending') | Q(approval_lines__status='in_review')
-    ).distinct()[:5]
-    
-    # 월별 프로젝트 통계
-    today = timezone.now()
-    monthly_projects = Project.objects.filter(
-        start_date__year=today.year,
-        start_date__month=today.month
-    )
-    
-    context = {
-        'total_projects': total_projects,
-        'active_projects': active_projects,
-        'completed_projects': completed_projects,
-        'total_comments': total_comments,
-        'recent_projects': recent_projects,
-        'pending_approvals': pending_approvals,
-        'monthly_projects': monthly_projects,
-        'current_month': today.strftime('%Y년 %m월'),
-    }
+    # 통계/최근 프로젝트/승인 대기/이달 일정은 공용 대시보드 캐시에서 조회
+    context = get_dashboard_stats()
     
     return render(request, 'wbs/home.html', context)
 
@@ -149,17 +197,13 @@ def team_projects(request):
     """내가 관리하거나 참여 중인 팀 프로젝트 목록"""
     # 팀 프로젝트: 기본은 팀 프로젝트(True) + 내가 관리/참여한 것
     # 단, 내가 팀원으로 포함된 프로젝트는 is_team_project 여부와 상관없이 표시(참여 관점)
+    # 참여 색인(ProjectMembership)으로 조회: 다중 JOIN + DISTINCT 대신 (user, role) 인덱스 서브쿼리 한 번
+    memberships = ProjectMembership.objects.filter(user=request.user).filter(
+        Q(role__in=PARTICIPANT_ROLES) | Q(project__is_team_project=True)
+    )
     projects = Project.objects.filter(
-        Q(manager=request.user) |
-        Q(team_members=request.user) |
-        Q(tl=request.user) |
-        Q(phases__assignees=request.user)
-    ).filter(
-        Q(is_team_project=True) |
-        Q(team_members=request.user) |
-        Q(tl=request.user) |
-        Q(phases__assignees=request.user)
-    ).distinct().order_by('-updated_at', '-created_at')
+        pk__in=memberships.values('project_id')
+    ).order_by('-updated_at', '-created_at')
 
     # id 쿼리 파라미터가 오면 해당 프로젝트 상세로 이동 (권한 확인)
     target_id = request.GET.get('id')
@@ -194,10 +238,16 @@ def personal_projects(request):
 
 def project_detail(request, pk):
     """프로젝트 상세"""
-    project = get_object_or_404(Project, pk=pk)
-    phases = project.phases.all().order_by('order')
-    comments = project.comments.all().order_by('-created_at')
-    documents = project.documents.all().order_by('-created_at')
+    # 페이지에서 쓰는 연관 데이터를 한 번에 읽어오는 조회 계획
+    # (단계 수/댓글 수/문서 수와 무관하게 쿼리 수 고정)
+    # 댓글/문서는 project_comments/project_documents 조각 뷰에서 페이지 단위로 불러온다
+    project = get_object_or_404(
+        Project.objects.select_related('manager').prefetch_related(
+            Prefetch('phases', queryset=ProjectPhase.objects.order_by('order').prefetch_related('assignees')),
+        ),
+        pk=pk,
+    )
+    phases = project.phases.all()
     
     if request.method == 'POST':
         form = CommentForm(request.POST)
@@ -218,19 +268,15 @@ def project_detail(request, pk):
         base_date = datetime.strptime(base_str, '%Y-%m-%d').date() if base_str else timezone.localdate()
     except Exception:
         base_date = timezone.localdate()
-    week_start = base_date - timedelta(days=base_date.weekday())
-    week_end = week_start + timedelta(days=6)
-    px_per_day = 100
+    timeline = Timeline.for_zoom(base_date, 'week')
+    week_start, week_end, px_per_day = timeline.start_date, timeline.end_date, timeline.px_per_day
     phase_rows = []
-    for ph in phases:
-        # 주간과 겹치지 않으면 표시하지 않음
-        if ph.end_date < week_start or ph.start_date > week_end:
+    # 주간과 겹치지 않는 단계는 표시하지 않음 (bar 가 None)
+    bars = timeline.place([(ph.start_date, ph.end_date) for ph in phases])
+    for ph, bar in zip(phases, bars):
+        if bar is None:
             continue
-        start = max(ph.start_date, week_start)
-        end = min(ph.end_date, week_end)
-        left = (start - week_start).days * px_per_day
-        width = ((end - start).days + 1) * px_per_day
-        owners = ", ".join(u.username for u in getattr(ph, 'assignees', []).all()) if hasattr(ph, 'assignees') else project.manager.username
+        owners = ", ".join(u.username for u in ph.assignees.all())
         phase_rows.append({
             'id': ph.id,
             'title': ph.title,
@@ -243,8 +289,8 @@ def project_detail(request, pk):
             'end_date': ph.end_date,
             'owner': owners or project.manager.username,
             'part': getattr(ph, 'team_name', ''),
-            'left': left,
-            'width': width,
+            'left': bar['left'],
+            'width': bar['width'],
         })
 
     # 개인 작업은 주간 WBS에서 제외
@@ -253,19 +299,50 @@ def project_detail(request, pk):
         'project': project,
         'phases': phases,
         'phase_rows': phase_rows,
-        'comments': comments,
-        'documents': documents,
         'form': form,
         'px_per_day': px_per_day,
         'week_start': week_start,
         'week_end': week_end,
         'prev_week': (week_start - timedelta(days=7)).strftime('%Y-%m-%d'),
         'next_week': (week_start + timedelta(days=7)).strftime('%Y-%m-%d'),
-        'week_days': [(week_start + timedelta(days=i)) for i in range(7)],
+        'week_days': [d for d, _ in timeline.days_with_pos()],
     }
     
     return render(request, 'wbs/project_detail.html', context)
 
+PROJECT_FRAGMENT_PAGE_SIZE = 20
+
+def _project_fragment(request, queryset, template_name, context_name):
+    """프로젝트 상세 하단 목록(댓글/문서)을 created_at 키셋 페이지 단위 HTML 조각으로 반환
+
+    다음 페이지 커서는 X-Next-Cursor 헤더로 전달 (마지막 페이지면 헤더 없음)
+    """
+    try:
+        limit = parse_limit(request.GET.get('limit'), default=PROJECT_FRAGMENT_PAGE_SIZE, maximum=100)
+        rows, next_cursor = keyset_page(queryset, request.GET.get('cursor'), limit)
+    except PaginationError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    response = render(request, template_name, {context_name: rows})
+    if next_cursor:
+        response['X-Next-Cursor'] = next_cursor
+    return response
+
+def project_comments(request, pk):
+    """프로젝트 댓글 목록 조각 (상세 화면에서 필요할 때 로드)"""
+    project = get_object_or_404(Project, pk=pk)
+    return _project_fragment(
+        request, project.comments.select_related('author'),
+        'wbs/project_comments_fragment.html', 'comments',
+    )
+
+def project_documents(request, pk):
+    """프로젝트 문서 목록 조각 (상세 화면에서 필요할 때 로드)"""
+    project = get_object_or_404(Project, pk=pk)
+    return _project_fragment(
+        request, project.documents.select_related('uploaded_by'),
+        'wbs/project_documents_fragment.html', 'documents',
+    )
+
 @login_required
 def personal_task_add(request, project_pk):
     project = get_object_or_404(Project, pk=project_pk)
@@ -408,14 +485,17 @@ def calendar(request):
         Q(start_date__lte=last_day) & Q(end_date__gte=first_day)
     ).order_by('start_date')
 
-    events = Event.objects.filter(
-        Q(start_date__lte=last_day) & Q(end_date__gte=first_day)
-    ).order_by('start_date')
+    # 반복 일정은 이 달에 걸치는 회차만 펼친다
+    events = expand_events(Event.objects.filter(window_q(first_day, last_day)).order_by('start_date'), first_day, last_day)
 
     # 사용자 프로젝트 (고급 추가 모달용)
     user_projects = Project.objects.all()
     if request.user.is_authenticated:
-        user_projects = Project.objects.filter(Q(manager=request.user) | Q(team_members=request.user)).distinct()
+        user_projects = projects_for_user(request.user, roles=['manager', 'member'])
+
+    # 일자별 프로젝트/이벤트는 구간 인덱스로 한 번에 분배 (날짜마다 전체 목록을 재스캔하지 않음)
+    projects_by_day = DateIntervalIndex(projects).bucket_by_day(first_day, last_day)
+    events_by_day = DateIntervalIndex(events).bucket_by_day(first_day, last_day)
 
     # 주 단위 달력 데이터 구성 (해당 월 외 날짜는 None 처리)
     weeks = []
@@ -425,14 +505,12 @@ def calendar(request):
             if d.month != month:
                 week.append(None)
             else:
-                day_projects = [p for p in projects if p.start_date <= d <= p.end_date]
-                day_events = [e for e in events if e.start_date <= d <= e.end_date]
                 week.append({
                     'date': d,
                     'day': d.day,
                     'is_today': (d == today_dt),
-                    'projects': day_projects,
-                    'events': day_events,
+                    'projects': projects_by_day.get(d, []),
+                    'events': events_by_day.get(d, []),
                 })
         weeks.append(week)
 
@@ -633,15 +711,24 @@ def user_detail(request, user_id):
     }
     return render(request, 'wbs/user_detail.html', context)
 
+NOTIFICATIONS_PAGE_SIZE = 30
+
 @login_required
 def notifications(request):
-    """알림 목록"""
-    notifications = Notification.objects.filter(user=request.user).order_by('-created_at')
-    unread_count = notifications.filter(is_read=False).count()
+    """알림 목록 (created_at 키셋 페이지 단위, 오래된 읽은 알림은 보관 테이블로 이동됨)"""
+    queryset = Notification.objects.filter(user=request.user).select_related('project', 'phase')
+    cursor = request.GET.get('cursor')
+    try:
+        notifications, next_cursor = keyset_page(queryset, cursor, NOTIFICATIONS_PAGE_SIZE)
+    except PaginationError:
+        return redirect('wbs:notifications')
+    unread_count = get_unread_count(request.user)
     
     context = {
         'notifications': notifications,
         'unread_count': unread_count,
+        'next_cursor': next_cursor,
+        'is_first_page': not cursor,
     }
     return render(request, 'wbs/notifications.html', context)
 
@@ -660,18 +747,93 @@ def mark_notification_read(request, notification_id):
 @require_POST
 def mark_all_notifications_read(request):
     """모든 알림을 읽음으로 표시"""
-    Notification.objects.filter(user=request.user, is_read=False).update(
-        is_read=True, 
-        read_at=timezone.now()
-    )
+    mark_all_read(request.user)
     return JsonResponse({'success': True})
 
 @login_required
 def get_notifications_count(request):
-    """읽지 않은 알림 개수 조회 (AJAX)"""
-    unread_count = Notification.objects.filter(user=request.user, is_read=False).count()
+    """읽지 않은 알림 개수 조회 (AJAX) - 카운터 행 PK 조회 한 번"""
+    unread_count = get_unread_count(request.user)
     return JsonResponse({'unread_count': unread_count})
 
+SSE_HEARTBEAT_SECONDS = 15
+SSE_REPLAY_LIMIT = 50
+# 연결 하나를 붙잡아 두는 최대 시간. 끝나면 EventSource 가 Last-Event-ID 로 재접속한다.
+SSE_MAX_SECONDS = 5 * 60
+SSE_RETRY_MILLISECONDS = 3000
+
+
+def _missed_notifications(user_id, last_id):
+    """last_id 이후에 생긴 알림 (오래된 것부터)"""
+    rows = Notification.objects.filter(user_id=user_id, pk__gt=last_id).order_by('pk')[:SSE_REPLAY_LIMIT]
+    return list(rows)
+
+
+def _latest_notification_id(user_id):
+    return Notification.objects.filter(user_id=user_id).order_by('-pk').values_list('pk', flat=True).first() or 0
+
+
+@login_required
+async def notification_stream(request):
+    """새 알림/미읽음 개수를 Server-Sent Events 로 푸시 (ASGI 전용)
+
+    이벤트: notification(새 알림, id=알림 id), unread_count(개수 변경).
+    - WSGI(runserver 등)에서는 연결마다 워커 스레드를 점유하므로 스트림을 열지 않고 204 를 돌려준다.
+      EventSource 는 204 를 받으면 재접속하지 않고, 화면은 그때부터 30초 폴링으로 개수를 갱신한다.
+    - 프로세스 간 브로커(RedisBroker)면 워커 명령이 만든 알림도 브로커로 오므로 DB 는 접속할 때만 읽는다.
+    - 프로세스 안 브로커면 워커 명령(run_reminder_worker, scan_deadlines 등)이 만든 알림도 전달하도록
+      heartbeat 마다 DB 에서 마지막 전송 이후 알림을 확인한다.
+    - 연결은 SSE_MAX_SECONDS 뒤에 닫고 클라이언트가 재접속하게 한다.
+    """
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(status=204)
+    user = await request.auser()
+    try:
+        last_id = int(request.headers.get('Last-Event-ID') or request.GET.get('last_event_id'))
+    except (TypeError, ValueError):
+        last_id = None
+
+    async def stream():
+        nonlocal last_id
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + SSE_MAX_SECONDS
+        broker = get_broker()
+        with broker.subscribe(user_channel(user.pk)) as subscription:
+            yield f'retry: {SSE_RETRY_MILLISECONDS}\n\n'
+            if last_id is None:
+                last_id = await sync_to_async(_latest_notification_id)(user.pk)
+            else:
+                for notification in await sync_to_async(_missed_notifications)(user.pk, last_id):
+                    last_id = notification.pk
+                    yield format_sse({'event': 'notification', 'id': notification.pk, 'data': notification_payload(notification)})
+            count = await sync_to_async(get_unread_count_for)(user.pk)
+            yield format_sse({'event': 'unread_count', 'data': {'unread_count': count}})
+            while loop.time() < deadline:
+                message = await subscription.get(timeout=min(SSE_HEARTBEAT_SECONDS, max(deadline - loop.time(), 0)))
+                if message is not None:
+                    if message['event'] == 'notification':
+                        # DB 확인으로 이미 보낸 알림은 건너뛴다
+                        if message['id'] <= last_id:
+                            continue
+                        last_id = message['id']
+                    yield format_sse(message)
+                    continue
+                missed = [] if broker.cross_process else await sync_to_async(_missed_notifications)(user.pk, last_id)
+                if not missed:
+                    yield ': keepalive\n\n'
+                    continue
+                for notification in missed:
+                    last_id = notification.pk
+                    yield format_sse({'event': 'notification', 'id': notification.pk, 'data': notification_payload(notification)})
+                count = await sync_to_async(get_unread_count_for)(user.pk)
+                yield format_sse({'event': 'unread_count', 'data': {'unread_count': count}})
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # nginx 등 프록시 버퍼링 끄기
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
 # 구독 관련 뷰들
 @login_required
 def subscription_plans(request):
@@ -803,79 +965,109 @@ def cancel_subscription(request):
 
 # 광고 관련 뷰들
 def get_ads_for_user(request, position='sidebar'):
-    """사용자에게 표시할 광고 조회"""
-    user_subscription = getattr(request.user, 'subscription', None) if request.user.is_authenticated else None
-    
-    # 무료 플랜 사용자에게만 광고 표시
-    if user_subscription and user_subscription.plan.name != 'free':
-        return []
-    
-    # 현재 페이지 경로
-    current_path = request.path
-    
-    # 실행 중인 광고 캠페인 조회
-    ads = AdCampaign.objects.filter(
-        position=position,
-        status='active',
-        is_active=True,
-        start_date__lte=timezone.now(),
-        end_date__gte=timezone.now(),
-        current_impressions__lt=F('max_impressions')
-    ).order_by('?')[:3]  # 랜덤으로 최대 3개
-    
-    # 노출 기록
-    for ad in ads:
-        ad.record_impression()
-    
-    return ads
+    """사용자에게 표시할 광고 조회 (무료 플랜만, 캐시된 실행 중 캠페인에서 가중 추출)"""
+    return ads_for_request(request, position)
 
 @login_required
 def ad_click(request, ad_id):
     """광고 클릭 처리"""
     ad = get_object_or_404(AdCampaign, pk=ad_id)
-    ad.record_click()
+    if ad.is_running():
+        record_click(ad.pk)
     
     return redirect(ad.target_url)
 
 @login_required
 def search(request):
-    """통합 검색 기능"""
+    """통합 검색 기능 (전문 색인, 관련도 순)"""
     query = request.GET.get('q', '').strip()
     results = {}
     
     if query:
-        # 프로젝트 검색
-        projects = Project.objects.filter(
-            Q(title__icontains=query) | 
-            Q(description__icontains=query)
-        ).select_related('manager')[:10]
-        
-        # 사용자 검색 (관리자만)
-        users = []
-        if request.user.is_staff:
-            users = User.objects.filter(
-                Q(username__icontains=query) |
-                Q(first_name__icontains=query) |
-                Q(last_name__icontains=query) |
-                Q(email__icontains=query)
-            )[:10]
-        
-        # 알림 검색
-        notifications = Notification.objects.filter(
-            user=request.user,
-            message__icontains=query
-        ).order_by('-created_at')[:10]
-        
-        results = {
-            'projects': projects,
-            'users': users,
-            'notifications': notifications,
-            'query': query,
-            'total_count': len(projects) + len(users) + len(notifications)
-        }
+        results = search_all(request.user, query)
     
     return render(request, 'wbs/search_results.html', results)
 
+@login_required
+def search_autocomplete(request):
+    """검색창 자동완성 JSON - 프로세스 메모리 접두사 색인 조회 (DB 쿼리 없음)"""
+    query = request.GET.get('q', '').strip()
+    try:
+        limit = parse_limit(request.GET.get('limit'), default=AUTOCOMPLETE_LIMIT, maximum=AUTOCOMPLETE_MAX_LIMIT)
+    except PaginationError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    return JsonResponse({'query': query, 'results': autocomplete(request.user, query, limit)})
+
+@login_required
+def api_freebusy(request):
+    """사용자별 바쁜 구간 JSON (일정은 busy, 단계/개인 작업 배정은 tentative)
+
+    파라미터: users(쉼표 구분 id, 기본 본인), start/end(YYYY-MM-DD, 기본 오늘부터 7일),
+    assignments=0 이면 일정만. 일정 제목 등 내용은 내보내지 않고 출처 종류/id 만 준다.
+    """
+    try:
+        user_ids = [int(value) for value in request.GET.get('users', '').split(',') if value.strip()] or [request.user.pk]
+    except ValueError:
+        return JsonResponse({'error': 'users 는 쉼표로 구분한 사용자 id 여야 합니다.'}, status=400)
+    if len(user_ids) > FREEBUSY_MAX_USERS:
+        return JsonResponse({'error': f'사용자는 한 번에 최대 {FREEBUSY_MAX_USERS}명까지 조회할 수 있습니다.'}, status=400)
+    today = timezone.localdate()
+    start = _parse_date_param(request.GET.get('start')) if request.GET.get('start') else today
+    end = _parse_date_param(request.GET.get('end')) if request.GET.get('end') else (start and start + timedelta(days=6))
+    if not start or not end or start > end:
+        return JsonResponse({'error': 'start/end 는 YYYY-MM-DD 형식이고 start <= end 여야 합니다.'}, status=400)
+    if (end - start).days >= FREEBUSY_MAX_DAYS:
+        return JsonResponse({'error': f'조회 구간은 최대 {FREEBUSY_MAX_DAYS}일입니다.'}, status=400)
+    busy = busy_times(user_ids, start, end, include_assignments=request.GET.get('assignments') != '0')
+    return JsonResponse({'start': start.isoformat(), 'end': end.isoformat(), 'busy': serialize_busy(busy)})
+
+def _capacity_params(request):
+    """가동률 리포트 조회 조건 (start, end, user_ids, overallocated_only) - 잘못된 값이면 ValueError"""
+    default_start, default_end = default_capacity_range(timezone.localdate())
+    start = _parse_date_param(request.GET.get('start')) if request.GET.get('start') else default_start
+    end = _parse_date_param(request.GET.get('end')) if request.GET.get('end') else default_end
+    if not start or not end or start > end:
+        raise ValueError('start/end 는 YYYY-MM-DD 형식이고 start <= end 여야 합니다.')
+    if (end - start).days >= CAPACITY_MAX_DAYS:
+        raise ValueError(f'조회 구간은 최대 {CAPACITY_MAX_DAYS}일입니다.')
+    try:
+        user_ids = [int(value) for value in request.GET.get('users', '').split(',') if value.strip()] or None
+    except ValueError:
+        raise ValueError('users 는 쉼표로 구분한 사용자 id 여야 합니다.')
+    return start, end, user_ids, request.GET.get('overallocated') == '1'
+
+@login_required
+def capacity_heatmap(request):
+    """팀 가동률 히트맵 (셀은 JSON API 를 받아 캔버스에 그린다)"""
+    try:
+        start, end, _, overallocated_only = _capacity_params(request)
+    except ValueError as e:
+        messages.error(request, str(e))
+        start, end = default_capacity_range(timezone.localdate())
+        overallocated_only = False
+    context = {
+        'start': start,
+        'end': end,
+        'overallocated_only': overallocated_only,
+        'capacity': daily_capacity(),
+    }
+    return render(request, 'wbs/capacity_heatmap.html', context)
+
+@login_required
+def api_capacity(request):
+    """사용자별 날짜별 배정 시간 JSON (단계/개인 작업의 daily_hours 합, 하루 capacity 초과 표시용)
+
+    파라미터: start/end(YYYY-MM-DD, 기본 이번 달부터 3개월), users(쉼표 구분 id), overallocated=1(초과 사용자만)
+    """
+    try:
+        start, end, user_ids, overallocated_only = _capacity_params(request)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    report = capacity_report(start, end, user_ids, overallocated_only)
+    report['start'] = start.isoformat()
+    report['end'] = end.isoformat()
+    return JsonResponse(report)
+
 # ----- 일정(Event) 뷰 최소 복구 -----
 from django.views.decorators.http import require_http_methods
 
@@ -884,30 +1076,50 @@ def event_list(request):
     events = Event.objects.filter(creator=request.user).order_by('-start_date')[:100]
     return render(request, 'wbs/event_list.html', {'events': events})
 
+def _conflict_summary(conflicts):
+    """EventForm.attendee_conflicts 결과를 '이름(n건), ...' 문자열로"""
+    return ', '.join(f'{user.get_full_name() or user.username}({count}건)' for user, count in conflicts)
+
 @login_required
 @require_http_methods(["GET", "POST"])
 def event_create(request):
+    """일정 생성. 참석자 일정이 겹치면 저장하기 전에 경고하고, '겹쳐도 저장'(confirm_conflicts)으로 다시 보내야 저장한다"""
     attendees_form = None
+    conflicts = None
     if request.method == 'POST':
         form = EventForm(request.POST, user=request.user)
         attendees_form = EventAttendeesForm(request.POST, user=request.user)
+        is_ajax = request.headers.get('X-Requested-With') == 'XMLHttpRequest'
         if form.is_valid() and attendees_form.is_valid():
-            event = form.save(commit=False)
-            event.creator = request.user
-            event.end_date = event.end_date or event.start_date
-            event.save()
-            form.save_m2m()
-            event.attendees.set(attendees_form.cleaned_data.get('attendees'))
-            if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-                return JsonResponse({'success': True, 'id': event.id})
-            messages.success(request, '일정이 생성되었습니다.')
-            return redirect('wbs:event_detail', pk=event.pk)
-        if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+            attendees = attendees_form.cleaned_data.get('attendees')
+            conflicts = form.attendee_conflicts(attendees)
+            if conflicts and not request.POST.get('confirm_conflicts'):
+                if is_ajax:
+                    return JsonResponse({
+                        'success': False,
+                        'confirm_required': True,
+                        'conflicts': [user.username for user, _ in conflicts],
+                    }, status=409)
+            else:
+                event = form.save(commit=False)
+                event.creator = request.user
+                event.end_date = event.end_date or event.start_date
+                event.save()
+                form.save_m2m()
+                event.attendees.set(attendees)
+                if is_ajax:
+                    return JsonResponse({'success': True, 'id': event.id, 'conflicts': [user.username for user, _ in conflicts]})
+                messages.success(request, '일정이 생성되었습니다.')
+                return redirect('wbs:event_detail', pk=event.pk)
+        elif is_ajax:
             return JsonResponse({'success': False, 'errors': {**form.errors, **attendees_form.errors}}, status=400)
     else:
         form = EventForm(user=request.user)
         attendees_form = EventAttendeesForm(user=request.user)
-    return render(request, 'wbs/event_form.html', {'form': form, 'attendees_form': attendees_form, 'title': '새 일정 생성'})
+    return render(request, 'wbs/event_form.html', {
+        'form': form, 'attendees_form': attendees_form, 'title': '새 일정 생성',
+        'conflicts': _conflict_summary(conflicts) if conflicts else '',
+    })
 
 @login_required
 def event_detail(request, pk):
@@ -917,20 +1129,28 @@ def event_detail(request, pk):
 @login_required
 @require_http_methods(["GET", "POST"])
 def event_edit(request, pk):
+    """일정 수정. 참석자 일정이 겹치면 생성과 같이 저장 전에 확인을 받는다"""
     event = get_object_or_404(Event, pk=pk)
     attendees_form = None
+    conflicts = None
     if request.method == 'POST':
         form = EventForm(request.POST, instance=event, user=request.user)
         attendees_form = EventAttendeesForm(request.POST, user=request.user)
         if form.is_valid() and attendees_form.is_valid():
-            form.save()
-            event.attendees.set(attendees_form.cleaned_data.get('attendees'))
-            messages.success(request, '일정이 수정되었습니다.')
-            return redirect('wbs:event_detail', pk=pk)
+            attendees = attendees_form.cleaned_data.get('attendees')
+            conflicts = form.attendee_conflicts(attendees)
+            if not conflicts or request.POST.get('confirm_conflicts'):
+                form.save()
+                event.attendees.set(attendees)
+                messages.success(request, '일정이 수정되었습니다.')
+                return redirect('wbs:event_detail', pk=pk)
     else:
         form = EventForm(instance=event, user=request.user)
         attendees_form = EventAttendeesForm(user=request.user, initial={'attendees': event.attendees.all()})
-    return render(request, 'wbs/event_form.html', {'form': form, 'attendees_form': attendees_form, 'event': event, 'title': '일정 수정'})
+    return render(request, 'wbs/event_form.html', {
+        'form': form, 'attendees_form': attendees_form, 'event': event, 'title': '일정 수정',
+        'conflicts': _conflict_summary(conflicts) if conflicts else '',
+    })
 
 @login_required
 @require_http_methods(["GET", "POST"])
@@ -992,29 +1212,20 @@ def personal_planner(request):
         base_date = timezone.localdate()
 
     # week only
-    start_date = base_date - timedelta(days=base_date.weekday())
-    end_date = start_date + timedelta(days=6)
-    px_per_day = 100
-
-    days = []
-    current = start_date
-    left_px = 0
-    while current <= end_date:
-        days.append((current, left_px))
-        left_px += px_per_day
-        current += timedelta(days=1)
+    timeline = Timeline.for_zoom(base_date, 'week')
+    start_date, end_date, px_per_day = timeline.start_date, timeline.end_date, timeline.px_per_day
+    days = timeline.days_with_pos()
 
     # 사용자의 이벤트를 표 형태로 간단히 구성
-    events = Event.objects.filter(creator=request.user, start_date__lte=end_date, end_date__gte=start_date).order_by('start_date')
+    events = expand_events(
+        Event.objects.filter(window_q(start_date, end_date), creator=request.user).order_by('start_date'),
+        start_date, end_date,
+    )
     rows = []
-    for ev in events:
+    for ev, bar in zip(events, timeline.place([(ev.start_date, ev.end_date) for ev in events])):
         # 주간과 겹치지 않으면 스킵
-        if ev.end_date < start_date or ev.start_date > end_date:
+        if bar is None:
             continue
-        start = max(ev.start_date, start_date)
-        end = min(ev.end_date, end_date)
-        left = (start - start_date).days * px_per_day
-        width = ((end - start).days + 1) * px_per_day
         color = ev.priority_color
         rows.append({
             'category': ev.get_event_type_display(),
@@ -1025,8 +1236,8 @@ def personal_planner(request):
             'end': ev.end_date,
             'days': (ev.end_date - ev.start_date).days + 1,
             'progress': 0,
-            'left': left,
-            'width': width,
+            'left': bar['left'],
+            'width': bar['width'],
             'color': color,
         })
 
@@ -1042,30 +1253,46 @@ def personal_planner(request):
     }
     return render(request, 'wbs/personal_planner.html', context)
 
-@login_required
-def project_planner(request, pk):
-    project = get_object_or_404(Project, pk=pk)
+# 프로젝트 플래너 확대 수준별 하루 너비(px)와 명시 구간 최대 일수
+PLANNER_PX_PER_DAY = {'week': 40, 'month': 24, 'quarter': 8}
+PLANNER_MAX_DAYS = 366
+
+def _parse_date_param(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date() if value else None
+    except ValueError:
+        return None
+
+def _project_planner_layout(request, project):
+    """프로젝트 플래너의 표시 구간과 행 좌표 계산 (HTML/JSON 공용)
+
+    - start/end: 명시 구간 (최대 PLANNER_MAX_DAYS 일)
+    - start 만 있으면 start 가 속한 주/월/분기 (mode=week|month|quarter)
+    - 둘 다 없으면 오늘(프로젝트 기간 안으로 보정)이 속한 구간
+    표시 구간과 겹치는 단계만 조회/배치하므로 긴 프로젝트도 화면 크기만큼만 그린다.
+    """
     mode = request.GET.get('mode', 'week')
-    start_date = project.start_date
-    end_date = project.end_date
-    px_per_day = 24 if mode == 'month' else 40
-
-    days = []
-    current = start_date
-    left_px = 0
-    while current <= end_date:
-        days.append((current, left_px))
-        left_px += px_per_day
-        current += timedelta(days=1)
-
-    # 프로젝트 단계 기반의 바 구성
+    if mode not in PLANNER_PX_PER_DAY:
+        mode = 'week'
+    px_per_day = PLANNER_PX_PER_DAY[mode]
+    start = _parse_date_param(request.GET.get('start'))
+    end = _parse_date_param(request.GET.get('end'))
+
+    if start and end and start <= end:
+        end = min(end, start + timedelta(days=PLANNER_MAX_DAYS - 1))
+        timeline = Timeline(start, end, px_per_day)
+    else:
+        base_date = start or min(max(timezone.localdate(), project.start_date), project.end_date)
+        timeline = Timeline.for_zoom(base_date, mode, px_per_day)
+
+    # 프로젝트 단계 기반의 바 구성 (표시 구간과 겹치는 단계만)
+    phases = list(project.phases.filter(
+        start_date__lte=timeline.end_date, end_date__gte=timeline.start_date,
+    ).order_by('order'))
     rows = []
-    for ph in project.phases.all().order_by('order'):
-        start = max(ph.start_date, start_date)
-        end = max(start, min(ph.end_date, end_date))
-        left = (start - start_date).days * px_per_day
-        width = ((end - start).days + 1) * px_per_day
+    for ph, bar in zip(phases, timeline.place([(ph.start_date, ph.end_date) for ph in phases])):
         rows.append({
+            'id': ph.id,
             'category': 'Phase',
             'title': ph.title,
             'part': '-',
@@ -1074,24 +1301,81 @@ def project_planner(request, pk):
             'end': ph.end_date,
             'days': (ph.end_date - ph.start_date).days + 1,
             'progress': 0,
-            'left': left,
-            'width': width,
+            'left': bar['left'],
+            'width': bar['width'],
             'color': project.theme_color,
         })
 
-    context = {
-        'project': project,
+    prev_start = timeline.shifted_start(-1)
+    next_start = timeline.shifted_start(1)
+    # 명시 구간은 같은 길이로 이동하므로 end 도 함께 넘긴다 (start 만 넘기면 주/월/분기로 돌아감)
+    if timeline.zoom is None:
+        span = timedelta(days=timeline.day_count - 1)
+        prev_end, next_end = prev_start + span, next_start + span
+    else:
+        prev_end = next_end = None
+
+    return {
         'mode': mode,
-        'start_date': start_date,
-        'end_date': end_date,
-        'days_with_pos': days,
-        'px_per_day': px_per_day,
+        'timeline': timeline,
         'rows': rows,
-        'prev_start': start_date.strftime('%Y-%m-%d'),
-        'next_start': start_date.strftime('%Y-%m-%d'),
+        'prev_start': prev_start,
+        'next_start': next_start,
+        'prev_end': prev_end,
+        'next_end': next_end,
+    }
+
+@login_required
+def project_planner(request, pk):
+    project = get_object_or_404(Project.objects.select_related('manager'), pk=pk)
+    layout = _project_planner_layout(request, project)
+    timeline = layout['timeline']
+
+    context = {
+        'project': project,
+        'mode': layout['mode'],
+        'zoom_levels': [('week', '주간'), ('month', '월간'), ('quarter', '분기')],
+        'start_date': timeline.start_date,
+        'end_date': timeline.end_date,
+        'days_with_pos': timeline.days_with_pos(),
+        'px_per_day': timeline.px_per_day,
+        'rows': layout['rows'],
+        'prev_start': layout['prev_start'].strftime('%Y-%m-%d'),
+        'next_start': layout['next_start'].strftime('%Y-%m-%d'),
+        'prev_end': layout['prev_end'] and layout['prev_end'].strftime('%Y-%m-%d'),
+        'next_end': layout['next_end'] and layout['next_end'].strftime('%Y-%m-%d'),
     }
     return render(request, 'wbs/personal_planner.html', context)
 
+@login_required
+def project_planner_data(request, pk):
+    """프로젝트 플래너 JSON (가로 스크롤 시 구간 단위로 이어 받기용)
+
+    파라미터는 project_planner 와 동일. next_start/prev_start 를 start 로 (명시 구간이면
+    next_end/prev_end 도 end 로) 넘기면 인접 구간.
+    """
+    project = get_object_or_404(Project.objects.select_related('manager'), pk=pk)
+    layout = _project_planner_layout(request, project)
+    timeline = layout['timeline']
+    rows = [
+        {**row, 'start': row['start'].isoformat(), 'end': row['end'].isoformat()}
+        for row in layout['rows']
+    ]
+    return JsonResponse({
+        'project': {'id': project.id, 'title': project.title,
+                    'start_date': project.start_date.isoformat(), 'end_date': project.end_date.isoformat()},
+        'mode': layout['mode'],
+        'start_date': timeline.start_date.isoformat(),
+        'end_date': timeline.end_date.isoformat(),
+        'day_count': timeline.day_count,
+        'px_per_day': timeline.px_per_day,
+        'rows': rows,
+        'prev_start': layout['prev_start'].isoformat(),
+        'next_start': layout['next_start'].isoformat(),
+        'prev_end': layout['prev_end'] and layout['prev_end'].isoformat(),
+        'next_end': layout['next_end'] and layout['next_end'].isoformat(),
+    })
+
 @login_required
 def personal_project_detail(request, pk):
     """개인 플래너 디자인의 신규 상세 화면 (주/월 토글, 작업 항목 표시)"""
@@ -1103,24 +1387,11 @@ def personal_project_detail(request, pk):
     except Exception:
         base_date = timezone.localdate()
 
-    if mode == 'month':
-        start_date = base_date.replace(day=1)
-        from calendar import monthrange
-        end_date = start_date.replace(day=monthrange(start_date.year, start_date.month)[1])
-        px_per_day = 24
-    else:
-        start_date = base_date - timedelta(days=base_date.weekday())
-        end_date = start_date + timedelta(days=6)
-        px_per_day = 100
+    timeline = Timeline.for_zoom(base_date, 'month' if mode == 'month' else 'week')
+    start_date, end_date, px_per_day = timeline.start_date, timeline.end_date, timeline.px_per_day
 
     # 타임라인 헤더 좌표
-    days_with_pos = []
-    current = start_date
-    left_px = 0
-    while current <= end_date:
-        days_with_pos.append((current, left_px))
-        left_px += px_per_day
-        current += timedelta(days=1)
+    days_with_pos = timeline.days_with_pos()
 
     # 월간 모드에서 상단 주 단위 셀(1주, 2주, ...) 표시용 데이터
     week_cells = []
@@ -1133,13 +1404,15 @@ def personal_project_detail(request, pk):
             week_index += 1
 
     # 개인 작업과 프로젝트 단계 모두 보여주기
+    tasks = list(project.personal_tasks.prefetch_related('assignees').order_by('start_date'))
+    phases = list(project.phases.all().order_by('order'))
+    bars = timeline.place(
+        [(t.start_date, t.end_date) for t in tasks] + [(ph.start_date, ph.end_date) for ph in phases],
+        skip_outside=False,
+    )
     rows = []
     # PersonalTask rows
-    for t in project.personal_tasks.all().order_by('start_date'):
-        s = max(t.start_date, start_date)
-        e = max(s, min(t.end_date, end_date))
-        left = (s - start_date).days * px_per_day
-        width = ((e - s).days + 1) * px_per_day
+    for t, bar in zip(tasks, bars[:len(tasks)]):
         assignees = ", ".join([u.username for u in t.assignees.all()])
         row = {
             'category': t.team_name,
@@ -1150,23 +1423,17 @@ def personal_project_detail(request, pk):
             'end': t.end_date,
             'days': (t.end_date - t.start_date).days + 1,
             'progress': t.get_progress_display(),
-            'left': left,
-            'width': width,
+            'left': bar['left'],
+            'width': bar['width'],
             'color': project.theme_color,
         }
         if mode == 'week':
-            start_offset = (s - start_date).days
-            span_days = (e - s).days + 1
-            row['grid_col_start'] = start_offset + 1
-            row['grid_span'] = span_days
+            row['grid_col_start'] = bar['grid_col_start']
+            row['grid_span'] = bar['grid_span']
         rows.append(row)
 
     # 단계도 함께 (선택)
-    for ph in project.phases.all().order_by('order'):
-        s = max(ph.start_date, start_date)
-        e = max(s, min(ph.end_date, end_date))
-        left = (s - start_date).days * px_per_day
-        width = ((e - s).days + 1) * px_per_day
+    for ph, bar in zip(phases, bars[len(tasks):]):
         row = {
             'category': 'Phase',
             'title': ph.title,
@@ -1176,15 +1443,13 @@ def personal_project_detail(request, pk):
             'end': ph.end_date,
             'days': (ph.end_date - ph.start_date).days + 1,
             'progress': '—',
-            'left': left,
-            'width': width,
+            'left': bar['left'],
+            'width': bar['width'],
             'color': project.theme_color,
         }
         if mode == 'week':
-            start_offset = (s - start_date).days
-            span_days = (e - s).days + 1
-            row['grid_col_start'] = start_offset + 1
-            row['grid_span'] = span_days
+            row['grid_col_start'] = bar['grid_col_start']
+            row['grid_span'] = bar['grid_span']
         rows.append(row)
 
     context = {
@@ -109,6 +109,41 @@ DATABASES = {
 }
 
 
+# Cache
+# 광고 노출/클릭 버퍼(wbs.ad_counters)는 flush 전까지 'ad_counters' 캐시에만 있다.
+# 웹 프로세스가 여러 개인 배포에서는 REDIS_URL 을 지정해 모든 프로세스가 같은 버퍼를 쓰게 한다.
+# 지정하지 않으면 프로세스별 메모리 캐시(키를 밀어내지 않도록 MAX_ENTRIES 를 크게)를 쓰고,
+# 각 프로세스가 자기 버퍼를 flush 한다 (프로세스 종료 시 마지막 flush 이후 누적분은 잃음).
+REDIS_URL = os.getenv('REDIS_URL', '')
+
+if REDIS_URL:
+    AD_COUNTER_CACHE_BACKEND = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+        "KEY_PREFIX": "ad-counters",
+        "TIMEOUT": None,
+    }
+else:
+    AD_COUNTER_CACHE_BACKEND = {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "ad-counters",
+        "TIMEOUT": None,
+        "OPTIONS": {"MAX_ENTRIES": 1000000},
+    }
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "ad_counters": AD_COUNTER_CACHE_BACKEND,
+}
+AD_COUNTER_CACHE = "ad_counters"
+
+# 알림 SSE 푸시: REDIS_URL 이 있으면 Redis pub/sub 으로 워커 명령/다른 웹 프로세스의 알림도 바로 전달하고,
+# 없으면 프로세스 안 브로커 + 연결마다 heartbeat 때 DB 확인 (wbs.realtime)
+WBS_REALTIME_BROKER = "wbs.realtime.RedisBroker" if REDIS_URL else "wbs.realtime.InProcessBroker"
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 